@@ -0,0 +1,54 @@
+"""Compare the old dotted-token regex with the suffix-list domain extraction on post text.
+
+Run from the repo root: python -m benchmarks.bench_domains [--posts 20000]
+"""
+from __future__ import annotations
+
+import argparse
+import random
+import re
+import timeit
+
+from prospector.domains import extract_domain, normalize_domain
+
+# The pre-normalization utils.extract_domain
+_OLD_PATTERN = re.compile(r"\b(?:https?://)?([a-zA-Z0-9-]+(?:\.[a-zA-Z0-9-]+)+)\b")
+
+_FILLER = "our support inbox is drowning and the help docs are a mess so we tried everything".split()
+_TOKENS = [
+    "e.g.", "i.e.", "v1.2.3", "node.js", "main.py", "index.html", "README.md", "3.5", "config.yaml",
+    "acme.com", "app.acme.com", "https://blog.widgets.io/post", "foo.co.uk", "shop.example.com.au",
+    "tool.vercel.app", "https://old.reddit.com/r/SaaS", "www.startup.dev", "x.com/founder",
+]
+
+
+def _corpus(posts: int) -> list[str]:
+    rng = random.Random(0)
+    return [" ".join(rng.choice(_FILLER) if rng.random() < 0.9 else rng.choice(_TOKENS) for _ in range(60)) for _ in range(posts)]
+
+
+def _old(text: str) -> str:
+    match = _OLD_PATTERN.search(text)
+    return match.group(1).lower().removeprefix("www.") if match else ""
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--posts", type=int, default=20000)
+    args = parser.parse_args()
+
+    corpus = _corpus(args.posts)
+    extract_domain("warm.up")  # loads the suffix list once, outside the timings
+    old_found = [_old(text) for text in corpus]
+    new_found = [extract_domain(text) for text in corpus]
+    junk = sum(1 for domain in old_found if domain and not normalize_domain(domain))
+    print(f"old regex: {sum(map(bool, old_found))} domains, {junk} of them junk; distinct {len(set(old_found))}")
+    print(f"suffix list: {sum(map(bool, new_found))} domains; distinct {len(set(new_found))}")
+
+    for label, extract in (("old regex", _old), ("suffix list", extract_domain)):
+        seconds = min(timeit.repeat(lambda: [extract(text) for text in corpus], number=1, repeat=3))
+        print(f"{label:<12} {seconds * 1e6 / len(corpus):8.2f} us/post ({len(corpus)} posts)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""Compare scanning raw homepage HTML with scanning the extracted text on an SPA-style page.
+
+Run from the repo root: python -m benchmarks.bench_html_text [--mb 3]
+"""
+from __future__ import annotations
+
+import argparse
+import random
+import string
+import timeit
+import tracemalloc
+
+from prospector.enricher import B2B_TERM_SET, PAGE_MATCHER
+from prospector.html_text import DEFAULT_MAX_BYTES, extract_page
+from prospector.matcher import count_hits
+
+
+def _spa_page(mb: int) -> str:
+    # A small visible shell, then megabytes of inline bundle and JSON state full of "api" and "team"
+    rng = random.Random(0)
+    shell = "<html><head><title>Acme</title></head><body><nav><a href='/pricing'>Pricing</a></nav><h1>Support inbox for indie founders</h1>"
+    chunks = [shell, "<script>"]
+    size = 0
+    while size < mb * 1024 * 1024:
+        name = "".join(rng.choices(string.ascii_lowercase, k=8))
+        chunk = f'fetch("/api/{name}",{{team:"{name}",dashboard:1}});'
+        chunks.append(chunk)
+        size += len(chunk)
+    chunks.append("</script><footer>Made by a small team</footer></body></html>")
+    return "".join(chunks)
+
+
+def _raw(html: str) -> int:
+    return count_hits(PAGE_MATCHER.find(html), B2B_TERM_SET)
+
+
+def _extracted(html: str) -> int:
+    return count_hits(PAGE_MATCHER.find(extract_page(html, DEFAULT_MAX_BYTES).text), B2B_TERM_SET)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--mb", type=int, default=3)
+    args = parser.parse_args()
+
+    html = _spa_page(args.mb)
+    for label, analyse in (("raw HTML scan", _raw), ("extracted text", _extracted)):
+        seconds = min(timeit.repeat(lambda: analyse(html), number=5, repeat=3)) / 5
+        tracemalloc.start()
+        signals = analyse(html)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        print(f"{label:<16} {seconds * 1000:8.2f} ms/page  peak {peak / 1e6:6.1f} MB  b2b signals {signals}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""Compare fresh-connection requests with RequestManager's pooled session.
+
+Run from the repo root: python -m benchmarks.bench_http_pool [--requests 300]
+"""
+from __future__ import annotations
+
+import argparse
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+from prospector.http import RequestManager
+
+BODY = b'{"hits": []}'
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def do_GET(self) -> None:  # noqa: N802
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(BODY)))
+        self.end_headers()
+        self.wfile.write(BODY)
+
+    def log_message(self, format: str, *args) -> None:  # noqa: A002
+        return
+
+
+def _time_calls(label: str, call, count: int) -> float:
+    started = time.perf_counter()
+    for _ in range(count):
+        call()
+    per_request_ms = (time.perf_counter() - started) * 1000 / count
+    print(f"{label:<24} {per_request_ms:7.3f} ms/request")
+    return per_request_ms
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=300)
+    args = parser.parse_args()
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _StubHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}/api/v1/search"
+
+    manager = RequestManager(timeout_seconds=5)
+    try:
+        fresh = _time_calls("requests.get (no pool)", lambda: requests.get(url, timeout=5).json(), args.requests)
+        pooled = _time_calls("RequestManager (pooled)", lambda: manager.get_json(url), args.requests)
+    finally:
+        manager.close()
+        server.shutdown()
+
+    print(f"saved per request: {fresh - pooled:.3f} ms ({(1 - pooled / fresh) * 100:.0f}%)")
+
+
+if __name__ == "__main__":
+    main()
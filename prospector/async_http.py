@@ -0,0 +1,184 @@
+from __future__ import annotations
+
+import asyncio
+import json
+from collections.abc import AsyncIterator
+from dataclasses import dataclass, field, fields
+from typing import Any
+
+from prospector.cache import CacheEntry
+from prospector.http import BODY_CHUNK_SIZE, RETRYABLE_STATUSES, HttpSettings, RequestManager, decode_chunks, incremental_decoder
+from prospector.metrics import METRICS
+
+try:
+    import httpx
+except ImportError:  # optional extra: pip install icp-prospector[async]
+    httpx = None
+
+
+def async_http_available() -> bool:
+    return httpx is not None
+
+
+@dataclass
+class AsyncRequestManager(HttpSettings):
+    # asyncio counterpart of RequestManager: same get_json/get_text/head_status surface, cache
+    # and retry/rate-limit policy (HttpSettings), but one event loop can hold hundreds of
+    # requests in flight instead of one per thread
+    client: Any = field(default=None, repr=False)
+
+    def __post_init__(self) -> None:
+        if httpx is None:
+            raise RuntimeError("async HTTP needs httpx (pip install icp-prospector[async])")
+        if self.client is None:
+            self.client = httpx.AsyncClient(
+                follow_redirects=True,
+                limits=httpx.Limits(max_connections=None, max_keepalive_connections=self.pool_connections * self.pool_maxsize),
+                headers=None if self.compress else {"Accept-Encoding": "identity"},
+            )
+
+    @classmethod
+    def from_sync(cls, manager: RequestManager, **overrides: Any) -> AsyncRequestManager:
+        settings = {f.name: getattr(manager, f.name) for f in fields(HttpSettings)}
+        return cls(**{**settings, **overrides})
+
+    async def aclose(self) -> None:
+        await self.client.aclose()
+
+    async def get_json(self, url: str, params: dict[str, Any] | None = None, headers: dict[str, str] | None = None) -> dict:
+        if self._caching():
+            return json.loads((await self._cached_get(url, params, headers, text=False)).body)
+        response = await self._request("GET", url, params=params, headers=headers)
+        return response.json()
+
+    async def get_text(
+        self,
+        url: str,
+        headers: dict[str, str] | None = None,
+        max_bytes: int | None = None,
+        content_types: tuple[str, ...] | None = None,
+    ) -> str:
+        if max_bytes is not None or content_types:
+            return "".join([text async for text in self.stream_text(url, headers, max_bytes, content_types)])
+        if self._caching():
+            entry = await self._cached_get(url, None, headers, text=True)
+            return entry.body.decode(entry.encoding or "utf-8", errors="replace")
+        response = await self._request("GET", url, headers=headers)
+        return response.text
+
+    async def stream_text(
+        self,
+        url: str,
+        headers: dict[str, str] | None = None,
+        max_bytes: int | None = None,
+        content_types: tuple[str, ...] | None = None,
+    ) -> AsyncIterator[str]:
+        # Same contract as RequestManager.stream_text; close it with aclose() (or contextlib.aclosing)
+        # when stopping early, so the connection is dropped instead of drained
+        if self._caching():
+            entry = await self._cached_get(url, None, headers, text=True, max_bytes=max_bytes, content_types=content_types)
+            for text in decode_chunks([entry.body], entry.encoding or "utf-8"):
+                yield text
+            return
+        response = await self._request("GET", url, headers=headers, stream=True)
+        try:
+            self._check_content_type(url, response.headers, content_types)
+            decoder = incremental_decoder(response.encoding or "utf-8")
+            async for chunk in self._iter_body(response, max_bytes):
+                text = decoder.decode(chunk)
+                if text:
+                    yield text
+            tail = decoder.decode(b"", final=True)
+            if tail:
+                yield tail
+        finally:
+            await response.aclose()
+
+    async def head_status(self, url: str, headers: dict[str, str] | None = None) -> int:
+        response = await self._request("HEAD", url, headers=headers, follow_redirects=False)
+        return response.status_code
+
+    async def _cached_get(
+        self,
+        url: str,
+        params: dict[str, Any] | None,
+        headers: dict[str, str] | None,
+        text: bool,
+        max_bytes: int | None = None,
+        content_types: tuple[str, ...] | None = None,
+    ) -> CacheEntry:
+        key, cached, request_headers = self._cache_lookup(url, params, headers, max_bytes, content_types)
+        if cached is not None and cached.is_fresh():
+            return cached
+        if max_bytes is None and not content_types:
+            response = await self._request("GET", url, params=params, headers=request_headers or None)
+            encoding = (response.encoding or "utf-8") if text else ""
+            return self._cache_update(key, url, cached, response.status_code, response.content, encoding, response.headers)
+        response = await self._request("GET", url, params=params, headers=request_headers or None, stream=True)
+        try:
+            if response.status_code != 304:
+                self._check_content_type(url, response.headers, content_types)
+            body = await self._read_body(response, max_bytes)
+        finally:
+            await response.aclose()
+        encoding = (response.encoding or "utf-8") if text else ""
+        return self._cache_update(key, url, cached, response.status_code, body, encoding, response.headers)
+
+    async def _read_body(self, response: httpx.Response, max_bytes: int | None) -> bytes:
+        return b"".join([chunk async for chunk in self._iter_body(response, max_bytes)])
+
+    async def _iter_body(self, response: httpx.Response, max_bytes: int | None) -> AsyncIterator[bytes]:
+        read = 0
+        complete = False
+        try:
+            async for chunk in response.aiter_bytes(BODY_CHUNK_SIZE):
+                if max_bytes is not None and read + len(chunk) > max_bytes:
+                    chunk = chunk[: max_bytes - read]
+                    read += len(chunk)
+                    if chunk:
+                        yield chunk
+                    return
+                read += len(chunk)
+                yield chunk
+            complete = True
+        except httpx.HTTPError as exc:
+            raise RuntimeError(f"Reading {response.url} failed: {exc}") from exc
+        finally:
+            self._record_body(read, not complete, response.headers)
+
+    async def _request(self, method: str, url: str, **kwargs: Any) -> httpx.Response:
+        last_error: Exception | None = None
+        stream = kwargs.pop("stream", False)
+        for attempt in range(self.max_retries):
+            if attempt and self.rate_limiter is not None:
+                await self.rate_limiter.aacquire()
+            response = None
+            try:
+                with METRICS.timer("http_request_seconds", source=self.metrics_source, method=method):
+                    if stream:
+                        # Headers only; the caller reads (and closes) the body
+                        request = self.client.build_request(method, url, timeout=self.timeout_seconds, **kwargs)
+                        response = await self.client.send(request, stream=True)
+                    else:
+                        response = await self.client.request(method, url, timeout=self.timeout_seconds, **kwargs)
+                self._record_response(method, response.status_code, None if stream else len(response.content), response.headers)
+                if response.status_code in RETRYABLE_STATUSES:
+                    raise httpx.HTTPStatusError(f"retryable status {response.status_code}", request=response.request, response=response)
+                response.raise_for_status()
+                return response
+            except (httpx.HTTPError, ValueError) as exc:
+                last_error = exc
+                if stream and response is not None:
+                    await response.aclose()
+                failed = getattr(exc, "response", None) if isinstance(exc, httpx.HTTPStatusError) else None
+                delay = self._retry_delay(
+                    method,
+                    attempt,
+                    exc,
+                    failed.headers if failed is not None else None,
+                    failed.status_code if failed is not None else None,
+                )
+                if delay is None:
+                    break
+                await asyncio.sleep(delay)
+        raise RuntimeError(f"Request failed after retries: {url} ({last_error})")
@@ -0,0 +1,165 @@
+from __future__ import annotations
+
+import logging
+from dataclasses import replace
+from datetime import date, datetime, timezone
+from pathlib import Path
+
+from rich.console import Console
+from rich.table import Table
+
+from prospector.config import load_config
+from prospector.consolidation import LeadConsolidator
+from prospector.deduplicator import Deduplicator
+from prospector.history import open_lead_history
+from prospector.matcher import TermMatcher
+from prospector.outputs.csv_writer import write_leads_csv
+from prospector.run import (
+    MIN_FIT_SCORE,
+    apply_keyword_variants,
+    build_enricher,
+    build_enrichment_executor,
+    build_request_manager,
+    expand_keywords,
+    is_excluded,
+    open_response_cache,
+)
+from prospector.scorer import Scorer
+from prospector.sources import HackerNewsSource, RedditSource
+from prospector.state import (
+    clear_backfill_checkpoint,
+    load_backfill_checkpoint,
+    open_seen_domain_store,
+    save_backfill_checkpoint,
+)
+
+logger = logging.getLogger("prospector.backfill")
+
+BACKFILL_SOURCES = {
+    "hacker_news": HackerNewsSource,
+    "reddit": RedditSource,
+}
+
+
+def _backfill_rpm(config: dict, source_name: str) -> int:
+    # Backfill gets its own, smaller budget (half the daily rate by default) so a long
+    # history walk never eats into what the scheduled run needs from the same API
+    source_cfg = config["sources"].get(source_name)
+    if isinstance(source_cfg, dict):
+        daily = int(source_cfg.get("requests_per_minute", 20))
+        return int(source_cfg.get("backfill_requests_per_minute", max(1, daily // 2)))
+    daily = int(config["sources"].get(f"{source_name}_requests_per_minute", 20))
+    return int(config["sources"].get(f"{source_name}_backfill_requests_per_minute", max(1, daily // 2)))
+
+
+def checkpoint_path(config: dict, source_name: str) -> str:
+    return str(Path(config["state"]["seen_domains_file"]).parent / f"backfill_{source_name}.json")
+
+
+def run_backfill(config_path: str, source_name: str, since: date, dry_run: bool = False) -> dict:
+    config = load_config(config_path)
+    source_name = source_name.lower().replace("-", "_")
+    if source_name not in BACKFILL_SOURCES:
+        raise ValueError(f"Backfill supports: {', '.join(sorted(BACKFILL_SOURCES))}")
+
+    # Deep history pages are read once, so they skip the response cache; enrichment still uses it
+    response_cache = open_response_cache(config)
+    request_manager = replace(build_request_manager(config, None), cache_ttl_seconds=0, metrics_source=source_name)
+    source = BACKFILL_SOURCES[source_name](request_manager, requests_per_minute=_backfill_rpm(config, source_name))
+    since_ts = int(datetime(since.year, since.month, since.day, tzinfo=timezone.utc).timestamp())
+
+    state_path = checkpoint_path(config, source_name)
+    checkpoint = load_backfill_checkpoint(state_path)
+    if checkpoint.get("since") != since.isoformat():
+        checkpoint = {"since": since.isoformat(), "positions": {}}
+    positions: dict[str, int] = checkpoint["positions"]
+    if positions:
+        logger.info("resuming %s backfill from %s", source_name, state_path)
+
+    all_keywords, reverse_keyword_map = expand_keywords(config)
+    scorer = Scorer(config["icp"]["scoring"])
+    enricher = build_enricher(config, response_cache)
+    executor = build_enrichment_executor(config, enricher)
+    seen_store = open_seen_domain_store(config)
+    deduper = Deduplicator(seen_store)
+    consolidator = LeadConsolidator()
+    history = open_lead_history(config)
+    today = datetime.now(timezone.utc).date().isoformat()
+
+    exclude_matcher = TermMatcher(config["icp"]["exclude_keywords"])
+    counts = {"pages": 0, "fetched": 0, "kept": 0, "discarded": 0, "reopened": 0}
+    completed = False
+    try:
+        # Each page is scored, deduped and written before the next is requested, so memory stays at
+        # one page plus the consolidator's capped set of settled leads, and the checkpoint only ever
+        # points past work that has been persisted
+        for page in source.backfill(all_keywords, config, since_ts, positions):
+            for lead in page:
+                lead.date_found = today
+            apply_keyword_variants(page, reverse_keyword_map)
+            candidates = [lead for lead in page if not is_excluded(lead, exclude_matcher) and consolidator.add(lead) is not None]
+            scored = []
+            for lead in executor.run(candidates):
+                if scorer.score(lead) >= MIN_FIT_SCORE:
+                    scored.append(lead)
+                else:
+                    lead.discard_reason = "low_score"
+                consolidator.settle(lead)
+            page_leads, _ = deduper.split_new_and_seen(scored)
+
+            # Companies from earlier pages that gained copies on this one are scored again. One that
+            # was dropped goes through dedup like a new lead; one already written gets a second row,
+            # marked Updated, only when its score rose past the dedup improvement threshold.
+            revived, updated = [], []
+            for lead in consolidator.take_reopened():
+                written_score = None if lead.discard_reason else lead.fit_score
+                lead.discard_reason = ""
+                score = scorer.score(lead)
+                if written_score is not None:
+                    if score - written_score > deduper.improvement_threshold:
+                        lead.status = "Updated"
+                        updated.append(lead)
+                elif score >= MIN_FIT_SCORE:
+                    revived.append(lead)
+                else:
+                    lead.discard_reason = "low_score"
+            revived, _ = deduper.split_new_and_seen(revived)
+            new_leads = [*page_leads, *revived, *updated]
+
+            counts["pages"] += 1
+            counts["fetched"] += len(page)
+            counts["kept"] += len(page_leads)
+            counts["discarded"] += len(page) - len(page_leads)
+            counts["reopened"] += len(revived) + len(updated)
+
+            if not dry_run:
+                history.write(new_leads)
+                if config["output"]["csv"].get("enabled", True):
+                    write_leads_csv(config["output"]["csv"]["path"], new_leads)
+                # Marked after the writes, so a failed write leaves the domains unseen for the retry
+                deduper.mark(new_leads, today)
+                save_backfill_checkpoint(state_path, checkpoint)
+        completed = True
+    except (RuntimeError, KeyboardInterrupt) as exc:
+        logger.warning("backfill interrupted (%s); rerun the same command to resume", exc or "interrupted")
+    finally:
+        executor.close()
+        enricher.close()
+        history.close()
+        seen_store.close()
+        request_manager.close()
+        if response_cache is not None:
+            response_cache.close()
+
+    if completed and not dry_run:
+        clear_backfill_checkpoint(state_path)
+
+    table = Table(title=f"ICP Prospector Backfill ({source_name} since {since.isoformat()})")
+    table.add_column("Metric")
+    table.add_column("Value", justify="right")
+    table.add_row("Status", "complete" if completed else "interrupted")
+    for key, value in counts.items():
+        table.add_row(key.capitalize(), str(value))
+    Console().print(table)
+
+    return {"completed": completed, **counts}
@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+import hashlib
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any
+from urllib.parse import urlencode
+
+from prospector.db import connect
+
+CACHE_MODES = ("use", "refresh", "off")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    url TEXT NOT NULL,
+    body BLOB NOT NULL,
+    encoding TEXT NOT NULL DEFAULT '',
+    etag TEXT NOT NULL DEFAULT '',
+    last_modified TEXT NOT NULL DEFAULT '',
+    expires_at REAL NOT NULL,
+    last_access REAL NOT NULL,
+    size INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS responses_last_access ON responses (last_access);
+"""
+
+
+def cache_key(method: str, url: str, params: dict[str, Any] | None = None, variant: str = "") -> str:
+    # variant separates differently shaped reads of one URL (a capped body is not the full one)
+    query = urlencode(sorted((params or {}).items()), doseq=True)
+    raw = f"{method.upper()} {url} {query}"
+    if variant:
+        raw = f"{raw} {variant}"
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+@dataclass
+class CacheEntry:
+    body: bytes
+    encoding: str = ""
+    etag: str = ""
+    last_modified: str = ""
+    expires_at: float = 0.0
+
+    def is_fresh(self) -> bool:
+        return self.expires_at > time.time()
+
+    def validators(self) -> dict[str, str]:
+        headers: dict[str, str] = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class ResponseCache:
+    def __init__(self, path: str, max_size_mb: int = 256, mode: str = "use") -> None:
+        if mode not in CACHE_MODES:
+            raise ValueError(f"cache mode must be one of {', '.join(CACHE_MODES)}")
+        self.mode = mode
+        self.max_bytes = int(max_size_mb) * 1024 * 1024
+        self._lock = threading.Lock()
+        self._conn = connect(path)
+        self._conn.executescript(_SCHEMA)
+        self._total_bytes = int(self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0])
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def lookup(self, key: str) -> CacheEntry | None:
+        # "refresh" still writes through, it just never serves or revalidates old bodies
+        if self.mode != "use":
+            return None
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT body, encoding, etag, last_modified, expires_at FROM responses WHERE key = ?",
+                (key,),
+            ).fetchone()
+            if row is None:
+                return None
+            with self._conn:
+                self._conn.execute("UPDATE responses SET last_access = ? WHERE key = ?", (time.time(), key))
+        return CacheEntry(body=row[0], encoding=row[1], etag=row[2], last_modified=row[3], expires_at=row[4])
+
+    def store(self, key: str, url: str, entry: CacheEntry) -> None:
+        if self.mode == "off":
+            return
+        size = len(entry.body)
+        with self._lock, self._conn:
+            previous = self._conn.execute("SELECT size FROM responses WHERE key = ?", (key,)).fetchone()
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, url, body, encoding, etag, last_modified, expires_at, last_access, size) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (key, url, entry.body, entry.encoding, entry.etag, entry.last_modified, entry.expires_at, time.time(), size),
+            )
+            self._total_bytes += size - (previous[0] if previous else 0)
+            if self._total_bytes > self.max_bytes:
+                self._evict()
+
+    def touch(self, key: str, expires_at: float) -> None:
+        with self._lock, self._conn:
+            self._conn.execute(
+                "UPDATE responses SET expires_at = ?, last_access = ? WHERE key = ?",
+                (expires_at, time.time(), key),
+            )
+
+    def _evict(self) -> None:
+        # Least recently used first, down to 90% of the cap so eviction isn't paid on every store
+        target = int(self.max_bytes * 0.9)
+        rows = self._conn.execute("SELECT key, size FROM responses ORDER BY last_access ASC").fetchall()
+        evicted: list[tuple[str]] = []
+        for key, size in rows:
+            if self._total_bytes <= target:
+                break
+            evicted.append((key,))
+            self._total_bytes -= size
+        self._conn.executemany("DELETE FROM responses WHERE key = ?", evicted)
@@ -2,13 +2,19 @@ from __future__ import annotations
 
 import argparse
 import logging
+from datetime import date
+from functools import partial
+from pathlib import Path
 
 from rich.console import Console
 from rich.table import Table
 
-from prospector.outputs.csv_writer import read_leads_csv
+from prospector.cache import CACHE_MODES
+from prospector.history import open_lead_history
+from prospector.models import Lead
+from prospector.outputs.csv_writer import lead_from_row, read_leads_csv, score_key, write_rescored_csv
 from prospector.run import run_pipeline
-from prospector.state import load_seen_domains, reset_seen_domains
+from prospector.state import open_seen_domain_store
 
 
 def _build_parser() -> argparse.ArgumentParser:
@@ -20,15 +26,53 @@ def _build_parser() -> argparse.ArgumentParser:
     run_cmd.add_argument("--source", default=None, help="Run only one source (reddit|hacker_news|x|indie_hackers|product_hunt)")
     run_cmd.add_argument("--dry-run", action="store_true", help="Run without writing sheets/csv/state")
     run_cmd.add_argument("--throttle", action="store_true", help="Slow all sources by 2x")
+    run_cmd.add_argument(
+        "--cache-mode",
+        choices=list(CACHE_MODES),
+        default=None,
+        help="HTTP cache: use cached responses, refresh them, or bypass the cache (default: config cache.mode)",
+    )
+    run_cmd.add_argument("--full-refresh", action="store_true", help="Ignore stored source cursors and re-query full result windows")
+    run_cmd.add_argument(
+        "--profile",
+        nargs="?",
+        const="output/last-run.pstats",
+        default=None,
+        help="Write a cProfile/pstats dump of the main pipeline thread (default: output/last-run.pstats)",
+    )
 
-    stats_cmd = sub.add_parser("stats", help="Show CSV lead statistics")
+    backfill_cmd = sub.add_parser("backfill", help="Page through a source's history and stream it through the pipeline")
+    backfill_cmd.add_argument("--config", default="config/icp.yaml", help="Path to YAML config")
+    backfill_cmd.add_argument("--source", required=True, help="Source to backfill (hacker_news|reddit)")
+    backfill_cmd.add_argument("--since", required=True, type=date.fromisoformat, help="Oldest item date to fetch (YYYY-MM-DD)")
+    backfill_cmd.add_argument("--dry-run", action="store_true", help="Run without writing csv/state/checkpoints")
+
+    serve_cmd = sub.add_parser("serve", help="Run the pipeline on an interval and serve OpenMetrics on /metrics")
+    serve_cmd.add_argument("--config", default="config/icp.yaml", help="Path to YAML config")
+    serve_cmd.add_argument("--interval-minutes", type=float, default=60, help="Minutes between run starts")
+    serve_cmd.add_argument("--host", default="127.0.0.1", help="Metrics endpoint bind address")
+    serve_cmd.add_argument("--port", type=int, default=9464, help="Metrics endpoint port")
+    serve_cmd.add_argument("--throttle", action="store_true", help="Slow all sources by 2x")
+
+    stats_cmd = sub.add_parser("stats", help="Show lead history statistics")
     stats_cmd.add_argument("--config", default="config/icp.yaml", help="Path to YAML config")
     reset_cmd = sub.add_parser("reset-state", help="Clear seen domains state file")
     reset_cmd.add_argument("--config", default="config/icp.yaml", help="Path to YAML config")
 
-    export_cmd = sub.add_parser("export", help="Export leads from CSV")
+    rescore_cmd = sub.add_parser("rescore", help="Re-score stored leads with the current icp.scoring weights")
+    rescore_cmd.add_argument("--config", default="config/icp.yaml", help="Path to YAML config")
+    rescore_cmd.add_argument("--dry-run", action="store_true", help="Show the new score bands without updating the lead history")
+    rescore_cmd.add_argument(
+        "--csv-out",
+        default=None,
+        help="Also write a copy of the leads CSV with updated Fit Scores here (Status/Notes edits are kept; the input CSV is never rewritten)",
+    )
+
+    export_cmd = sub.add_parser("export", help="Export stored leads, highest score first")
+    export_cmd.add_argument("--config", default="config/icp.yaml", help="Path to YAML config")
     export_cmd.add_argument("--format", choices=["markdown"], default="markdown")
-    export_cmd.add_argument("--csv-path", default="output/leads.csv")
+    export_cmd.add_argument("--csv-path", default=None, help="Export this CSV instead of the lead history")
+    export_cmd.add_argument("--limit", type=int, default=None, help="Only export the top N leads")
 
     return parser
 
@@ -37,21 +81,25 @@ def cmd_stats(config_path: str) -> int:
     from prospector.config import load_config
 
     cfg = load_config(config_path)
-    csv_path = cfg["output"]["csv"].get("path", "output/leads.csv")
-    rows = read_leads_csv(csv_path)
-
-    high = sum(1 for row in rows if int(row.get("Fit Score", 0)) >= 70)
-    medium = sum(1 for row in rows if 40 <= int(row.get("Fit Score", 0)) < 70)
-    low = sum(1 for row in rows if int(row.get("Fit Score", 0)) < 40)
+    history = open_lead_history(cfg)
+    try:
+        bands = history.band_counts()
+        per_source = history.source_counts()
+        dates = history.date_range()
+    finally:
+        history.close()
 
     table = Table(title="ICP Prospector Stats")
     table.add_column("Metric")
     table.add_column("Value", justify="right")
-    table.add_row("CSV Path", csv_path)
-    table.add_row("Total Leads", str(len(rows)))
-    table.add_row("High", str(high))
-    table.add_row("Medium", str(medium))
-    table.add_row("Low", str(low))
+    table.add_row("History", history.path)
+    table.add_row("Total Leads", str(sum(bands.values())))
+    for band, count in bands.items():
+        table.add_row(band, str(count))
+    for source, count in per_source.items():
+        table.add_row(f"Source: {source}", str(count))
+    if dates:
+        table.add_row("Date Range", f"{dates[0]} .. {dates[1]}")
     Console().print(table)
     return 0
 
@@ -60,44 +108,142 @@ def cmd_reset_state(config_path: str) -> int:
     from prospector.config import load_config
 
     cfg = load_config(config_path)
-    state_path = cfg["state"]["seen_domains_file"]
-    reset_seen_domains(state_path)
-    Console().print(f"State reset: {state_path}")
+    store = open_seen_domain_store(cfg)
+    store.reset()
+    store.close()
+    Console().print(f"State reset: {store.path}")
+    return 0
+
+
+def cmd_rescore(config_path: str, dry_run: bool, csv_out: str | None = None) -> int:
+    from prospector.config import load_config
+    from prospector.scorer import Scorer
+
+    cfg = load_config(config_path)
+    scorer = Scorer(cfg["icp"]["scoring"])
+    history = open_lead_history(cfg)
+    total = changed = 0
+    bands = {"High": 0, "Medium": 0, "Low": 0}
+    new_scores: dict[tuple[str, str, str], int] = {}
+    try:
+        # Rows seeded from the legacy CSV lack the scoring inputs; re-scoring them would only lower them
+        skipped = history.unscorable_count()
+        for ids, leads in history.iter_batches(scorable_only=True):
+            previous = [lead.fit_score for lead in leads]
+            scores = scorer.score_batch(leads)
+            total += len(leads)
+            changed += sum(1 for old, new in zip(previous, scores) if old != new)
+            for lead, score in zip(leads, scores):
+                bands[scorer.band(score)] += 1
+                if csv_out:
+                    new_scores[score_key(lead.date_found, lead.domain, lead.evidence_url)] = score
+            if not dry_run:
+                history.update_scores(ids, leads)
+    finally:
+        history.close()
+
+    csv_changed = None
+    if csv_out and not dry_run:
+        csv_changed = write_rescored_csv(cfg["output"]["csv"]["path"], csv_out, new_scores)
+
+    table = Table(title="ICP Prospector Rescore" + (" (dry run)" if dry_run else ""))
+    table.add_column("Metric")
+    table.add_column("Value", justify="right")
+    table.add_row("History", history.path)
+    table.add_row("Total Leads", str(total))
+    table.add_row("Changed", str(changed))
+    table.add_row("Skipped (no stored signals)", str(skipped))
+    if csv_changed is not None:
+        table.add_row(f"CSV rows updated ({csv_out})", str(csv_changed))
+    for band, count in bands.items():
+        table.add_row(band, str(count))
+    Console().print(table)
     return 0
 
 
-def cmd_export_markdown(csv_path: str) -> int:
-    rows = read_leads_csv(csv_path)
-    rows.sort(key=lambda row: int(row.get("Fit Score", 0)), reverse=True)
+def _markdown_row(lead: Lead) -> str:
+    return "| {date} | {company} | {website} | {source} | {url} | {quote} | {score} |".format(
+        date=lead.date_found.replace("|", " "),
+        company=lead.company.replace("|", " "),
+        website=lead.domain.replace("|", " "),
+        source=lead.source.replace("|", " "),
+        url=lead.evidence_url.replace("|", " "),
+        quote=lead.pain_quote[:140].replace("|", " "),
+        score=lead.fit_score,
+    )
+
+
+def cmd_export_markdown(config_path: str, csv_path: str | None, limit: int | None) -> int:
+    from prospector.config import load_config
+
+    if csv_path:
+        # Explicit CSV exports keep the old path: parse the file and sort in memory
+        leads = sorted((lead_from_row(row) for row in read_leads_csv(csv_path)), key=lambda lead: lead.fit_score, reverse=True)
+        leads = leads[:limit] if limit else leads
+    else:
+        history = open_lead_history(load_config(config_path))
+        try:
+            leads = history.top(limit)
+        finally:
+            history.close()
 
     lines = [
         "| Date Found | Company/Product | Website | Source | Evidence URL | Pain Quote | Fit Score |",
         "|---|---|---|---|---|---|---:|",
     ]
-    for row in rows:
-        lines.append(
-            "| {date} | {company} | {website} | {source} | {url} | {quote} | {score} |".format(
-                date=row.get("Date Found", "").replace("|", " "),
-                company=row.get("Company/Product", "").replace("|", " "),
-                website=row.get("Website", "").replace("|", " "),
-                source=row.get("Source", "").replace("|", " "),
-                url=row.get("Evidence URL", "").replace("|", " "),
-                quote=(row.get("Pain Quote", "")[:140]).replace("|", " "),
-                score=row.get("Fit Score", "0"),
-            )
-        )
+    lines.extend(_markdown_row(lead) for lead in leads)
 
     Console().print("\n".join(lines))
     return 0
 
 
+def _profiled(run, path: str) -> None:
+    import cProfile
+
+    # Worker threads (sources, enrichment) are not profiled; their time shows up in the
+    # stage timers of the run report instead
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        run()
+    finally:
+        profiler.disable()
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        profiler.dump_stats(path)
+        Console().print(f"Profile written: {path} (python -m pstats {path})")
+
+
 def main() -> None:
     logging.basicConfig(level=logging.INFO)
     parser = _build_parser()
     args = parser.parse_args()
 
     if args.command == "run":
-        run_pipeline(config_path=args.config, selected_source=args.source, dry_run=args.dry_run, throttle=args.throttle)
+        run = partial(
+            run_pipeline,
+            config_path=args.config,
+            selected_source=args.source,
+            dry_run=args.dry_run,
+            throttle=args.throttle,
+            cache_mode=args.cache_mode,
+            full_refresh=args.full_refresh,
+        )
+        if args.profile:
+            _profiled(run, args.profile)
+        else:
+            run()
+        raise SystemExit(0)
+
+    if args.command == "backfill":
+        from prospector.backfill import run_backfill
+
+        result = run_backfill(config_path=args.config, source_name=args.source, since=args.since, dry_run=args.dry_run)
+        raise SystemExit(0 if result["completed"] else 1)
+
+    if args.command == "serve":
+        from prospector.serve import serve
+
+        serve(config_path=args.config, interval_minutes=args.interval_minutes, host=args.host, port=args.port, throttle=args.throttle)
         raise SystemExit(0)
 
     if args.command == "stats":
@@ -106,7 +252,10 @@ def main() -> None:
     if args.command == "reset-state":
         raise SystemExit(cmd_reset_state(args.config))
 
+    if args.command == "rescore":
+        raise SystemExit(cmd_rescore(args.config, args.dry_run, args.csv_out))
+
     if args.command == "export":
-        raise SystemExit(cmd_export_markdown(args.csv_path))
+        raise SystemExit(cmd_export_markdown(args.config, args.csv_path, args.limit))
 
     raise SystemExit(1)
@@ -4,6 +4,8 @@ from pathlib import Path
 
 import yaml
 
+from prospector.cache import CACHE_MODES
+
 REQUIRED_SCORING_KEYS = {
     "pain_signal_present",
     "b2b_saas_signals",
@@ -12,6 +14,14 @@ REQUIRED_SCORING_KEYS = {
     "docs_present",
 }
 
+DEFAULT_CACHE_TTL_SECONDS = {
+    "reddit": 6 * 3600,
+    "hacker_news": 6 * 3600,
+    "indie_hackers": 12 * 3600,
+    "product_hunt": 6 * 3600,
+    "enrichment": 7 * 24 * 3600,
+}
+
 DEFAULT_SOURCE_RPM = {
     "reddit": 30,
     "hacker_news": 40,
@@ -79,6 +89,14 @@ def _validate(config: dict) -> None:
     state = config["state"]
     _require_field(state, "seen_domains_file", "state")
 
+    cache = config.get("cache", {})
+    if not isinstance(cache, dict):
+        raise ValueError("cache must be a mapping")
+    if cache.get("mode", "use") not in CACHE_MODES:
+        raise ValueError(f"cache.mode must be one of: {', '.join(CACHE_MODES)}")
+    if not isinstance(cache.get("ttl_seconds", {}), dict):
+        raise ValueError("cache.ttl_seconds must be a mapping of source -> seconds")
+
 
 def _apply_defaults(config: dict) -> dict:
     icp = config["icp"]
@@ -86,6 +104,26 @@ def _apply_defaults(config: dict) -> dict:
 
     config.setdefault("http", {})
     config["http"].setdefault("timeout_seconds", 10)
+    config["http"].setdefault("pool_maxsize", 10)
+    config["http"].setdefault("compress", True)
+
+    seen_domains_file = Path(config["state"]["seen_domains_file"])
+    state_dir = seen_domains_file.parent
+    # seen_domains_file is the legacy JSON state; it is migrated into seen_domains_db on first use
+    config["state"].setdefault("seen_domains_db", str(seen_domains_file.with_suffix(".sqlite3")))
+    config["state"].setdefault("cursors_file", str(state_dir / "source_cursors.json"))
+    config["state"].setdefault("rate_limits_file", str(state_dir / "rate_limits.json"))
+
+    config.setdefault("enrichment", {})
+    config["enrichment"].setdefault("workers", 8)
+    config["enrichment"].setdefault("max_per_host", 2)
+    config["enrichment"].setdefault("cache_file", str(state_dir / "enrichment.sqlite3"))
+    config["enrichment"].setdefault("max_age_days", 14)
+    # Pages are parsed (script/style dropped) up to this many bytes; the rest is ignored
+    config["enrichment"].setdefault("max_page_bytes", 256 * 1024)
+    # asyncio enrichment (needs the `async` extra); concurrency caps leads in flight on the loop
+    config["enrichment"].setdefault("async", False)
+    config["enrichment"].setdefault("async_concurrency", 200)
 
     sources = config["sources"]
     for source_name, rpm in DEFAULT_SOURCE_RPM.items():
@@ -97,9 +135,24 @@ def _apply_defaults(config: dict) -> dict:
             else:
                 sources.setdefault(f"{source_name}_requests_per_minute", rpm)
 
+    cache = config.setdefault("cache", {})
+    cache.setdefault("mode", "use")
+    cache.setdefault("path", str(state_dir / "http_cache.sqlite3"))
+    cache.setdefault("max_size_mb", 256)
+    cache.setdefault("ttl_seconds", {})
+    for name, ttl in DEFAULT_CACHE_TTL_SECONDS.items():
+        cache["ttl_seconds"].setdefault(name, ttl)
+
     output = config["output"]
     output["csv"].setdefault("path", "output/leads.csv")
+    output["csv"].setdefault("history_path", str(Path(output["csv"]["path"]).with_suffix(".sqlite3")))
     output["summary"].setdefault("mode", "stdout")
+    # OpenMetrics textfile written after every run, e.g. for node_exporter's textfile collector
+    output.setdefault("metrics", {}).setdefault("textfile", "")
+    sheets = output["google_sheets"]
+    sheets.setdefault("batch_size", 50)
+    sheets.setdefault("max_retries", 3)
+    sheets.setdefault("outbox_file", str(state_dir / "sheets_outbox.jsonl"))
 
     return config
 
@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+from collections import OrderedDict
+
+from prospector.domains import normalize_domain
+from prospector.models import Lead
+
+# Merged leads keep at most this many distinct quotes, so the CSV cell stays readable
+MAX_MERGED_QUOTES = 3
+QUOTE_SEPARATOR = " | "
+# Settled leads kept for late copies; past this the least recently touched company is forgotten
+MAX_SETTLED_LEADS = 50_000
+
+
+def consolidation_key(lead: Lead) -> str:
+    return normalize_domain(lead.domain) or lead.evidence_url
+
+
+class LeadConsolidator:
+    # In-run index of one canonical lead per company (domain, or evidence URL without one).
+    # Copies from other keywords or sources are folded into the canonical lead, so each company
+    # is enriched once and the merged evidence counts towards its score. A copy that arrives after
+    # the lead was scored (settled) is still merged, and the lead is queued in take_reopened() so
+    # the caller can score it again. A copy of a company evicted from the settled set starts a new
+    # canonical lead, which dedup then drops as already seen once the first one was written.
+    def __init__(self, max_settled: int = MAX_SETTLED_LEADS) -> None:
+        self.max_settled = max_settled
+        self._pending: dict[str, Lead] = {}
+        self._settled: OrderedDict[str, Lead] = OrderedDict()
+        self._reopened: dict[str, Lead] = {}
+        self.merged = 0
+
+    def add(self, lead: Lead) -> Lead | None:
+        # Returns the lead when it is the first of its company, None when it was consolidated
+        key = consolidation_key(lead)
+        if not key:
+            return lead
+        settled = self._settled.get(key)
+        if settled is not None:
+            self._settled.move_to_end(key)
+            merge_into(settled, lead)
+            self._reopened[key] = settled
+            self.merged += 1
+            return None
+        canonical = self._pending.get(key)
+        if canonical is None:
+            self._pending[key] = lead
+            return lead
+        merge_into(canonical, lead)
+        self.merged += 1
+        return None
+
+    def settle(self, lead: Lead) -> None:
+        key = consolidation_key(lead)
+        if self._pending.pop(key, None) is not None:
+            self._settled[key] = lead
+            if len(self._settled) > self.max_settled:
+                self._settled.popitem(last=False)
+
+    def take_reopened(self) -> list[Lead]:
+        # Settled leads that gained copies since they were scored, each returned once per change
+        reopened = list(self._reopened.values())
+        self._reopened.clear()
+        return reopened
+
+
+def merge_into(canonical: Lead, other: Lead) -> Lead:
+    for keyword in other.hits():
+        canonical.add_keyword_hit(keyword)
+    for variant in other.variant_hits():
+        canonical.add_variant_hit(variant)
+
+    quotes = canonical.pain_quote.split(QUOTE_SEPARATOR) if canonical.pain_quote else []
+    if other.pain_quote and other.pain_quote not in quotes and len(quotes) < MAX_MERGED_QUOTES:
+        canonical.pain_quote = QUOTE_SEPARATOR.join([*quotes, other.pain_quote])
+
+    if other.evidence_url and other.evidence_url != canonical.evidence_url and other.evidence_url not in canonical.notes:
+        also_seen = f"also seen: {other.evidence_url}" if other.source == canonical.source else f"also seen on {other.source}: {other.evidence_url}"
+        canonical.notes = f"{canonical.notes}; {also_seen}" if canonical.notes else also_seen
+    return canonical
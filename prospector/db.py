@@ -0,0 +1,15 @@
+from __future__ import annotations
+
+import sqlite3
+from pathlib import Path
+
+
+def connect(path: str) -> sqlite3.Connection:
+    # Shared by the local SQLite stores. WAL keeps readers unblocked while a run writes, and
+    # check_same_thread=False lets worker threads share the connection behind the caller's lock.
+    db_path = Path(path)
+    db_path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(str(db_path), timeout=30, check_same_thread=False)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    return conn
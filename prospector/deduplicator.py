@@ -1,25 +1,36 @@
 from __future__ import annotations
 
+from prospector.domains import normalize_domain
 from prospector.models import Lead
+from prospector.state import SeenDomainStore
+
+
+def dedup_key(lead: Lead) -> str:
+    # app.foo.com, foo.com:443 and blog.foo.com are one company
+    return normalize_domain(lead.domain) or lead.domain
 
 
 class Deduplicator:
-    def __init__(self, seen_domains: dict[str, str], improvement_threshold: int = 15) -> None:
+    def __init__(self, seen_domains: dict[str, str] | SeenDomainStore, improvement_threshold: int = 15) -> None:
         self.seen_domains = seen_domains
         self.improvement_threshold = improvement_threshold
 
     def split_new_and_seen(self, leads: list[Lead], previous_scores: dict[str, int] | None = None) -> tuple[list[Lead], list[Lead]]:
+        if previous_scores is None and isinstance(self.seen_domains, SeenDomainStore):
+            previous_scores = self.seen_domains.last_scores([dedup_key(lead) for lead in leads])
         previous_scores = previous_scores or {}
         new_leads: list[Lead] = []
         skipped: list[Lead] = []
 
         for lead in leads:
-            if lead.domain not in self.seen_domains:
+            key = dedup_key(lead)
+            if key not in self.seen_domains:
                 new_leads.append(lead)
                 continue
 
-            prior_score = previous_scores.get(lead.domain, 0)
-            if lead.fit_score - prior_score > self.improvement_threshold:
+            # Domains seen without a score (migrated from the JSON state) have no baseline to improve on
+            prior_score = previous_scores.get(key)
+            if prior_score is not None and lead.fit_score - prior_score > self.improvement_threshold:
                 new_leads.append(lead)
             else:
                 lead.discard_reason = "already_seen"
@@ -28,5 +39,8 @@ class Deduplicator:
         return new_leads, skipped
 
     def mark(self, leads: list[Lead], date_value: str) -> None:
+        if isinstance(self.seen_domains, SeenDomainStore):
+            self.seen_domains.mark([(dedup_key(lead), lead.fit_score) for lead in leads], date_value)
+            return
         for lead in leads:
-            self.seen_domains.setdefault(lead.domain, date_value)
+            self.seen_domains.setdefault(dedup_key(lead), date_value)
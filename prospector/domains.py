@@ -0,0 +1,151 @@
+from __future__ import annotations
+
+import re
+from collections.abc import Iterator
+from functools import cache, lru_cache
+from importlib import resources
+from urllib.parse import urlsplit
+
+# Bundled snapshot of https://publicsuffix.org/list/ (ICANN and private rules), so foo.co.uk and
+# foo.vercel.app stay distinct companies while app.foo.com and blog.foo.com collapse into foo.com
+SUFFIX_LIST = "public_suffix_list.dat"
+
+# Loose (and cheap) first pass over dotted tokens; every candidate is then checked against the suffix list
+DOMAIN_CANDIDATE = re.compile(r"\b(?:https?://)?([a-zA-Z0-9-]++(?:\.[a-zA-Z0-9-]++)+)\b")
+
+# Real TLDs that are far more often file extensions in post text ("main.py", "README.md");
+# they still count when written as a URL or with www.
+FILE_EXTENSION_TLDS = frozenset({"py", "md", "zip", "mov", "sh", "rs"})
+
+# The sites leads are found on, never the lead's own company
+PLATFORM_DOMAINS = frozenset({"reddit.com", "redd.it", "x.com", "twitter.com", "ycombinator.com", "indiehackers.com", "producthunt.com"})
+
+# Multi-tenant hosts missing from the suffix list: each subdomain is its own creator or company,
+# so foo.substack.com stays foo.substack.com instead of collapsing into substack.com
+HOSTING_PLATFORMS = frozenset(
+    {
+        "beehiiv.com",
+        "bubbleapps.io",
+        "glideapp.io",
+        "gumroad.com",
+        "hashnode.dev",
+        "mailchimpsites.com",
+        "medium.com",
+        "notion.site",
+        "softr.app",
+        "squarespace.com",
+        "substack.com",
+        "super.site",
+        "webflow.io",
+        "wordpress.com",
+    }
+)
+
+_TERMINAL = ""
+
+
+@cache
+def _suffix_trie() -> dict:
+    # Labels are stored right to left: "co.uk" is trie["uk"]["co"]; "" marks the end of a rule,
+    # "*" a wildcard label and "!label" an exception to a wildcard
+    trie: dict = {}
+    text = resources.files("prospector").joinpath("data", SUFFIX_LIST).read_text(encoding="utf-8")
+    for line in text.splitlines():
+        rule = line.strip()
+        if not rule or rule.startswith("//"):
+            continue
+        for form in {rule, _ascii_rule(rule)}:
+            node = trie
+            for label in reversed(form.split(".")):
+                node = node.setdefault(label, {})
+            node[_TERMINAL] = True
+    return trie
+
+
+def _ascii_rule(rule: str) -> str:
+    # Hosts reach us in punycode (xn--...), the list is written in Unicode
+    if rule.isascii():
+        return rule
+    try:
+        return ".".join(label if label == "*" or label.startswith("!") else label.encode("idna").decode("ascii") for label in rule.split("."))
+    except UnicodeError:
+        return rule
+
+
+def public_suffix_length(labels: list[str]) -> int:
+    # Number of trailing labels that form the public suffix; 0 when the TLD is unknown
+    node = _suffix_trie()
+    length = 0
+    for depth, label in enumerate(reversed(labels), 1):
+        if f"!{label}" in node:
+            return depth - 1
+        child = node.get(label)
+        if child is None:
+            child = node.get("*")
+            if child is None:
+                break
+        node = child
+        if _TERMINAL in node:
+            length = depth
+    return length
+
+
+def registrable_domain(host: str) -> str:
+    # eTLD+1 of a bare, lower-case host, or "" for public suffixes, IPs and unknown TLDs
+    labels = host.split(".")
+    if not all(labels):
+        return ""
+    suffix = public_suffix_length(labels)
+    if not suffix or suffix >= len(labels):
+        return ""
+    domain = ".".join(labels[-suffix - 1 :])
+    if domain in HOSTING_PLATFORMS and len(labels) > suffix + 1 and labels[-suffix - 2] != "www":
+        return f"{labels[-suffix - 2]}.{domain}"
+    return domain
+
+
+@lru_cache(maxsize=65536)
+def normalize_domain(value: str) -> str:
+    # URL, host or host:port -> registrable domain: "https://App.Foo.com:443/x" -> "foo.com"
+    if not value:
+        return ""
+    value = value.strip().lower()
+    host = urlsplit(value).hostname if "://" in value else value.split("/", 1)[0].rsplit("@", 1)[-1].split(":", 1)[0]
+    if not host:
+        return ""
+    return registrable_domain(host.rstrip("."))
+
+
+def domain_from_url(url: str) -> str:
+    domain = normalize_domain(url)
+    return "" if _is_platform(domain) else domain
+
+
+def _is_platform(domain: str) -> bool:
+    # A bare hosting platform (medium.com/@foo) names no tenant, so it is no company either
+    return domain in PLATFORM_DOMAINS or domain in HOSTING_PLATFORMS
+
+
+def iter_domains(text: str) -> Iterator[str]:
+    # Company domains mentioned in free text, in order (repeats included)
+    roots = _suffix_trie()
+    # Most words have no dot; skipping them before the regex roughly halves the scan
+    for token in (text or "").split():
+        if "." not in token:
+            continue
+        for match in DOMAIN_CANDIDATE.finditer(token):
+            candidate = match.group(1).lower()
+            tld = candidate.rsplit(".", 1)[1]
+            # TLD check first: "e.g", "v1.2", "index.html" and "node.js" never reach the suffix walk
+            if tld not in roots:
+                continue
+            explicit = match.group(0) != match.group(1) or candidate.startswith("www.")
+            if tld in FILE_EXTENSION_TLDS and not explicit:
+                continue
+            domain = normalize_domain(candidate)
+            if domain and not _is_platform(domain):
+                yield domain
+
+
+def extract_domain(text: str) -> str:
+    return next(iter_domains(text), "")
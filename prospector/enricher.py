@@ -1,87 +1,329 @@
 from __future__ import annotations
 
+import asyncio
+import logging
 import re
-from urllib.parse import urljoin
+import threading
+from abc import ABC, abstractmethod
+from collections.abc import Iterable, Iterator
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, as_completed, wait
+from contextlib import aclosing, closing, contextmanager
+from urllib.parse import urljoin, urlparse
 
-from prospector.http import RequestManager
-from prospector.models import Lead
+from prospector.async_http import AsyncRequestManager
+from prospector.domains import normalize_domain
+from prospector.enrichment_store import EnrichmentStore
+from prospector.html_text import DEFAULT_MAX_BYTES, PageText, aextract_page, extract_page
+from prospector.http import HTML_CONTENT_TYPES, RequestManager
+from prospector.matcher import TermMatcher, count_hits
+from prospector.metrics import METRICS
+from prospector.models import EnrichmentResult, Lead
 
 SUPPORT_STACKS = ["intercom", "helpscout", "crisp", "zendesk", "freshdesk", "gorgias"]
 DOCS_PATHS = ["/docs", "/help", "/support", "/kb"]
+DOCS_SUBDOMAINS = ["docs", "help", "support", "kb", "developers"]
 B2B_TERMS = ["dashboard", "api", "integrations", "pricing", "team"]
 SMALL_TEAM_TERMS = ["indie", "bootstrapped", "solo", "founder", "small team", "just the two of us", "small team of"]
 TEAM_PAGES = ["/about", "/team"]
 
+# One matcher covers every page signal, so each term is scanned for once per page instead of once per list
+PAGE_MATCHER = TermMatcher([*SUPPORT_STACKS, *B2B_TERMS, *SMALL_TEAM_TERMS])
+B2B_TERM_SET = frozenset(B2B_TERMS)
+SMALL_TEAM_TERM_SET = frozenset(SMALL_TEAM_TERMS)
+
+# Widget hosts that don't carry the vendor's name
+SUPPORT_STACK_HOSTS = {"zdassets.com": "zendesk", "freshworks.com": "freshdesk"}
+
+logger = logging.getLogger("prospector.enricher")
+
 
 class Enricher:
-    def __init__(self, request_manager: RequestManager) -> None:
+    def __init__(
+        self,
+        request_manager: RequestManager,
+        max_per_host: int = 2,
+        page_workers: int = 6,
+        store: EnrichmentStore | None = None,
+        async_request_manager: AsyncRequestManager | None = None,
+        max_page_bytes: int = DEFAULT_MAX_BYTES,
+    ) -> None:
         self.request_manager = request_manager
+        # Only aenrich() uses this; its locks and host slots live on the executor's event loop
+        self.async_request_manager = async_request_manager
+        self.max_per_host = max(1, int(max_per_host))
+        self.max_page_bytes = max_page_bytes
+        self.store = store
+        self.stats = {"run_hits": 0, "store_hits": 0, "misses": 0}
+        self._results: dict[str, EnrichmentResult | None] = {}
+        self._domain_locks: dict[str, threading.Lock] = {}
+        self._stats_lock = threading.Lock()
+        self._host_slots: dict[str, threading.BoundedSemaphore] = {}
+        self._host_slots_lock = threading.Lock()
+        self._page_pool = ThreadPoolExecutor(max_workers=max(1, int(page_workers)), thread_name_prefix="enrich-page")
+        self._async_domain_locks: dict[str, asyncio.Lock] = {}
+        self._async_host_slots: dict[str, asyncio.Semaphore] = {}
+
+    def close(self) -> None:
+        self._page_pool.shutdown(wait=True)
+        if self.store is not None:
+            self.store.close()
+        self.request_manager.close()
+
+    async def aclose(self) -> None:
+        # Must run on the loop that used the async client
+        if self.async_request_manager is not None:
+            await self.async_request_manager.aclose()
 
     def enrich(self, lead: Lead) -> Lead:
-        if not lead.domain:
+        # Junk (version numbers, IPs, unknown TLDs) normalizes to "" and is never fetched
+        domain = normalize_domain(lead.domain)
+        if not domain:
             return lead
 
-        home_url = self._normalize_home_url(lead.domain)
-        try:
-            html = self.request_manager.get_text(home_url)
-        except RuntimeError:
+        # A company is scraped at most once per run, however many leads or subdomains point at it
+        with self._domain_lock(domain):
+            result = self._known_result(domain)
+            if result is False:
+                result = self._remember(domain, self._scrape(domain))
+
+        if result is not None:
+            result.apply_to(lead)
+        return lead
+
+    async def aenrich(self, lead: Lead) -> Lead:
+        domain = normalize_domain(lead.domain)
+        if not domain:
             return lead
 
-        lower_html = html.lower()
-        lead.support_stack = self._detect_support_stack(lower_html)
-        lead.b2b_signal_count = self._count_signals(lower_html, B2B_TERMS)
-        lead.small_team_signal_count = self._count_signals(lower_html, SMALL_TEAM_TERMS)
-        # NOTE: docs URL check removed — 4 HEAD requests per lead is too expensive
-        # lead.docs_url = self._find_docs_url(home_url)
+        lock = self._async_domain_locks.get(domain)
+        if lock is None:
+            lock = self._async_domain_locks[domain] = asyncio.Lock()
+        async with lock:
+            result = self._known_result(domain)
+            if result is False:
+                result = self._remember(domain, await self._ascrape(domain))
+
+        if result is not None:
+            result.apply_to(lead)
+        return lead
+
+    def _known_result(self, domain: str) -> EnrichmentResult | None | bool:
+        # The run's or the store's result for domain, or False when it still has to be scraped
+        if domain in self._results:
+            self._count("run_hits")
+            METRICS.inc("enrichment_total", result="run_hit")
+            return self._results[domain]
+        result = self.store.get(domain) if self.store is not None else None
+        if result is None:
+            return False
+        self._count("store_hits")
+        METRICS.inc("enrichment_total", result="store_hit")
+        self._results[domain] = result
+        return result
+
+    def _remember(self, domain: str, result: EnrichmentResult | None) -> EnrichmentResult | None:
+        self._count("misses")
+        METRICS.inc("enrichment_total", result="scraped" if result is not None else "failed")
+        # Failed fetches are remembered for this run only
+        if result is not None and self.store is not None:
+            self.store.put(domain, result)
+        self._results[domain] = result
+        return result
+
+    def _scrape(self, domain: str) -> EnrichmentResult | None:
+        home_url = self._normalize_home_url(domain)
+        # Home, /about and /team are independent, so they go out together (capped per host)
+        home_future = self._page_pool.submit(self._fetch_page, home_url)
+        detail_futures = [self._page_pool.submit(self._fetch_page, url) for url in self._detail_urls(home_url)]
+
+        home = home_future.result()
+        if home is None:
+            for future in detail_futures:
+                future.cancel()
+            return None
+        result = self._analyse(home, [future.result() for future in detail_futures])
+        result.docs_url = self._linked_docs_url(home_url, home.hrefs) or self._find_docs_url(home_url)
+        return result
+
+    async def _ascrape(self, domain: str) -> EnrichmentResult | None:
+        home_url = self._normalize_home_url(domain)
+        home_task = asyncio.ensure_future(self._afetch_page(home_url))
+        detail_tasks = [asyncio.ensure_future(self._afetch_page(url)) for url in self._detail_urls(home_url)]
 
-        details_text = self._scrape_details_pages(home_url)
+        home = await home_task
+        if home is None:
+            for task in detail_tasks:
+                task.cancel()
+            await asyncio.gather(*detail_tasks, return_exceptions=True)
+            return None
+        result = self._analyse(home, await asyncio.gather(*detail_tasks))
+        result.docs_url = self._linked_docs_url(home_url, home.hrefs) or await self._afind_docs_url(home_url)
+        return result
+
+    def _detail_urls(self, home_url: str) -> list[str]:
+        return [urljoin(home_url.rstrip("/") + "/", page.lstrip("/")) for page in TEAM_PAGES]
+
+    def _analyse(self, home: PageText, detail_pages: list[PageText | None]) -> EnrichmentResult:
+        # B2B and team signals come from visible text only; the support stack also shows up in
+        # the hosts scripts load from and in links to a hosted help centre
+        hits = PAGE_MATCHER.find(home.text)
+        stack_hits = hits | PAGE_MATCHER.find(" ".join([*home.script_hosts, *home.hrefs]))
+        for host in home.script_hosts:
+            stack = SUPPORT_STACK_HOSTS.get(host.partition(".")[2]) or SUPPORT_STACK_HOSTS.get(host)
+            if stack:
+                stack_hits.add(stack)
+        result = EnrichmentResult(
+            support_stack=self._detect_support_stack(stack_hits),
+            b2b_signal_count=count_hits(hits, B2B_TERM_SET),
+            small_team_signal_count=count_hits(hits, SMALL_TEAM_TERM_SET),
+        )
+        details_text = "\n".join(page.text for page in detail_pages if page is not None)
         if details_text:
-            low_details = details_text.lower()
-            lead.small_team_signal_count = max(
-                lead.small_team_signal_count,
-                self._count_signals(low_details, SMALL_TEAM_TERMS),
+            result.small_team_signal_count = max(
+                result.small_team_signal_count,
+                count_hits(PAGE_MATCHER.find(details_text), SMALL_TEAM_TERM_SET),
             )
-            lead.team_size_signal = self._extract_team_size_signal(details_text)
-            lead.founder_name = self._extract_founder_name(details_text)
-            lead.location = self._extract_location(details_text)
+            result.team_size_signal = self._extract_team_size_signal(details_text)
+            result.founder_name = self._extract_founder_name(details_text)
+            result.location = self._extract_location(details_text)
 
-        return lead
+        return result
 
     def _normalize_home_url(self, domain: str) -> str:
         if domain.startswith("http://") or domain.startswith("https://"):
             return domain
         return f"https://{domain}"
 
-    def _detect_support_stack(self, html: str) -> str:
+    def _detect_support_stack(self, hits: set[str]) -> str:
         for stack in SUPPORT_STACKS:
-            if stack in html:
+            if stack in hits:
                 return stack
         return "unknown"
 
+    @staticmethod
+    def _linked_docs_url(home_url: str, hrefs: Iterable[str]) -> str:
+        # Most sites link their docs from the homepage, which costs no extra request to find
+        site = urlparse(home_url).netloc.lower().removeprefix("www.")
+        for href in hrefs:
+            url = urlparse(urljoin(home_url, href.partition("#")[0]))
+            host = url.netloc.lower().removeprefix("www.")
+            if url.scheme not in ("http", "https"):
+                continue
+            if host == site and "/" + url.path.lower().strip("/").split("/")[0] in DOCS_PATHS:
+                return url._replace(query="", fragment="").geturl()
+            subdomain, _, parent = host.partition(".")
+            if parent == site and subdomain in DOCS_SUBDOMAINS:
+                return f"{url.scheme}://{url.netloc}"
+        return ""
+
+    def _docs_probe_urls(self, home_url: str) -> list[str]:
+        return [urljoin(home_url.rstrip("/") + "/", path.lstrip("/")) for path in DOCS_PATHS]
+
     def _find_docs_url(self, home_url: str) -> str:
-        for path in DOCS_PATHS:
-            docs_url = urljoin(home_url.rstrip("/") + "/", path.lstrip("/"))
+        # Fallback when nothing is linked: probe every path at once and take the first to answer
+        # below 400. Once one has, probes not yet started are cancelled and those waiting on the
+        # host slot skip their request; one already in flight runs out. The result is kept in the
+        # enrichment store, so a domain is probed at most once per max_age_days.
+        found = threading.Event()
+        futures = {self._page_pool.submit(self._probe, url, found): url for url in self._docs_probe_urls(home_url)}
+        try:
+            for future in as_completed(futures):
+                if future.result():
+                    return futures[future]
+        finally:
+            found.set()
+            for future in futures:
+                future.cancel()
+        return ""
+
+    async def _afind_docs_url(self, home_url: str) -> str:
+        tasks = [asyncio.ensure_future(self._aprobe(url)) for url in self._docs_probe_urls(home_url)]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                docs_url = await next_done
+                if docs_url:
+                    return docs_url
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+        return ""
+
+    def _probe(self, url: str, found: threading.Event) -> bool:
+        with self._host_slot(urlparse(url).netloc):
+            if found.is_set():
+                return False
             try:
-                status = self.request_manager.head_status(docs_url)
+                answered = self.request_manager.head_status(url) < 400
             except RuntimeError:
-                continue
-            if status < 400:
-                return docs_url
-        return ""
+                return False
+            # Set before the slot is released, so the next probe in line already sees it
+            if answered:
+                found.set()
+            return answered
 
-    def _scrape_details_pages(self, home_url: str) -> str:
-        chunks: list[str] = []
-        for page in TEAM_PAGES:
-            url = urljoin(home_url.rstrip("/") + "/", page.lstrip("/"))
+    async def _aprobe(self, url: str) -> str:
+        async with self._async_host_slot(urlparse(url).netloc):
             try:
-                chunks.append(self.request_manager.get_text(url))
+                return url if await self.async_request_manager.head_status(url) < 400 else ""
             except RuntimeError:
-                continue
-        return "\n".join(chunks)
+                return ""
+
+    def _fetch_page(self, url: str) -> PageText | None:
+        # The decoded stream goes straight into the parser, which stops pulling (and closing()
+        # drops the connection) once the page budget is spent; nothing is joined or re-chunked.
+        # Parsing runs as the body arrives, so the extract timing includes the download.
+        with self._host_slot(urlparse(url).netloc):
+            try:
+                with closing(self.request_manager.stream_text(url, max_bytes=self.max_page_bytes, content_types=HTML_CONTENT_TYPES)) as chunks:
+                    with METRICS.timer("stage_seconds", stage="extract"):
+                        page = extract_page(chunks, self.max_page_bytes)
+            except RuntimeError:
+                return None
+        return self._count_truncated(page)
+
+    async def _afetch_page(self, url: str) -> PageText | None:
+        async with self._async_host_slot(urlparse(url).netloc):
+            stream = self.async_request_manager.stream_text(url, max_bytes=self.max_page_bytes, content_types=HTML_CONTENT_TYPES)
+            try:
+                async with aclosing(stream) as chunks:
+                    with METRICS.timer("stage_seconds", stage="extract"):
+                        page = await aextract_page(chunks, self.max_page_bytes)
+            except RuntimeError:
+                return None
+        return self._count_truncated(page)
 
     @staticmethod
-    def _count_signals(text: str, terms: list[str]) -> int:
-        return sum(1 for term in terms if term in text)
+    def _count_truncated(page: PageText) -> PageText:
+        if page.truncated:
+            METRICS.inc("enrichment_pages_truncated_total")
+        return page
+
+    def _domain_lock(self, domain: str) -> threading.Lock:
+        with self._stats_lock:
+            lock = self._domain_locks.get(domain)
+            if lock is None:
+                lock = self._domain_locks[domain] = threading.Lock()
+        return lock
+
+    def _count(self, key: str) -> None:
+        with self._stats_lock:
+            self.stats[key] += 1
+
+    @contextmanager
+    def _host_slot(self, host: str) -> Iterator[None]:
+        with self._host_slots_lock:
+            slot = self._host_slots.get(host)
+            if slot is None:
+                slot = self._host_slots[host] = threading.BoundedSemaphore(self.max_per_host)
+        with slot:
+            yield
+
+    def _async_host_slot(self, host: str) -> asyncio.Semaphore:
+        slot = self._async_host_slots.get(host)
+        if slot is None:
+            slot = self._async_host_slots[host] = asyncio.Semaphore(self.max_per_host)
+        return slot
 
     @staticmethod
     def _extract_team_size_signal(text: str) -> str:
@@ -116,3 +358,95 @@ class Enricher:
         if match:
             return match.group(1).strip()
         return ""
+
+
+class BaseEnrichmentExecutor(ABC):
+    # Streams leads through enrichment: run() yields each lead as soon as it is enriched, with at
+    # most max_in_flight leads submitted ahead; subclasses decide where the work runs
+    def __init__(self, enricher: Enricher, max_in_flight: int) -> None:
+        self.enricher = enricher
+        self.max_in_flight = max(1, int(max_in_flight))
+
+    def run(self, leads: Iterable[Lead]) -> Iterator[Lead]:
+        pending: set[Future[Lead]] = set()
+        for lead in leads:
+            pending.add(self._submit(lead))
+            if len(pending) >= self.max_in_flight:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield future.result()
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield future.result()
+
+    @abstractmethod
+    def close(self) -> None:
+        raise NotImplementedError
+
+    @abstractmethod
+    def _submit(self, lead: Lead) -> Future[Lead]:
+        raise NotImplementedError
+
+    @staticmethod
+    def _failed(lead: Lead, exc: Exception) -> Lead:
+        METRICS.inc("enrichment_total", result="error")
+        logger.warning("enrichment failed for %s: %s", lead.domain, exc)
+        return lead
+
+
+class EnrichmentExecutor(BaseEnrichmentExecutor):
+    # One thread pool for the executor's lifetime; at most 2x workers leads are buffered in flight
+    def __init__(self, enricher: Enricher, workers: int = 8) -> None:
+        self.workers = max(1, int(workers))
+        super().__init__(enricher, self.workers * 2)
+        self._pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="enrich")
+
+    def close(self) -> None:
+        self._pool.shutdown(wait=True)
+
+    def _submit(self, lead: Lead) -> Future[Lead]:
+        return self._pool.submit(self._enrich_one, lead)
+
+    def _enrich_one(self, lead: Lead) -> Lead:
+        # Only enrich leads that have a domain — enrichment without a domain is a no-op anyway
+        if not lead.domain:
+            return lead
+        try:
+            with METRICS.timer("stage_seconds", stage="enrich"):
+                return self.enricher.enrich(lead)
+        except Exception as exc:  # noqa: BLE001
+            return self._failed(lead, exc)
+
+
+class AsyncEnrichmentExecutor(BaseEnrichmentExecutor):
+    # Same streaming contract as EnrichmentExecutor, but leads are enriched by coroutines on one
+    # background event loop, so hundreds of page fetches can be in flight without a thread each
+    def __init__(self, enricher: Enricher, concurrency: int = 200) -> None:
+        if enricher.async_request_manager is None:
+            raise ValueError("AsyncEnrichmentExecutor needs an Enricher with an async_request_manager")
+        super().__init__(enricher, concurrency)
+        self.concurrency = self.max_in_flight
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name="enrich-loop", daemon=True)
+        self._thread.start()
+
+    def close(self) -> None:
+        if self._loop.is_closed():
+            return
+        asyncio.run_coroutine_threadsafe(self.enricher.aclose(), self._loop).result()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
+
+    def _submit(self, lead: Lead) -> Future[Lead]:
+        return asyncio.run_coroutine_threadsafe(self._enrich_one(lead), self._loop)
+
+    async def _enrich_one(self, lead: Lead) -> Lead:
+        if not lead.domain:
+            return lead
+        try:
+            with METRICS.timer("stage_seconds", stage="enrich"):
+                return await self.enricher.aenrich(lead)
+        except Exception as exc:  # noqa: BLE001
+            return self._failed(lead, exc)
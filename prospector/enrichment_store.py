@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+import threading
+from dataclasses import asdict, fields
+from datetime import datetime, timedelta, timezone
+
+from prospector.db import connect
+from prospector.models import EnrichmentResult
+
+_COLUMNS = [f.name for f in fields(EnrichmentResult)]
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS enrichment (
+    domain TEXT PRIMARY KEY,
+    support_stack TEXT NOT NULL,
+    b2b_signal_count INTEGER NOT NULL,
+    small_team_signal_count INTEGER NOT NULL,
+    team_size_signal TEXT NOT NULL,
+    founder_name TEXT NOT NULL,
+    location TEXT NOT NULL,
+    enriched_at TEXT NOT NULL,
+    docs_url TEXT NOT NULL DEFAULT ''
+);
+"""
+
+
+class EnrichmentStore:
+    def __init__(self, path: str, max_age_days: int = 14) -> None:
+        self.max_age = timedelta(days=max_age_days)
+        self._lock = threading.Lock()
+        self._conn = connect(path)
+        self._conn.executescript(_SCHEMA)
+        # Stores created before docs detection lack the column; their rows age out via max_age_days
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(enrichment)")}
+        if "docs_url" not in columns:
+            self._conn.execute("ALTER TABLE enrichment ADD COLUMN docs_url TEXT NOT NULL DEFAULT ''")
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def get(self, domain: str) -> EnrichmentResult | None:
+        cutoff = (datetime.now(timezone.utc) - self.max_age).isoformat()
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT {', '.join(_COLUMNS)} FROM enrichment WHERE domain = ? AND enriched_at >= ?",
+                (domain, cutoff),
+            ).fetchone()
+        if row is None:
+            return None
+        return EnrichmentResult(**dict(zip(_COLUMNS, row)))
+
+    def put(self, domain: str, result: EnrichmentResult) -> None:
+        values = asdict(result)
+        with self._lock, self._conn:
+            self._conn.execute(
+                f"INSERT OR REPLACE INTO enrichment (domain, {', '.join(_COLUMNS)}, enriched_at) "
+                f"VALUES (?, {', '.join('?' for _ in _COLUMNS)}, ?)",
+                (domain, *(values[name] for name in _COLUMNS), datetime.now(timezone.utc).isoformat()),
+            )
@@ -0,0 +1,200 @@
+from __future__ import annotations
+
+import threading
+from collections.abc import Iterator
+from pathlib import Path
+
+from prospector.db import connect
+from prospector.models import Lead
+from prospector.outputs.csv_writer import lead_from_row, read_leads_csv
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS leads (
+    id INTEGER PRIMARY KEY,
+    date_found TEXT NOT NULL,
+    company TEXT NOT NULL,
+    domain TEXT NOT NULL,
+    source TEXT NOT NULL,
+    evidence_url TEXT NOT NULL,
+    pain_quote TEXT NOT NULL,
+    support_stack TEXT NOT NULL,
+    docs_url TEXT NOT NULL,
+    fit_score INTEGER NOT NULL,
+    status TEXT NOT NULL,
+    notes TEXT NOT NULL,
+    b2b_signal_count INTEGER NOT NULL DEFAULT 0,
+    small_team_signal_count INTEGER NOT NULL DEFAULT 0,
+    team_size_signal TEXT NOT NULL DEFAULT '',
+    keyword_variant_hits TEXT NOT NULL DEFAULT '',
+    scorable INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS leads_date_found ON leads (date_found);
+CREATE INDEX IF NOT EXISTS leads_fit_score ON leads (fit_score);
+CREATE INDEX IF NOT EXISTS leads_source ON leads (source);
+CREATE INDEX IF NOT EXISTS leads_domain ON leads (domain);
+
+-- Running (source, band) totals kept by triggers, so stats never scan the leads table
+CREATE TABLE IF NOT EXISTS lead_counts (
+    source TEXT NOT NULL,
+    band TEXT NOT NULL,
+    count INTEGER NOT NULL,
+    PRIMARY KEY (source, band)
+);
+CREATE TRIGGER IF NOT EXISTS leads_counts_insert AFTER INSERT ON leads BEGIN
+    INSERT INTO lead_counts (source, band, count) VALUES (new.source, {new_band}, 1)
+    ON CONFLICT(source, band) DO UPDATE SET count = count + 1;
+END;
+CREATE TRIGGER IF NOT EXISTS leads_counts_rescore AFTER UPDATE OF fit_score ON leads BEGIN
+    UPDATE lead_counts SET count = count - 1 WHERE source = old.source AND band = {old_band};
+    INSERT INTO lead_counts (source, band, count) VALUES (new.source, {new_band}, 1)
+    ON CONFLICT(source, band) DO UPDATE SET count = count + 1;
+END;
+"""
+
+# Everything the scorer reads is stored, so rescoring from history matches the original run
+_COLUMNS = [
+    "date_found",
+    "company",
+    "domain",
+    "source",
+    "evidence_url",
+    "pain_quote",
+    "support_stack",
+    "docs_url",
+    "fit_score",
+    "status",
+    "notes",
+    "b2b_signal_count",
+    "small_team_signal_count",
+    "team_size_signal",
+    "keyword_variant_hits",
+]
+
+
+def _band_sql(score: str) -> str:
+    # Same cut-offs as Scorer.band
+    return f"CASE WHEN {score} >= 70 THEN 'High' WHEN {score} >= 40 THEN 'Medium' ELSE 'Low' END"
+
+
+def _values(lead: Lead) -> tuple:
+    return tuple(
+        ",".join(sorted(lead.variant_hits())) if name == "keyword_variant_hits" else getattr(lead, name)
+        for name in _COLUMNS
+    )
+
+
+def _lead(row: tuple) -> Lead:
+    values = dict(zip(_COLUMNS, row))
+    variants = values.pop("keyword_variant_hits")
+    b2b = values.pop("b2b_signal_count")
+    small = values.pop("small_team_signal_count")
+    team_size = values.pop("team_size_signal")
+    lead = Lead(**values)
+    lead.b2b_signal_count = b2b
+    lead.small_team_signal_count = small
+    lead.team_size_signal = team_size
+    if variants:
+        for variant in variants.split(","):
+            lead.add_variant_hit(variant)
+    return lead
+
+
+class LeadHistory:
+    # Indexed copy of every kept lead; the CSV stays the human-facing export, this backs
+    # stats/export/rescore so they run as queries instead of parsing the whole CSV
+    def __init__(self, path: str, legacy_csv_path: str | None = None) -> None:
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = connect(path)
+        self._conn.executescript(_SCHEMA.format(new_band=_band_sql("new.fit_score"), old_band=_band_sql("old.fit_score")))
+        # Histories created before the flag cannot tell imported rows from scored ones; all stay unscorable
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(leads)")}
+        if "scorable" not in columns:
+            self._conn.execute("ALTER TABLE leads ADD COLUMN scorable INTEGER NOT NULL DEFAULT 0")
+        if legacy_csv_path and not len(self):
+            self._import_csv(legacy_csv_path)
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return int(self._conn.execute("SELECT COUNT(*) FROM leads").fetchone()[0])
+
+    def write(self, leads: list[Lead], scorable: bool = True) -> None:
+        # scorable: the lead carries the signals the scorer read (false for rows seeded from the CSV)
+        with self._lock, self._conn:
+            self._conn.executemany(
+                f"INSERT INTO leads ({', '.join(_COLUMNS)}, scorable) VALUES ({', '.join('?' for _ in _COLUMNS)}, ?)",
+                [(*_values(lead), int(scorable)) for lead in leads],
+            )
+
+    def unscorable_count(self) -> int:
+        with self._lock:
+            return int(self._conn.execute("SELECT COUNT(*) FROM leads WHERE scorable = 0").fetchone()[0])
+
+    def band_counts(self) -> dict[str, int]:
+        counts = {"High": 0, "Medium": 0, "Low": 0}
+        with self._lock:
+            rows = self._conn.execute("SELECT band, SUM(count) FROM lead_counts GROUP BY band").fetchall()
+        counts.update({band: int(count) for band, count in rows})
+        return counts
+
+    def source_counts(self) -> dict[str, int]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT source, SUM(count) FROM lead_counts GROUP BY source HAVING SUM(count) > 0 ORDER BY source"
+            ).fetchall()
+        return {source: int(count) for source, count in rows}
+
+    def date_range(self) -> tuple[str, str] | None:
+        with self._lock:
+            # Separate subqueries so each is a single lookup at one end of the date index
+            first, last = self._conn.execute(
+                "SELECT (SELECT MIN(date_found) FROM leads), (SELECT MAX(date_found) FROM leads)"
+            ).fetchone()
+        return (first, last) if first else None
+
+    def top(self, limit: int | None = None) -> list[Lead]:
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT {', '.join(_COLUMNS)} FROM leads ORDER BY fit_score DESC, id DESC LIMIT ?",
+                (-1 if limit is None else limit,),
+            ).fetchall()
+        return [_lead(row) for row in rows]
+
+    def iter_batches(self, batch_size: int = 10_000, scorable_only: bool = False) -> Iterator[tuple[list[int], list[Lead]]]:
+        # (ids, leads) in id order; reads are paged so a full rescore never holds every lead
+        last_id = 0
+        where = "id > ? AND scorable = 1" if scorable_only else "id > ?"
+        while True:
+            with self._lock:
+                rows = self._conn.execute(
+                    f"SELECT id, {', '.join(_COLUMNS)} FROM leads WHERE {where} ORDER BY id LIMIT ?",
+                    (last_id, batch_size),
+                ).fetchall()
+            if not rows:
+                return
+            last_id = rows[-1][0]
+            yield [row[0] for row in rows], [_lead(row[1:]) for row in rows]
+
+    def update_scores(self, ids: list[int], leads: list[Lead]) -> None:
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "UPDATE leads SET fit_score = ? WHERE id = ?",
+                [(lead.fit_score, lead_id) for lead_id, lead in zip(ids, leads)],
+            )
+
+    def _import_csv(self, csv_path: str) -> None:
+        # One-time seed from the append-only CSV the tool wrote before the history existed. The
+        # CSV has no enrichment or keyword-variant signals, so these rows keep their original
+        # scores and rescore skips them
+        if not Path(csv_path).exists():
+            return
+        self.write([lead_from_row(row) for row in read_leads_csv(csv_path)], scorable=False)
+
+
+def open_lead_history(config: dict) -> LeadHistory:
+    csv_cfg = config["output"]["csv"]
+    return LeadHistory(csv_cfg["history_path"], legacy_csv_path=csv_cfg["path"])
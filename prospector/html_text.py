@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+import re
+from collections.abc import AsyncIterable, Iterable
+from html.parser import HTMLParser
+from urllib.parse import urlparse
+
+# Enough for the hero, nav, pricing teaser and footer of nearly any homepage; the rest of a
+# multi-megabyte SPA bundle is markup and inline JSON
+DEFAULT_MAX_BYTES = 256 * 1024
+CHUNK_SIZE = 64 * 1024
+
+# Elements whose content is never visible text
+_SKIPPED = frozenset({"script", "style", "template"})
+# Widget snippets usually inject their <script> from inline JS, so URLs in script bodies count too
+_SCRIPT_URL_HOST = re.compile(r"https?:(?:\\?/){2}([a-z0-9.-]+\.[a-z]{2,})", re.IGNORECASE)
+
+
+class PageTextExtractor(HTMLParser):
+    # Incremental HTML -> text: feed() chunks as they arrive and stop once it returns False.
+    # Keeps visible text, link hrefs and the hosts scripts load from (where support widgets such
+    # as widget.intercom.io show up); drops script/style bodies, so "api" in a bundle URL or
+    # inline JSON no longer counts as a page signal.
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES) -> None:
+        super().__init__(convert_charrefs=True)
+        self.max_bytes = max_bytes
+        self.fed = 0
+        self.truncated = False
+        self.hrefs: list[str] = []
+        self.script_hosts: set[str] = set()
+        self._parts: list[str] = []
+        self._skip_depth = 0
+
+    def feed(self, data: str) -> bool:
+        # Budget is counted in characters, which is bytes for the ASCII bulk of a page
+        if self.truncated:
+            return False
+        room = self.max_bytes - self.fed
+        # A page of exactly max_bytes is complete; only data past the budget truncates it
+        if len(data) > room:
+            data = data[:room]
+            self.truncated = True
+        self.fed += len(data)
+        super().feed(data)
+        return not self.truncated
+
+    def handle_starttag(self, tag: str, attrs: list[tuple[str, str | None]]) -> None:
+        if tag in _SKIPPED:
+            self._skip_depth += 1
+            if tag == "script":
+                src = dict(attrs).get("src")
+                host = urlparse(src).hostname if src else None
+                if host:
+                    self.script_hosts.add(host.lower())
+            return
+        if tag == "a":
+            href = dict(attrs).get("href")
+            if href:
+                self.hrefs.append(href.strip())
+
+    def handle_endtag(self, tag: str) -> None:
+        if tag in _SKIPPED and self._skip_depth:
+            self._skip_depth -= 1
+
+    def handle_data(self, data: str) -> None:
+        if self._skip_depth:
+            if self.lasttag == "script":
+                self.script_hosts.update(host.lower() for host in _SCRIPT_URL_HOST.findall(data))
+        elif not data.isspace():
+            self._parts.append(data)
+
+    @property
+    def text(self) -> str:
+        return " ".join(" ".join(self._parts).split())
+
+
+class PageText:
+    __slots__ = ("text", "hrefs", "script_hosts", "truncated")
+
+    def __init__(self, text: str, hrefs: list[str], script_hosts: set[str], truncated: bool) -> None:
+        self.text = text
+        self.hrefs = hrefs
+        self.script_hosts = script_hosts
+        self.truncated = truncated
+
+
+def extract_page(chunks: str | Iterable[str], max_bytes: int = DEFAULT_MAX_BYTES) -> PageText:
+    # Accepts a whole body or an iterator of decoded chunks; an iterator is not read past the budget
+    if isinstance(chunks, str):
+        body = chunks
+        chunks = (body[start : start + CHUNK_SIZE] for start in range(0, len(body), CHUNK_SIZE))
+    extractor = PageTextExtractor(max_bytes)
+    for chunk in chunks:
+        if not extractor.feed(chunk):
+            break
+    return _finish(extractor)
+
+
+async def aextract_page(chunks: AsyncIterable[str], max_bytes: int = DEFAULT_MAX_BYTES) -> PageText:
+    # extract_page for an async stream of decoded chunks
+    extractor = PageTextExtractor(max_bytes)
+    async for chunk in chunks:
+        if not extractor.feed(chunk):
+            break
+    return _finish(extractor)
+
+
+def _finish(extractor: PageTextExtractor) -> PageText:
+    extractor.close()
+    return PageText(extractor.text, extractor.hrefs, extractor.script_hosts, extractor.truncated)
@@ -1,50 +1,304 @@
 from __future__ import annotations
 
+import codecs
+import json
 import time
-from dataclasses import dataclass
+from collections.abc import Iterable, Iterator, Mapping
+from dataclasses import dataclass, field
 from typing import Any
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.request import ACCEPT_ENCODING
+
+from prospector.cache import CacheEntry, ResponseCache, cache_key
+from prospector.metrics import METRICS
+from prospector.ratelimit import MAX_BLOCK_SECONDS, RateLimiter, jittered, retry_after_seconds
+
+
+def build_session(pool_connections: int = 10, pool_maxsize: int = 10, compress: bool = True) -> requests.Session:
+    # urllib3's connection pools are thread-safe, so one Session is shared by every worker.
+    # ACCEPT_ENCODING advertises br only when brotli/brotlicffi is installed.
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers["Connection"] = "keep-alive"
+    session.headers["Accept-Encoding"] = ACCEPT_ENCODING if compress else "identity"
+    return session
+
+
+RETRYABLE_STATUSES = frozenset({429, 500, 502, 503, 504})
+# Streamed bodies are read (and counted against max_bytes) this many bytes at a time
+BODY_CHUNK_SIZE = 16 * 1024
+HTML_CONTENT_TYPES = ("text/html", "application/xhtml+xml", "text/plain")
+
+
+def incremental_decoder(encoding: str) -> codecs.IncrementalDecoder:
+    # Keeps a multi-byte character split across chunks intact
+    return codecs.getincrementaldecoder(_codec(encoding))(errors="replace")
+
+
+def decode_chunks(chunks: Iterable[bytes], encoding: str) -> Iterator[str]:
+    decoder = incremental_decoder(encoding)
+    for chunk in chunks:
+        text = decoder.decode(chunk)
+        if text:
+            yield text
+    tail = decoder.decode(b"", final=True)
+    if tail:
+        yield tail
+
+
+def _codec(encoding: str) -> str:
+    try:
+        return codecs.lookup(encoding).name
+    except LookupError:
+        return "utf-8"
+
+
+def is_dns_failure(exc: Exception) -> bool:
+    # Retrying an unresolvable host only burns the backoff schedule
+    return any(marker in str(exc) for marker in ("NameResolutionError", "Name or service not known", "nodename nor servname"))
 
 
 @dataclass
-class RequestManager:
+class HttpSettings:
+    # Retry, cache and rate-limit policy shared by RequestManager and AsyncRequestManager;
+    # subclasses only supply the transport
     timeout_seconds: int = 10
     max_retries: int = 3
     backoff_seconds: tuple[int, int, int] = (2, 4, 8)
+    pool_connections: int = 10
+    pool_maxsize: int = 10
+    compress: bool = True
+    cache: ResponseCache | None = field(default=None, repr=False)
+    cache_ttl_seconds: int = 0
+    # Label for this manager's HTTP metrics: the source name, or "enrichment"
+    metrics_source: str = "default"
+    # Set by the owning Source: retries wait on it and every response feeds it
+    rate_limiter: RateLimiter | None = field(default=None, repr=False)
+
+    def _caching(self) -> bool:
+        return self.cache is not None and self.cache_ttl_seconds > 0
+
+    def _cache_lookup(
+        self,
+        url: str,
+        params: dict[str, Any] | None,
+        headers: dict[str, str] | None,
+        max_bytes: int | None = None,
+        content_types: tuple[str, ...] | None = None,
+    ) -> tuple[str, CacheEntry | None, dict[str, str]]:
+        # Returns (key, cached entry, request headers); a fresh entry needs no request at all.
+        # Capped reads store the capped body, so they get their own key and never answer a full GET
+        variant = f"max_bytes={max_bytes} types={','.join(content_types or ())}" if max_bytes is not None or content_types else ""
+        key = cache_key("GET", url, params, variant)
+        cached = self.cache.lookup(key)
+        if cached is not None and cached.is_fresh():
+            METRICS.inc("http_cache_total", source=self.metrics_source, result="hit")
+            return key, cached, {}
+        request_headers = dict(headers or {})
+        if cached is not None:
+            request_headers.update(cached.validators())
+        return key, cached, request_headers
+
+    def _cache_update(self, key: str, url: str, cached: CacheEntry | None, status_code: int, body: bytes, encoding: str, headers: Mapping[str, str]) -> CacheEntry:
+        expires_at = time.time() + self.cache_ttl_seconds
+        if status_code == 304 and cached is not None:
+            METRICS.inc("http_cache_total", source=self.metrics_source, result="revalidated")
+            self.cache.touch(key, expires_at)
+            return cached
+        METRICS.inc("http_cache_total", source=self.metrics_source, result="miss")
+
+        entry = CacheEntry(
+            body=body,
+            encoding=encoding,
+            etag=headers.get("ETag", ""),
+            last_modified=headers.get("Last-Modified", ""),
+            expires_at=expires_at,
+        )
+        self.cache.store(key, url, entry)
+        return entry
+
+    def _record_response(self, method: str, status_code: int, size: int | None, headers: Mapping[str, str]) -> None:
+        # size is None for streamed bodies; _record_body counts those once they are read
+        METRICS.inc("http_requests_total", source=self.metrics_source, method=method, status=str(status_code))
+        if size is not None:
+            METRICS.inc("http_response_bytes_total", size, source=self.metrics_source)
+        if self.rate_limiter is not None:
+            self.rate_limiter.on_response(status_code, headers)
+
+    def _check_content_type(self, url: str, headers: Mapping[str, str], content_types: tuple[str, ...] | None) -> None:
+        content_type = headers.get("Content-Type", "").split(";", 1)[0].strip().lower()
+        if content_types and content_type and not content_type.startswith(content_types):
+            METRICS.inc("http_skipped_total", source=self.metrics_source, reason="content_type")
+            raise RuntimeError(f"Skipped {url}: content type {content_type}")
+
+    def _record_body(self, read: int, truncated: bool, headers: Mapping[str, str]) -> None:
+        METRICS.inc("http_response_bytes_total", read, source=self.metrics_source)
+        if not truncated:
+            return
+        METRICS.inc("http_responses_truncated_total", source=self.metrics_source)
+        length = headers.get("Content-Length", "")
+        if length.isdigit() and int(length) > read:
+            # Only known when the server sent a length (not for chunked or compressed bodies)
+            METRICS.inc("http_truncated_bytes_total", int(length) - read, source=self.metrics_source)
+
+    def _retry_delay(
+        self, method: str, attempt: int, exc: Exception, response_headers: Mapping[str, str] | None, status_code: int | None = None
+    ) -> float | None:
+        # Seconds to sleep before the next attempt, or None to give up
+        if response_headers is None:
+            METRICS.inc("http_requests_total", source=self.metrics_source, method=method, status="error")
+        if is_dns_failure(exc) or attempt >= self.max_retries - 1:
+            return None
+        if status_code is not None and status_code < 500 and status_code not in RETRYABLE_STATUSES:
+            # A 404 (say, a docs probe) answers the same way every time
+            return None
+        retry_after = retry_after_seconds(response_headers) if response_headers is not None else None
+        if retry_after is not None and retry_after > MAX_BLOCK_SECONDS:
+            # Not worth holding the run for; the limiter carries the block into the next run
+            return None
+        METRICS.inc("http_retries_total", source=self.metrics_source, method=method)
+        if retry_after is not None and self.rate_limiter is not None:
+            return 0.0  # the limiter is already blocked until Retry-After; acquire() waits it out
+        if retry_after is not None:
+            return retry_after
+        return jittered(self.backoff_seconds[min(attempt, len(self.backoff_seconds) - 1)])
+
+
+@dataclass
+class RequestManager(HttpSettings):
+    session: requests.Session | None = field(default=None, repr=False)
+
+    def __post_init__(self) -> None:
+        if self.session is None:
+            self.session = build_session(self.pool_connections, self.pool_maxsize, self.compress)
+
+    def close(self) -> None:
+        if self.session is not None:
+            self.session.close()
 
     def get_json(self, url: str, params: dict[str, Any] | None = None, headers: dict[str, str] | None = None) -> dict:
+        if self._caching():
+            return json.loads(self._cached_get(url, params, headers, text=False).body)
         response = self._request("GET", url, params=params, headers=headers)
         return response.json()
 
-    def get_text(self, url: str, headers: dict[str, str] | None = None) -> str:
+    def get_text(
+        self,
+        url: str,
+        headers: dict[str, str] | None = None,
+        max_bytes: int | None = None,
+        content_types: tuple[str, ...] | None = None,
+    ) -> str:
+        if max_bytes is not None or content_types:
+            return "".join(self.stream_text(url, headers, max_bytes, content_types))
+        if self._caching():
+            entry = self._cached_get(url, None, headers, text=True)
+            return entry.body.decode(entry.encoding or "utf-8", errors="replace")
         response = self._request("GET", url, headers=headers)
         return response.text
 
+    def stream_text(
+        self,
+        url: str,
+        headers: dict[str, str] | None = None,
+        max_bytes: int | None = None,
+        content_types: tuple[str, ...] | None = None,
+    ) -> Iterator[str]:
+        # Decoded chunks of at most max_bytes of body; a response whose Content-Type is not one
+        # of content_types raises RuntimeError before any of it is read. Closing the iterator
+        # early closes the connection, so nothing past what the caller consumed is downloaded.
+        if self._caching():
+            entry = self._cached_get(url, None, headers, text=True, max_bytes=max_bytes, content_types=content_types)
+            yield from decode_chunks([entry.body], entry.encoding or "utf-8")
+            return
+        response = self._request("GET", url, headers=headers, stream=True)
+        try:
+            self._check_content_type(url, response.headers, content_types)
+            yield from decode_chunks(self._iter_body(response, max_bytes), response.encoding or "utf-8")
+        finally:
+            response.close()
+
     def head_status(self, url: str, headers: dict[str, str] | None = None) -> int:
-        response = self._request("HEAD", url, headers=headers)
+        response = self._request("HEAD", url, headers=headers, allow_redirects=False)
         return response.status_code
 
+    def _cached_get(
+        self,
+        url: str,
+        params: dict[str, Any] | None,
+        headers: dict[str, str] | None,
+        text: bool,
+        max_bytes: int | None = None,
+        content_types: tuple[str, ...] | None = None,
+    ) -> CacheEntry:
+        key, cached, request_headers = self._cache_lookup(url, params, headers, max_bytes, content_types)
+        if cached is not None and cached.is_fresh():
+            return cached
+        if max_bytes is None and not content_types:
+            response = self._request("GET", url, params=params, headers=request_headers or None)
+            # JSON is decoded from bytes directly, so only text bodies pay for charset detection
+            encoding = (response.encoding or response.apparent_encoding or "utf-8") if text else ""
+            return self._cache_update(key, url, cached, response.status_code, response.content, encoding, response.headers)
+        # Capped reads cache the capped body (under the capped key), which is all a capped caller looks at
+        response = self._request("GET", url, params=params, headers=request_headers or None, stream=True)
+        try:
+            if response.status_code != 304:
+                self._check_content_type(url, response.headers, content_types)
+            body = b"".join(self._iter_body(response, max_bytes))
+        finally:
+            response.close()
+        encoding = (response.encoding or "utf-8") if text else ""
+        return self._cache_update(key, url, cached, response.status_code, body, encoding, response.headers)
+
+    def _iter_body(self, response: requests.Response, max_bytes: int | None) -> Iterator[bytes]:
+        read = 0
+        complete = False
+        try:
+            for chunk in response.iter_content(chunk_size=BODY_CHUNK_SIZE):
+                if max_bytes is not None and read + len(chunk) > max_bytes:
+                    chunk = chunk[: max_bytes - read]
+                    read += len(chunk)
+                    if chunk:
+                        yield chunk
+                    return
+                read += len(chunk)
+                yield chunk
+            complete = True
+        except requests.RequestException as exc:
+            raise RuntimeError(f"Reading {response.url} failed: {exc}") from exc
+        finally:
+            self._record_body(read, not complete, response.headers)
+
     def _request(self, method: str, url: str, **kwargs: Any) -> requests.Response:
         last_error: Exception | None = None
         for attempt in range(self.max_retries):
+            if attempt and self.rate_limiter is not None:
+                self.rate_limiter.acquire()
             try:
-                if method == "GET":
-                    resp = requests.get(url, timeout=self.timeout_seconds, **kwargs)
-                elif method == "HEAD":
-                    resp = requests.head(url, timeout=self.timeout_seconds, **kwargs)
-                else:
-                    resp = requests.request(method, url, timeout=self.timeout_seconds, **kwargs)
-                if resp.status_code in {429, 500, 502, 503, 504}:
+                with METRICS.timer("http_request_seconds", source=self.metrics_source, method=method):
+                    resp = self.session.request(method, url, timeout=self.timeout_seconds, **kwargs)
+                self._record_response(method, resp.status_code, None if kwargs.get("stream") else len(resp.content), resp.headers)
+                if resp.status_code in RETRYABLE_STATUSES:
                     raise requests.HTTPError(f"retryable status {resp.status_code}", response=resp)
                 resp.raise_for_status()
                 return resp
             except (requests.RequestException, ValueError) as exc:
                 last_error = exc
-                if isinstance(exc, requests.ConnectionError) and "NameResolutionError" in str(exc):
-                    break
-                if attempt >= self.max_retries - 1:
+                response = getattr(exc, "response", None)
+                if response is not None and kwargs.get("stream"):
+                    response.close()  # hands the connection back without reading the error body
+                delay = self._retry_delay(
+                    method,
+                    attempt,
+                    exc,
+                    response.headers if response is not None else None,
+                    response.status_code if response is not None else None,
+                )
+                if delay is None:
                     break
-                delay = self.backoff_seconds[min(attempt, len(self.backoff_seconds) - 1)]
                 time.sleep(delay)
         raise RuntimeError(f"Request failed after retries: {url} ({last_error})")
@@ -0,0 +1,37 @@
+from __future__ import annotations
+
+from collections.abc import Iterable
+
+
+class TermMatcher:
+    def __init__(self, terms: Iterable[str]) -> None:
+        # Lowered and de-duplicated up front so callers never re-lower terms per text
+        self.terms: tuple[str, ...] = tuple(dict.fromkeys(term.lower() for term in terms if term.strip()))
+        # Shortest first, so a term is only searched for once every shorter term it contains
+        # has been found ("small team of" is skipped outright when "team" is absent)
+        self._scan_order = sorted(self.terms, key=len)
+        self._contains = {
+            term: tuple(other for other in self.terms if other != term and other in term) for term in self.terms
+        }
+
+    def find(self, text: str) -> set[str]:
+        # Returns every term occurring in text, same as {t for t in terms if t in text.lower()}.
+        # Still one C-level substring scan per (unpruned) term, not a single pass: on a 200 KB page
+        # with the enrichment terms this takes ~1.8 ms, against ~8.5 ms for one consuming re
+        # alternation, ~10-14 ms for the lookahead alternation that also reports overlapping terms
+        # and ~22 ms for a pure-Python Aho-Corasick (benchmarks/bench_matcher.py), so both
+        # single-pass designs were rejected.
+        lowered = text.lower()
+        hits: set[str] = set()
+        for term in self._scan_order:
+            if all(part in hits for part in self._contains[term]) and term in lowered:
+                hits.add(term)
+        return hits
+
+    def search(self, text: str) -> bool:
+        lowered = text.lower()
+        return any(term in lowered for term in self._scan_order)
+
+
+def count_hits(hits: set[str], terms: frozenset[str]) -> int:
+    return len(hits & terms)
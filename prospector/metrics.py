@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+import json
+import threading
+import time
+from bisect import bisect_left
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+
+LabelSet = tuple[tuple[str, str], ...]
+
+# Histogram upper bounds in seconds, from a cached lookup up to a slow source walk
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 300.0)
+
+
+@dataclass
+class Timing:
+    count: int = 0
+    total_seconds: float = 0.0
+    max_seconds: float = 0.0
+    # Non-cumulative count per BUCKETS slot; the last slot is +Inf
+    buckets: list[int] = field(default_factory=lambda: [0] * (len(BUCKETS) + 1))
+
+    def add(self, seconds: float) -> None:
+        self.count += 1
+        self.total_seconds += seconds
+        self.max_seconds = max(self.max_seconds, seconds)
+        self.buckets[bisect_left(BUCKETS, seconds)] += 1
+
+    def merge(self, other: Timing) -> None:
+        self.count += other.count
+        self.total_seconds += other.total_seconds
+        self.max_seconds = max(self.max_seconds, other.max_seconds)
+        self.buckets = [mine + theirs for mine, theirs in zip(self.buckets, other.buckets)]
+
+
+class Metrics:
+    # Process-wide counters and timers keyed by name plus labels; every method is thread-safe
+    # because sources, enrichment workers and the main loop all record into the same registry
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._counters: dict[tuple[str, LabelSet], float] = {}
+        self._gauges: dict[tuple[str, LabelSet], float] = {}
+        self._timings: dict[tuple[str, LabelSet], Timing] = {}
+
+    def reset(self) -> None:
+        with self._lock:
+            self._counters.clear()
+            self._gauges.clear()
+            self._timings.clear()
+
+    def merge(self, other: Metrics) -> None:
+        # Folds one run's registry into a longer-lived one (serve mode keeps totals across runs)
+        with other._lock:
+            counters = dict(other._counters)
+            gauges = dict(other._gauges)
+            timings = {key: Timing(t.count, t.total_seconds, t.max_seconds, list(t.buckets)) for key, t in other._timings.items()}
+        with self._lock:
+            for key, value in counters.items():
+                self._counters[key] = self._counters.get(key, 0) + value
+            self._gauges.update(gauges)
+            for key, timing in timings.items():
+                if key in self._timings:
+                    self._timings[key].merge(timing)
+                else:
+                    self._timings[key] = timing
+
+    def inc(self, name: str, value: float = 1, **labels: str) -> None:
+        key = (name, _labels(labels))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def set(self, name: str, value: float, **labels: str) -> None:
+        with self._lock:
+            self._gauges[(name, _labels(labels))] = value
+
+    def observe(self, name: str, seconds: float, **labels: str) -> None:
+        key = (name, _labels(labels))
+        with self._lock:
+            timing = self._timings.get(key)
+            if timing is None:
+                timing = self._timings[key] = Timing()
+            timing.add(seconds)
+
+    @contextmanager
+    def timer(self, name: str, **labels: str) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - started, **labels)
+
+    def counter(self, name: str, **labels: str) -> float:
+        with self._lock:
+            return self._counters.get((name, _labels(labels)), 0)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            counters = [
+                {"name": name, "labels": dict(labels), "value": value} for (name, labels), value in sorted(self._counters.items())
+            ]
+            gauges = [
+                {"name": name, "labels": dict(labels), "value": value} for (name, labels), value in sorted(self._gauges.items())
+            ]
+            timings = [
+                {
+                    "name": name,
+                    "labels": dict(labels),
+                    "count": timing.count,
+                    "total_seconds": round(timing.total_seconds, 6),
+                    "max_seconds": round(timing.max_seconds, 6),
+                    "buckets": list(timing.buckets),
+                }
+                for (name, labels), timing in sorted(self._timings.items())
+            ]
+        return {"counters": counters, "gauges": gauges, "timings": timings}
+
+    def write_json(self, path: str, **extra: object) -> None:
+        metrics_path = Path(path)
+        metrics_path.parent.mkdir(parents=True, exist_ok=True)
+        metrics_path.write_text(json.dumps({**extra, **self.snapshot()}, indent=2), encoding="utf-8")
+
+
+def _labels(labels: dict[str, str]) -> LabelSet:
+    return tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+
+METRICS = Metrics()
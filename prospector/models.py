@@ -1,10 +1,14 @@
 from __future__ import annotations
 
-from dataclasses import dataclass, field
-from datetime import datetime, timezone
+import sys
+from collections.abc import Set
+from dataclasses import dataclass
 
+# Read-side stand-in for a hit set that was never created
+NO_HITS: frozenset[str] = frozenset()
 
-@dataclass
+
+@dataclass(slots=True)
 class Lead:
     domain: str
     company: str
@@ -14,19 +18,44 @@ class Lead:
     support_stack: str = "unknown"
     docs_url: str = ""
     fit_score: int = 0
-    date_found: str = field(default_factory=lambda: datetime.now(timezone.utc).date().isoformat())
+    # run_pipeline/backfill stamp every fetched lead with the same run date string
+    date_found: str = ""
     status: str = "New"
     notes: str = ""
     b2b_signal_count: int = 0
     small_team_signal_count: int = 0
-    keyword_hits: set[str] = field(default_factory=set)
-    keyword_variant_hits: set[str] = field(default_factory=set)
+    # Created on the first hit: most leads carry one keyword and no variants. Read them through
+    # hits()/variant_hits(), write them through add_keyword_hit()/add_variant_hit().
+    keyword_hits: set[str] | None = None
+    keyword_variant_hits: set[str] | None = None
     discard_reason: str = ""
     source_item_id: str = ""
     team_size_signal: str = ""
     founder_name: str = ""
     location: str = ""
 
+    def __post_init__(self) -> None:
+        # A handful of distinct values repeated across every lead
+        self.source = sys.intern(self.source)
+        self.status = sys.intern(self.status)
+        self.support_stack = sys.intern(self.support_stack)
+
+    def hits(self) -> Set[str]:
+        return self.keyword_hits or NO_HITS
+
+    def variant_hits(self) -> Set[str]:
+        return self.keyword_variant_hits or NO_HITS
+
+    def add_keyword_hit(self, keyword: str) -> None:
+        if self.keyword_hits is None:
+            self.keyword_hits = set()
+        self.keyword_hits.add(keyword)
+
+    def add_variant_hit(self, variant: str) -> None:
+        if self.keyword_variant_hits is None:
+            self.keyword_variant_hits = set()
+        self.keyword_variant_hits.add(variant)
+
     def to_row(self) -> list[str | int]:
         return [
             self.date_found,
@@ -41,3 +70,24 @@ class Lead:
             self.status,
             self.notes,
         ]
+
+
+@dataclass
+class EnrichmentResult:
+    support_stack: str = "unknown"
+    b2b_signal_count: int = 0
+    small_team_signal_count: int = 0
+    team_size_signal: str = ""
+    founder_name: str = ""
+    location: str = ""
+    docs_url: str = ""
+
+    def apply_to(self, lead: Lead) -> Lead:
+        lead.support_stack = sys.intern(self.support_stack)
+        lead.b2b_signal_count = self.b2b_signal_count
+        lead.small_team_signal_count = self.small_team_signal_count
+        lead.team_size_signal = self.team_size_signal
+        lead.founder_name = self.founder_name
+        lead.location = self.location
+        lead.docs_url = self.docs_url
+        return lead
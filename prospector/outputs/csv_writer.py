@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import csv
+import os
 from pathlib import Path
 
 from prospector.models import Lead
@@ -33,6 +34,35 @@ def write_leads_csv(path: str, leads: list[Lead]) -> None:
             writer.writerow(lead.to_row())
 
 
+class CsvSink:
+    # Appends leads as they arrive and flushes after every batch, so an interrupted run
+    # keeps everything written so far
+    def __init__(self, path: str) -> None:
+        self.path = Path(path)
+        self._handle = None
+        self._writer = None
+
+    def write(self, leads: list[Lead]) -> None:
+        if not leads:
+            return
+        if self._writer is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            write_header = not self.path.exists()
+            self._handle = self.path.open("a", encoding="utf-8", newline="")
+            self._writer = csv.writer(self._handle)
+            if write_header:
+                self._writer.writerow(HEADERS)
+        for lead in leads:
+            self._writer.writerow(lead.to_row())
+        self._handle.flush()
+
+    def close(self) -> None:
+        if self._handle is not None:
+            self._handle.close()
+            self._handle = None
+            self._writer = None
+
+
 def read_leads_csv(path: str) -> list[dict[str, str]]:
     csv_path = Path(path)
     if not csv_path.exists():
@@ -40,3 +70,46 @@ def read_leads_csv(path: str) -> list[dict[str, str]]:
     with csv_path.open("r", encoding="utf-8", newline="") as handle:
         reader = csv.DictReader(handle)
         return list(reader)
+
+
+def lead_from_row(row: dict[str, str]) -> Lead:
+    return Lead(
+        domain=row.get("Website", ""),
+        company=row.get("Company/Product", ""),
+        source=row.get("Source", ""),
+        evidence_url=row.get("Evidence URL", ""),
+        pain_quote=row.get("Pain Quote", ""),
+        support_stack=row.get("Support Stack", "") or "unknown",
+        docs_url=row.get("Docs URL", ""),
+        fit_score=int(row.get("Fit Score") or 0),
+        date_found=row.get("Date Found", ""),
+        status=row.get("Status", "") or "New",
+        notes=row.get("Notes", ""),
+    )
+
+
+def score_key(date_found: str, domain: str, evidence_url: str) -> tuple[str, str, str]:
+    return date_found, domain, evidence_url
+
+
+def write_rescored_csv(source_path: str, dest_path: str, scores: dict[tuple[str, str, str], int]) -> int:
+    # Copy of source_path with Fit Score replaced for rows found in scores; every other column,
+    # including hand-edited Status and Notes, is kept as is. Returns the number of rows changed.
+    source, dest = Path(source_path), Path(dest_path)
+    if dest.resolve() == source.resolve():
+        raise ValueError(f"Refusing to overwrite the input CSV {source_path}")
+    changed = 0
+    dest.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = dest.with_name(f"{dest.name}.tmp")
+    with source.open("r", encoding="utf-8", newline="") as src, tmp_path.open("w", encoding="utf-8", newline="") as handle:
+        reader = csv.DictReader(src)
+        writer = csv.DictWriter(handle, fieldnames=reader.fieldnames or HEADERS)
+        writer.writeheader()
+        for row in reader:
+            score = scores.get(score_key(row.get("Date Found", ""), row.get("Website", ""), row.get("Evidence URL", "")))
+            if score is not None and str(score) != row.get("Fit Score"):
+                row["Fit Score"] = str(score)
+                changed += 1
+            writer.writerow(row)
+    os.replace(tmp_path, dest)
+    return changed
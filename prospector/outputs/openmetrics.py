@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+import logging
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+from prospector.metrics import BUCKETS, Metrics
+
+CONTENT_TYPE = "application/openmetrics-text; version=1.0.0; charset=utf-8"
+PREFIX = "prospector_"
+
+logger = logging.getLogger("prospector.outputs.openmetrics")
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _sample(name: str, labels: dict[str, str], value: float) -> str:
+    rendered = ",".join(f'{key}="{_escape(str(val))}"' for key, val in labels.items())
+    number = str(int(value)) if float(value).is_integer() else repr(float(value))
+    return f"{name}{{{rendered}}} {number}" if rendered else f"{name} {number}"
+
+
+def render_openmetrics(metrics: Metrics) -> str:
+    snapshot = metrics.snapshot()
+    lines: list[str] = []
+    families: dict[tuple[str, str], list[str]] = {}
+
+    for counter in snapshot["counters"]:
+        # OpenMetrics names the family without _total and requires it on the sample
+        family = PREFIX + counter["name"].removesuffix("_total")
+        families.setdefault((family, "counter"), []).append(_sample(f"{family}_total", counter["labels"], counter["value"]))
+
+    for gauge in snapshot["gauges"]:
+        family = PREFIX + gauge["name"]
+        families.setdefault((family, "gauge"), []).append(_sample(family, gauge["labels"], gauge["value"]))
+
+    for timing in snapshot["timings"]:
+        family = PREFIX + timing["name"]
+        samples = families.setdefault((family, "histogram"), [])
+        cumulative = 0
+        for bound, count in zip([*(f"{b:g}" for b in BUCKETS), "+Inf"], timing["buckets"]):
+            cumulative += count
+            samples.append(_sample(f"{family}_bucket", {**timing["labels"], "le": bound}, cumulative))
+        samples.append(_sample(f"{family}_count", timing["labels"], timing["count"]))
+        samples.append(_sample(f"{family}_sum", timing["labels"], timing["total_seconds"]))
+
+    for (family, kind), samples in sorted(families.items()):
+        lines.append(f"# TYPE {family} {kind}")
+        lines.extend(samples)
+    lines.append("# EOF")
+    return "\n".join(lines) + "\n"
+
+
+def write_textfile(path: str, metrics: Metrics) -> None:
+    # Written aside and renamed so a node_exporter textfile collector never reads a partial file
+    textfile = Path(path)
+    textfile.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = textfile.with_name(f".{textfile.name}.tmp")
+    tmp_path.write_text(render_openmetrics(metrics), encoding="utf-8")
+    os.replace(tmp_path, textfile)
+
+
+def start_metrics_server(host: str, port: int, metrics: Metrics) -> ThreadingHTTPServer:
+    class _Handler(BaseHTTPRequestHandler):
+        def do_GET(self) -> None:  # noqa: N802
+            if self.path.split("?")[0] != "/metrics":
+                self.send_error(404)
+                return
+            body = render_openmetrics(metrics).encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", CONTENT_TYPE)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format: str, *args) -> None:  # noqa: A002
+            return
+
+    server = ThreadingHTTPServer((host, port), _Handler)
+    threading.Thread(target=server.serve_forever, name="metrics-server", daemon=True).start()
+    logger.info("serving metrics on http://%s:%d/metrics", host, server.server_address[1])
+    return server
@@ -14,6 +14,8 @@ def generate_markdown_report(
     source_counts: dict[str, int],
     kept_leads: list[Lead],
     discarded_reasons: dict[str, int],
+    enrichment_stats: dict[str, int] | None = None,
+    metrics: dict | None = None,
 ) -> None:
     path = Path(output_path)
     path.parent.mkdir(parents=True, exist_ok=True)
@@ -68,4 +70,45 @@ def generate_markdown_report(
     for reason, count in sorted(discarded_reasons.items()):
         lines.append(f"- {reason}: {count}")
 
+    if enrichment_stats is not None:
+        lines.extend(
+            [
+                "",
+                "## Enrichment Cache",
+                "",
+                f"- Hits (same run): {enrichment_stats.get('run_hits', 0)}",
+                f"- Hits (stored): {enrichment_stats.get('store_hits', 0)}",
+                f"- Misses (scraped): {enrichment_stats.get('misses', 0)}",
+            ]
+        )
+
+    if metrics is not None:
+        lines.extend(_metrics_lines(metrics))
+
     path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+
+def _format_labels(labels: dict[str, str]) -> str:
+    return ", ".join(f"{key}={value}" for key, value in labels.items()) or "-"
+
+
+def _metrics_lines(metrics: dict) -> list[str]:
+    lines = [
+        "",
+        "## Stage Timings",
+        "",
+        "| Timer | Labels | Count | Total s | Max s |",
+        "|---|---|---:|---:|---:|",
+    ]
+    for timing in sorted(metrics.get("timings", []), key=lambda t: t["total_seconds"], reverse=True):
+        lines.append(
+            f"| {timing['name']} | {_format_labels(timing['labels'])} | {timing['count']} "
+            f"| {timing['total_seconds']:.3f} | {timing['max_seconds']:.3f} |"
+        )
+
+    lines.extend(["", "## Counters", "", "| Counter | Labels | Value |", "|---|---|---:|"])
+    for counter in metrics.get("counters", []):
+        value = counter["value"]
+        shown = f"{value:.3f}" if isinstance(value, float) and not value.is_integer() else f"{int(value)}"
+        lines.append(f"| {counter['name']} | {_format_labels(counter['labels'])} | {shown} |")
+    return lines
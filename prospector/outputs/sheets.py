@@ -1,22 +1,28 @@
 from __future__ import annotations
 
 import json
+import logging
 import subprocess
+import time
+from pathlib import Path
 
 from prospector.models import Lead
 
+logger = logging.getLogger("prospector.outputs.sheets")
 
-def append_to_sheets(
+
+GOG_BIN = "/usr/local/bin/gog"
+
+
+def append_rows(
     sheet_id: str,
     tab_name: str,
-    leads: list[Lead],
+    rows: list[list],
     account: str | None = None,
-    gog_bin: str = "/usr/local/bin/gog",
+    gog_bin: str = GOG_BIN,
+    timeout_seconds: int = 120,
 ) -> None:
-    if not sheet_id or not leads:
-        return
-
-    values = [lead.to_row() for lead in leads]
+    # Values go through stdin, so payload size is not bounded by the argv limit
     cmd = [
         gog_bin,
         "sheets",
@@ -24,7 +30,7 @@ def append_to_sheets(
         sheet_id,
         f"{tab_name}!A:K",
         "--values-json",
-        json.dumps(values),
+        "-",
         "--insert",
         "INSERT_ROWS",
     ]
@@ -32,4 +38,113 @@ def append_to_sheets(
     if account:
         cmd.extend(["--account", account])
 
-    subprocess.run(cmd, check=True, capture_output=True, text=True)
+    subprocess.run(cmd, input=json.dumps(rows), check=True, capture_output=True, text=True, timeout=timeout_seconds)
+
+
+def append_to_sheets(
+    sheet_id: str,
+    tab_name: str,
+    leads: list[Lead],
+    account: str | None = None,
+    gog_bin: str = GOG_BIN,
+) -> None:
+    if not sheet_id or not leads:
+        return
+    append_rows(sheet_id, tab_name, [lead.to_row() for lead in leads], account=account, gog_bin=gog_bin)
+
+
+class SheetsSink:
+    # Buffers streamed leads and appends them in chunks of batch_size. A chunk that still fails
+    # after retries goes to a JSONL outbox, which the next run's sink replays before new rows.
+    def __init__(
+        self,
+        sheet_id: str,
+        tab_name: str,
+        account: str | None = None,
+        batch_size: int = 50,
+        max_retries: int = 3,
+        backoff_seconds: tuple[int, ...] = (2, 4, 8),
+        outbox_path: str | None = None,
+        gog_bin: str = GOG_BIN,
+    ) -> None:
+        self.sheet_id = sheet_id
+        self.tab_name = tab_name
+        self.account = account
+        self.batch_size = max(1, int(batch_size))
+        self.max_retries = max(1, int(max_retries))
+        self.backoff_seconds = backoff_seconds
+        self.outbox_path = Path(outbox_path) if outbox_path else None
+        self.gog_bin = gog_bin
+        self._buffer: list[list] = []
+        self._replayed = False
+
+    def write(self, leads: list[Lead]) -> None:
+        self._buffer.extend(lead.to_row() for lead in leads)
+        if len(self._buffer) >= self.batch_size:
+            self.flush()
+
+    @property
+    def buffered(self) -> int:
+        # Rows accepted by write() that are neither appended nor in the outbox yet
+        return len(self._buffer)
+
+    def flush(self) -> None:
+        if not self._replayed:
+            self._replayed = True
+            self._replay_outbox()
+        rows, self._buffer = self._buffer, []
+        for start in range(0, len(rows), self.batch_size):
+            chunk = rows[start : start + self.batch_size]
+            if not self._send(self.sheet_id, self.tab_name, chunk):
+                self._to_outbox(self.sheet_id, self.tab_name, chunk)
+
+    def close(self) -> None:
+        self.flush()
+
+    def _send(self, sheet_id: str, tab_name: str, rows: list[list]) -> bool:
+        for attempt in range(self.max_retries):
+            try:
+                append_rows(sheet_id, tab_name, rows, account=self.account, gog_bin=self.gog_bin)
+                return True
+            except (subprocess.SubprocessError, OSError) as exc:
+                stderr = getattr(exc, "stderr", None) or exc
+                logger.warning("Google Sheets append of %d rows failed (attempt %d/%d): %s", len(rows), attempt + 1, self.max_retries, stderr)
+                if attempt < self.max_retries - 1:
+                    time.sleep(self.backoff_seconds[min(attempt, len(self.backoff_seconds) - 1)])
+        return False
+
+    def _to_outbox(self, sheet_id: str, tab_name: str, rows: list[list]) -> None:
+        if self.outbox_path is None:
+            logger.warning("Dropping %d rows for Google Sheets (no outbox configured)", len(rows))
+            return
+        self.outbox_path.parent.mkdir(parents=True, exist_ok=True)
+        with self.outbox_path.open("a", encoding="utf-8") as handle:
+            handle.write(json.dumps({"sheet_id": sheet_id, "tab_name": tab_name, "rows": rows}) + "\n")
+        logger.warning("Queued %d rows in %s for the next run", len(rows), self.outbox_path)
+
+    def _replay_outbox(self) -> None:
+        if self.outbox_path is None:
+            return
+        # Taken over before replaying, so chunks that fail again are re-queued rather than duplicated.
+        # A replay that crashed leaves its file behind: the outbox is appended to it and the whole
+        # file is replayed (entries sent before the crash go out again; rows are never lost).
+        pending = self.outbox_path.with_name(f"{self.outbox_path.name}.replaying")
+        if self.outbox_path.exists():
+            if pending.exists():
+                with pending.open("a", encoding="utf-8") as handle:
+                    handle.write(self.outbox_path.read_text(encoding="utf-8"))
+                self.outbox_path.unlink()
+            else:
+                self.outbox_path.replace(pending)
+        if not pending.exists():
+            return
+        logger.info("Replaying Google Sheets outbox %s", pending)
+        for line in pending.read_text(encoding="utf-8").splitlines():
+            try:
+                entry = json.loads(line)
+            except json.JSONDecodeError:
+                logger.warning("Skipping unreadable Google Sheets outbox entry")
+                continue
+            if not self._send(entry["sheet_id"], entry["tab_name"], entry["rows"]):
+                self._to_outbox(entry["sheet_id"], entry["tab_name"], entry["rows"])
+        pending.unlink()
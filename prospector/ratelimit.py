@@ -0,0 +1,139 @@
+from __future__ import annotations
+
+import asyncio
+import random
+import threading
+import time
+from collections.abc import Mapping
+from email.utils import parsedate_to_datetime
+
+from prospector.metrics import METRICS
+
+# A Retry-After longer than this is not slept through in-run; the block still persists to the next run
+MAX_BLOCK_SECONDS = 120.0
+
+
+def jittered(delay: float) -> float:
+    # "Equal jitter": keeps at least half the delay, spreads the rest so retries don't align
+    return delay / 2 + random.uniform(0, delay / 2)
+
+
+def retry_after_seconds(headers: Mapping[str, str]) -> float | None:
+    value = headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def _rate_limit_window(headers: Mapping[str, str]) -> tuple[float, float] | None:
+    # (remaining requests, seconds until the window resets) from X-RateLimit-* headers
+    remaining = headers.get("X-RateLimit-Remaining")
+    reset = headers.get("X-RateLimit-Reset")
+    if remaining is None or reset is None:
+        return None
+    try:
+        remaining_value, reset_value = float(remaining), float(reset)
+    except ValueError:
+        return None
+    # Some APIs send an epoch timestamp, others seconds from now
+    if reset_value > 1_000_000_000:
+        reset_value -= time.time()
+    return remaining_value, max(0.0, reset_value)
+
+
+class RateLimiter:
+    # Token bucket per source. The configured requests_per_minute is the baseline rate: 429s halve
+    # the rate, successes recover it towards baseline, and X-RateLimit-* headers can raise it up
+    # to max_factor x baseline when the API reports headroom. Up to `burst` tokens accumulate
+    # while the source is idle.
+    def __init__(self, name: str, requests_per_minute: float, burst: int = 3, min_factor: float = 0.125, max_factor: float = 2.0) -> None:
+        self.name = name
+        self.baseline = max(0.01, float(requests_per_minute))
+        self.min_rate = self.baseline * min_factor
+        self.max_rate = self.baseline * max_factor
+        self.burst = max(1, int(burst))
+        self.rate = self.baseline
+        # Starts with a single token so a fresh run paces from its first request
+        self.tokens = 1.0
+        self.blocked_until = 0.0
+        self._refilled_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> float:
+        slept = 0.0
+        while (wait := self._reserve()) > 0:
+            time.sleep(wait)
+            slept += wait
+        self._record_sleep(slept)
+        return slept
+
+    async def aacquire(self) -> float:
+        slept = 0.0
+        while (wait := self._reserve()) > 0:
+            await asyncio.sleep(wait)
+            slept += wait
+        self._record_sleep(slept)
+        return slept
+
+    def on_response(self, status_code: int, headers: Mapping[str, str]) -> None:
+        retry_after = retry_after_seconds(headers)
+        window = _rate_limit_window(headers)
+        with self._lock:
+            if status_code == 429 or (status_code == 503 and retry_after is not None):
+                self.rate = max(self.min_rate, self.rate / 2)
+                self.tokens = 0.0
+                self._block(retry_after or 0.0)
+                METRICS.inc("rate_limited_total", source=self.name)
+            elif window is not None:
+                remaining, reset_in = window
+                if remaining < 1:
+                    self._block(reset_in)
+                elif reset_in > 0:
+                    # Spread what is left of the window evenly over the time until it resets
+                    self.rate = min(self.max_rate, max(self.min_rate, remaining / reset_in * 60.0))
+            elif status_code < 400 and self.rate < self.baseline:
+                self.rate = min(self.baseline, self.rate + self.baseline * 0.1)
+
+    def state(self) -> dict[str, float]:
+        with self._lock:
+            self._refill()
+            return {"rate": self.rate, "tokens": self.tokens, "blocked_until": self.blocked_until, "saved_at": time.time()}
+
+    def restore(self, state: Mapping[str, float] | None) -> None:
+        if not state:
+            return
+        with self._lock:
+            self.rate = min(self.max_rate, max(self.min_rate, float(state.get("rate", self.baseline))))
+            idle = max(0.0, time.time() - float(state.get("saved_at", 0.0)))
+            self.tokens = min(self.burst, float(state.get("tokens", 1.0)) + idle * self.rate / 60.0)
+            self.blocked_until = float(state.get("blocked_until", 0.0))
+            self._refilled_at = time.monotonic()
+
+    def _reserve(self) -> float:
+        # Takes a token and returns 0, or returns how long to wait before trying again
+        with self._lock:
+            self._refill()
+            wait = max(0.0, self.blocked_until - time.time())
+            if not wait and self.tokens >= 1:
+                self.tokens -= 1
+                return 0.0
+            return max(wait, (1 - self.tokens) * 60.0 / self.rate)
+
+    def _record_sleep(self, slept: float) -> None:
+        if slept:
+            METRICS.inc("rate_limit_sleep_seconds_total", slept, source=self.name)
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self._refilled_at) * self.rate / 60.0)
+        self._refilled_at = now
+
+    def _block(self, seconds: float) -> None:
+        self.blocked_until = max(self.blocked_until, time.time() + min(seconds, MAX_BLOCK_SECONDS))
@@ -1,29 +1,64 @@
 from __future__ import annotations
 
 import logging
+import queue
+import threading
+import time
+from collections.abc import Iterator
+from dataclasses import replace
 from datetime import datetime, timezone
 
 from rich.console import Console
-from rich.progress import Progress, SpinnerColumn, TextColumn
+from rich.progress import Progress, ProgressColumn, SpinnerColumn, Task, TextColumn
 from rich.table import Table
+from rich.text import Text
 
+from prospector.async_http import AsyncRequestManager, async_http_available
+from prospector.cache import ResponseCache
 from prospector.config import load_config
+from prospector.consolidation import LeadConsolidator
 from prospector.deduplicator import Deduplicator
-from prospector.enricher import Enricher
+from prospector.enricher import TEAM_PAGES, AsyncEnrichmentExecutor, BaseEnrichmentExecutor, EnrichmentExecutor, Enricher
+from prospector.enrichment_store import EnrichmentStore
+from prospector.history import open_lead_history
 from prospector.http import RequestManager
+from prospector.matcher import TermMatcher
+from prospector.metrics import METRICS
 from prospector.models import Lead
-from prospector.outputs.csv_writer import write_leads_csv
+from prospector.outputs.csv_writer import CsvSink
+from prospector.outputs.openmetrics import write_textfile
 from prospector.outputs.report import generate_markdown_report
-from prospector.outputs.sheets import append_to_sheets
-from prospector.outputs.summary import emit_summary, summarize_discard_reasons
+from prospector.outputs.sheets import SheetsSink
+from prospector.outputs.summary import emit_summary
 from prospector.scorer import Scorer
 from prospector.sources import HackerNewsSource, IndieHackersSource, ProductHuntSource, RedditSource, XSearchSource
-from prospector.state import load_seen_domains, save_seen_domains
+from prospector.sources.base import Source
+from prospector.state import (
+    load_rate_limits,
+    load_source_cursors,
+    open_seen_domain_store,
+    save_rate_limits,
+    save_source_cursors,
+)
 
 logger = logging.getLogger("prospector.run")
 
+MIN_FIT_SCORE = 25
+METRICS_PATH = "output/last-run-metrics.json"
 
-def _expand_keywords(config: dict) -> tuple[list[str], dict[str, set[str]]]:
+
+class _ThroughputColumn(ProgressColumn):
+    def render(self, task: Task) -> Text:
+        unit = task.fields.get("unit")
+        if not unit:
+            return Text("")
+        speed = task.finished_speed or task.speed
+        if speed is None:
+            return Text(f"-- {unit}/s", style="progress.data.speed")
+        return Text(f"{speed:.1f} {unit}/s", style="progress.data.speed")
+
+
+def expand_keywords(config: dict) -> tuple[list[str], dict[str, set[str]]]:
     seeds = [kw.strip() for kw in config["icp"]["pain_keywords"] if kw.strip()]
     expansions = config["icp"].get("keyword_expansions", {})
     all_keywords: list[str] = []
@@ -48,14 +83,22 @@ def _source_rpm(config: dict, source_name: str, default_value: int) -> int:
     return int(config["sources"].get(f"{source_name}_requests_per_minute", default_value))
 
 
+def _source_cache_ttl(config: dict, name: str) -> int:
+    return int(config["cache"]["ttl_seconds"].get(name, 0))
+
+
 def build_sources(config: dict, request_manager: RequestManager, throttle_multiplier: float) -> list:
     sources = []
     source_cfg = config["sources"]
 
+    def manager_for(name: str) -> RequestManager:
+        # Same session and cache, per-source TTL
+        return replace(request_manager, cache_ttl_seconds=_source_cache_ttl(config, name), metrics_source=name)
+
     if source_cfg.get("reddit"):
         sources.append(
             RedditSource(
-                request_manager,
+                manager_for("reddit"),
                 requests_per_minute=_source_rpm(config, "reddit", 30),
                 throttle_multiplier=throttle_multiplier,
             )
@@ -63,7 +106,7 @@ def build_sources(config: dict, request_manager: RequestManager, throttle_multip
     if source_cfg.get("hacker_news", False):
         sources.append(
             HackerNewsSource(
-                request_manager,
+                manager_for("hacker_news"),
                 requests_per_minute=_source_rpm(config, "hacker_news", 40),
                 throttle_multiplier=throttle_multiplier,
             )
@@ -71,7 +114,7 @@ def build_sources(config: dict, request_manager: RequestManager, throttle_multip
     if source_cfg.get("x", False):
         sources.append(
             XSearchSource(
-                request_manager,
+                manager_for("x"),
                 requests_per_minute=_source_rpm(config, "x", 20),
                 throttle_multiplier=throttle_multiplier,
             )
@@ -79,7 +122,7 @@ def build_sources(config: dict, request_manager: RequestManager, throttle_multip
     if source_cfg.get("indie_hackers", False):
         sources.append(
             IndieHackersSource(
-                request_manager,
+                manager_for("indie_hackers"),
                 requests_per_minute=_source_rpm(config, "indie_hackers", 20),
                 throttle_multiplier=throttle_multiplier,
             )
@@ -87,7 +130,7 @@ def build_sources(config: dict, request_manager: RequestManager, throttle_multip
     if source_cfg.get("product_hunt", False):
         sources.append(
             ProductHuntSource(
-                request_manager,
+                manager_for("product_hunt"),
                 requests_per_minute=_source_rpm(config, "product_hunt", 20),
                 throttle_multiplier=throttle_multiplier,
             )
@@ -96,16 +139,163 @@ def build_sources(config: dict, request_manager: RequestManager, throttle_multip
     return sources
 
 
+def open_response_cache(config: dict, cache_mode: str | None = None) -> ResponseCache | None:
+    cache_cfg = config["cache"]
+    cache_mode = cache_mode or cache_cfg["mode"]
+    if cache_mode == "off":
+        return None
+    return ResponseCache(cache_cfg["path"], max_size_mb=int(cache_cfg["max_size_mb"]), mode=cache_mode)
+
+
+def build_request_manager(config: dict, response_cache: ResponseCache | None) -> RequestManager:
+    http_cfg = config["http"]
+    return RequestManager(
+        timeout_seconds=int(http_cfg.get("timeout_seconds", 10)),
+        pool_maxsize=int(http_cfg["pool_maxsize"]),
+        compress=bool(http_cfg["compress"]),
+        cache=response_cache,
+    )
+
+
+def build_enricher(config: dict, response_cache: ResponseCache | None) -> Enricher:
+    enrichment_cfg = config["enrichment"]
+    enrich_workers = int(enrichment_cfg["workers"])
+    # Enrichment uses a fast, low-retry manager — enrichment is best-effort, not critical.
+    # It talks to many hosts a few times each, so keep more host pools but fewer sockets per host.
+    enrich_request_manager = RequestManager(
+        timeout_seconds=3,
+        max_retries=1,
+        backoff_seconds=(1, 2, 4),
+        pool_connections=enrich_workers * 2,
+        pool_maxsize=int(enrichment_cfg["max_per_host"]),
+        compress=bool(config["http"]["compress"]),
+        cache=response_cache,
+        cache_ttl_seconds=_source_cache_ttl(config, "enrichment"),
+        metrics_source="enrichment",
+    )
+    async_request_manager = None
+    if enrichment_cfg["async"]:
+        if async_http_available():
+            async_request_manager = AsyncRequestManager.from_sync(enrich_request_manager)
+        else:
+            logger.warning("enrichment.async needs httpx (pip install icp-prospector[async]); using threads")
+    return Enricher(
+        enrich_request_manager,
+        max_per_host=int(enrichment_cfg["max_per_host"]),
+        page_workers=enrich_workers * (len(TEAM_PAGES) + 1),
+        store=EnrichmentStore(enrichment_cfg["cache_file"], max_age_days=int(enrichment_cfg["max_age_days"])),
+        async_request_manager=async_request_manager,
+        max_page_bytes=int(enrichment_cfg["max_page_bytes"]),
+    )
+
+
+def build_enrichment_executor(config: dict, enricher: Enricher) -> BaseEnrichmentExecutor:
+    if enricher.async_request_manager is not None:
+        return AsyncEnrichmentExecutor(enricher, concurrency=int(config["enrichment"]["async_concurrency"]))
+    return EnrichmentExecutor(enricher, workers=int(config["enrichment"]["workers"]))
+
+
+def apply_keyword_variants(leads: list[Lead], reverse_keyword_map: dict[str, set[str]]) -> None:
+    for lead in leads:
+        for hit in list(lead.hits()):
+            for variant in reverse_keyword_map.get(hit.lower(), ()):
+                lead.add_variant_hit(variant)
+
+
+def is_excluded(lead: Lead, exclude_matcher: TermMatcher) -> bool:
+    return exclude_matcher.search(f"{lead.pain_quote} {lead.company}")
+
+
+def stream_sources(
+    sources: list[Source],
+    keywords: list[str],
+    config: dict,
+    max_buffered: int = 256,
+) -> Iterator[tuple[Source, Lead | None]]:
+    # Sources are independent and each paces itself via its own _wait_for_slot, so running
+    # them side by side keeps every RPM budget while the run only waits on the slowest one.
+    # Leads are yielded as they arrive through a bounded queue (back-pressure instead of
+    # buffering everything); (source, None) marks a source that has finished.
+    if not sources:
+        return
+    buffer: queue.Queue[tuple[Source, Lead | None]] = queue.Queue(maxsize=max_buffered)
+    stop = threading.Event()
+
+    def put(item: tuple[Source, Lead | None]) -> bool:
+        while not stop.is_set():
+            try:
+                buffer.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def produce(source: Source) -> None:
+        # Time blocked on a full queue is downstream back-pressure, not fetch time
+        started = time.perf_counter()
+        blocked = 0.0
+        try:
+            for lead in source.safe_iter_fetch(keywords, config):
+                put_started = time.perf_counter()
+                delivered = put((source, lead))
+                blocked += time.perf_counter() - put_started
+                if not delivered:
+                    return
+        finally:
+            METRICS.observe("stage_seconds", time.perf_counter() - started - blocked, stage="fetch", source=source.name)
+            put((source, None))
+
+    threads = [threading.Thread(target=produce, args=(source,), name=f"source-{source.name}", daemon=True) for source in sources]
+    for thread in threads:
+        thread.start()
+
+    remaining = len(sources)
+    try:
+        while remaining:
+            source, lead = buffer.get()
+            if lead is None:
+                remaining -= 1
+            yield source, lead
+    finally:
+        # On early exit, producers notice the stop flag at their next put and exit on their own
+        stop.set()
+        if not remaining:
+            for thread in threads:
+                thread.join()
+
+
+def open_sinks(config: dict) -> list:
+    sinks: list = [open_lead_history(config)]
+    if config["output"]["csv"].get("enabled", True):
+        sinks.append(CsvSink(config["output"]["csv"]["path"]))
+    sheets_cfg = config["output"]["google_sheets"]
+    if sheets_cfg.get("enabled", False) and sheets_cfg.get("sheet_id"):
+        sinks.append(
+            SheetsSink(
+                sheet_id=sheets_cfg.get("sheet_id", ""),
+                tab_name=sheets_cfg.get("tab_name", "Prospects"),
+                account=sheets_cfg.get("account") or None,
+                batch_size=int(sheets_cfg["batch_size"]),
+                max_retries=int(sheets_cfg["max_retries"]),
+                outbox_path=sheets_cfg["outbox_file"],
+            )
+        )
+    return sinks
+
+
 def run_pipeline(
     config_path: str = "config/icp.yaml",
     selected_source: str | None = None,
     dry_run: bool = False,
     throttle: bool = False,
+    cache_mode: str | None = None,
+    full_refresh: bool = False,
 ) -> dict:
+    # Before anything that can fail, so a failed run never carries the previous run's counts
+    METRICS.reset()
     config = load_config(config_path)
-    request_manager = RequestManager(timeout_seconds=int(config.get("http", {}).get("timeout_seconds", 10)))
-    # Enrichment uses a fast, low-retry manager — enrichment is best-effort, not critical
-    enrich_request_manager = RequestManager(timeout_seconds=3, max_retries=1, backoff_seconds=(1, 2, 4))
+    response_cache = open_response_cache(config, cache_mode)
+    request_manager = build_request_manager(config, response_cache)
     throttle_multiplier = 2.0 if throttle else 1.0
     sources = build_sources(config, request_manager, throttle_multiplier)
 
@@ -116,72 +306,180 @@ def run_pipeline(
     if not sources:
         raise ValueError("No sources enabled or matching source selection")
 
-    all_keywords, reverse_keyword_map = _expand_keywords(config)
+    cursors_file = config["state"]["cursors_file"]
+    cursors = {} if full_refresh else load_source_cursors(cursors_file)
+    rate_limits_file = config["state"]["rate_limits_file"]
+    rate_limits = load_rate_limits(rate_limits_file)
+    for source in sources:
+        source.cursors = dict(cursors.get(source.name, {}))
+        source.rate_limiter.restore(rate_limits.get(source.name))
+
+    all_keywords, reverse_keyword_map = expand_keywords(config)
+    exclude_matcher = TermMatcher(config["icp"]["exclude_keywords"])
     scorer = Scorer(config["icp"]["scoring"])
-    enricher = Enricher(enrich_request_manager)
-    seen = load_seen_domains(config["state"]["seen_domains_file"])
-    deduper = Deduplicator(seen)
+    enricher = build_enricher(config, response_cache)
+    executor = build_enrichment_executor(config, enricher)
+    seen_store = open_seen_domain_store(config)
+    deduper = Deduplicator(seen_store)
+    consolidator = LeadConsolidator()
+    sinks = [] if dry_run else open_sinks(config)
 
     started_at = datetime.now(timezone.utc)
-    source_counts: dict[str, int] = {}
-    raw_leads: list[Lead] = []
+    today = started_at.date().isoformat()
+    source_counts: dict[str, int] = {source.name: 0 for source in sources}
+    discarded_reasons: dict[str, int] = {}
+    new_leads: list[Lead] = []
+
+    def discard(lead: Lead, reason: str) -> None:
+        lead.discard_reason = reason
+        discarded_reasons[reason] = discarded_reasons.get(reason, 0) + 1
+        METRICS.inc("leads_discarded_total", source=lead.source, reason=reason)
+
+    # id(lead) -> the score its rows were written with; kept leads stay alive in new_leads
+    written_scores: dict[int, int] = {}
+
+    def score_and_write(lead: Lead) -> None:
+        # Scores, dedups and writes one enriched lead. Also called again for a settled lead that
+        # gained copies since, so its earlier discard is taken back before it is judged again.
+        if lead.discard_reason:
+            discarded_reasons[lead.discard_reason] -= 1
+            if not discarded_reasons[lead.discard_reason]:
+                del discarded_reasons[lead.discard_reason]
+            lead.discard_reason = ""
+        with METRICS.timer("stage_seconds", stage="score"):
+            score = scorer.score(lead)
+        consolidator.settle(lead)
+        written_score = written_scores.get(id(lead))
+        if written_score is not None:
+            # Already written this run: a second row only when the dedup threshold would let it through
+            if score - written_score > deduper.improvement_threshold:
+                lead.status = "Updated"
+                written_scores[id(lead)] = score
+                write([lead])
+            return
+        if score < MIN_FIT_SCORE:
+            discard(lead, "low_score")
+            return
+        with METRICS.timer("stage_seconds", stage="dedup"):
+            fresh, _ = deduper.split_new_and_seen([lead])
+        if not fresh:
+            discard(lead, lead.discard_reason)
+            return
+        new_leads.append(lead)
+        METRICS.inc("leads_kept_total", source=lead.source, band=Scorer.band(score))
+        written_scores[id(lead)] = score
+        write(fresh)
+
+    # Written leads not yet marked seen, because a buffering sink (Sheets) still holds their rows
+    unmarked: list[Lead] = []
+
+    def write(fresh: list[Lead]) -> None:
+        failed = False
+        for sink in sinks:
+            name = type(sink).__name__
+            try:
+                with METRICS.timer("stage_seconds", stage="sink", sink=name):
+                    sink.write(fresh)
+            except Exception as exc:  # noqa: BLE001
+                # One broken sink does not stop the others; its leads stay unseen for the next run
+                failed = True
+                METRICS.inc("sink_failures_total", sink=name)
+                logger.warning("%s write failed: %s", name, exc)
+        if dry_run or failed:
+            return
+        unmarked.extend(fresh)
+        if not any(getattr(sink, "buffered", 0) for sink in sinks):
+            mark_written()
+
+    def mark_written() -> None:
+        # Marked only once every sink has the rows: a crash before this leaves the domains
+        # unseen, so the next run finds the leads again instead of losing them
+        if unmarked:
+            with METRICS.timer("stage_seconds", stage="dedup"):
+                deduper.mark(unmarked, today)
+            unmarked.clear()
 
     console = Console()
-    with Progress(SpinnerColumn(), TextColumn("[progress.description]{task.description}"), transient=True) as progress:
-        source_task = progress.add_task("Fetching sources", total=len(sources))
-        for source in sources:
-            leads = source.safe_fetch(all_keywords, config)
-            for lead in leads:
-                for hit in list(lead.keyword_hits):
-                    lead.keyword_variant_hits.update(reverse_keyword_map.get(hit.lower(), set()))
-            raw_leads.extend(leads)
-            source_counts[source.name] = len(leads)
-            progress.advance(source_task)
-
-        enrich_task = progress.add_task("Enriching and scoring leads", total=len(raw_leads) or 1)
-        for lead in raw_leads:
-            lead_text = f"{lead.pain_quote} {lead.company}".lower()
-            if any(ex.lower() in lead_text for ex in config["icp"]["exclude_keywords"]):
-                lead.discard_reason = "excluded_keyword"
-                progress.advance(enrich_task)
-                continue
-            # Only enrich leads that have a domain — enrichment without a domain is a no-op anyway
-            if lead.domain:
-                enricher.enrich(lead)
-            scorer.score(lead)
-            progress.advance(enrich_task)
-
-    scored = [lead for lead in raw_leads if lead.fit_score >= 25 and not lead.discard_reason]
-    low_fit = [lead for lead in raw_leads if lead.fit_score < 25 and not lead.discard_reason]
-    for lead in low_fit:
-        lead.discard_reason = "low_score"
-
-    new_leads, seen_skipped = deduper.split_new_and_seen(scored)
-    today = datetime.now(timezone.utc).date().isoformat()
-    deduper.mark(new_leads, today)
-
-    if not dry_run:
-        if config["output"]["csv"].get("enabled", True):
-            write_leads_csv(config["output"]["csv"]["path"], new_leads)
-
-        sheets_cfg = config["output"]["google_sheets"]
-        if sheets_cfg.get("enabled", False):
+    try:
+        with Progress(
+            SpinnerColumn(),
+            TextColumn("[progress.description]{task.description}"),
+            _ThroughputColumn(),
+            transient=True,
+        ) as progress:
+            source_task = progress.add_task("Fetching sources", total=len(sources))
+            lead_task = progress.add_task("Enriching and scoring leads", total=None, unit="leads")
+
+            # Stages are chained generators: fetch -> filter -> consolidate -> enrich, then score -> dedup -> sinks.
+            # Each lead is written as soon as it is enriched; a copy that arrives later is merged into the
+            # settled lead, which is scored again once its source finishes.
+            finished_sources: list[str] = []
+
+            def filtered_leads() -> Iterator[Lead]:
+                for source, lead in stream_sources(sources, all_keywords, config):
+                    if lead is None:
+                        finished_sources.append(source.name)
+                        progress.advance(source_task)
+                        continue
+                    source_counts[source.name] += 1
+                    METRICS.inc("leads_fetched_total", source=source.name)
+                    lead.date_found = today
+                    apply_keyword_variants([lead], reverse_keyword_map)
+                    if is_excluded(lead, exclude_matcher):
+                        discard(lead, "excluded_keyword")
+                        progress.advance(lead_task)
+                        continue
+                    if consolidator.add(lead) is None:
+                        discard(lead, "consolidated")
+                        progress.advance(lead_task)
+                        continue
+                    yield lead
+
+            rescored_after = 0
+            for lead in executor.run(filtered_leads()):
+                progress.advance(lead_task)
+                score_and_write(lead)
+                if len(finished_sources) > rescored_after:
+                    rescored_after = len(finished_sources)
+                    for reopened in consolidator.take_reopened():
+                        score_and_write(reopened)
+            for reopened in consolidator.take_reopened():
+                score_and_write(reopened)
+    finally:
+        closed = True
+        for sink in sinks:
+            name = type(sink).__name__
             try:
-                append_to_sheets(
-                    sheet_id=sheets_cfg.get("sheet_id", ""),
-                    tab_name=sheets_cfg.get("tab_name", "Prospects"),
-                    leads=new_leads,
-                    account=sheets_cfg.get("account") or None,
-                )
+                with METRICS.timer("stage_seconds", stage="sink", sink=name):
+                    sink.close()
             except Exception as exc:  # noqa: BLE001
-                logger.warning("Google Sheets append failed: %s", exc)
+                closed = False
+                METRICS.inc("sink_failures_total", sink=name)
+                logger.warning("%s close failed: %s", name, exc)
+        # close() flushed whatever the sinks still buffered
+        if closed:
+            mark_written()
+        executor.close()
+        enricher.close()
+        seen_store.close()
+        request_manager.close()
+        if response_cache is not None:
+            response_cache.close()
 
-        save_seen_domains(config["state"]["seen_domains_file"], deduper.seen_domains)
+    if not dry_run:
+        # --full-refresh ignores stored cursors but still records where this run got to
+        stored_cursors = load_source_cursors(cursors_file)
+        stored_cursors.update({source.name: source.cursors for source in sources if source.cursors})
+        save_source_cursors(cursors_file, stored_cursors)
+        rate_limits.update({source.name: source.rate_limiter.state() for source in sources})
+        save_rate_limits(rate_limits_file, rate_limits)
 
-    discarded = [lead for lead in raw_leads if lead.discard_reason] + seen_skipped
-    discarded_reasons = summarize_discard_reasons(discarded)
+    for source in sources:
+        METRICS.set("rate_limit_requests_per_minute", source.rate_limiter.rate, source=source.name)
 
     ended_at = datetime.now(timezone.utc)
+    METRICS.set("last_run_timestamp_seconds", ended_at.timestamp())
+    METRICS.set("last_run_duration_seconds", (ended_at - started_at).total_seconds())
     generate_markdown_report(
         output_path="output/last-run-report.md",
         started_at=started_at,
@@ -189,17 +487,32 @@ def run_pipeline(
         source_counts=source_counts,
         kept_leads=new_leads,
         discarded_reasons=discarded_reasons,
+        enrichment_stats=enricher.stats,
+        metrics=METRICS.snapshot(),
+    )
+    METRICS.write_json(
+        METRICS_PATH,
+        started_at=started_at.isoformat(),
+        ended_at=ended_at.isoformat(),
+        source_counts=source_counts,
+        kept=len(new_leads),
+        discarded_reasons=discarded_reasons,
+        enrichment=enricher.stats,
     )
+    textfile = config["output"]["metrics"]["textfile"]
+    if textfile:
+        write_textfile(textfile, METRICS)
 
+    discarded_count = sum(discarded_reasons.values())
     summary_cfg = config["output"]["summary"]
     if summary_cfg.get("enabled", True):
-        emit_summary(summary_cfg.get("mode", "stdout"), summary_cfg.get("discord_webhook", ""), new_leads, len(discarded))
+        emit_summary(summary_cfg.get("mode", "stdout"), summary_cfg.get("discord_webhook", ""), new_leads, discarded_count)
 
     _print_run_table(console, source_counts, new_leads, discarded_reasons)
 
     return {
         "new_leads": new_leads,
-        "discarded": discarded,
+        "discarded_reasons": discarded_reasons,
         "source_counts": source_counts,
     }
 
@@ -1,7 +1,20 @@
 from __future__ import annotations
 
+from collections.abc import Sequence
+
+from prospector.matcher import TermMatcher, count_hits
 from prospector.models import Lead
 
+try:
+    import numpy as np
+except ImportError:  # optional extra; score_batch falls back to the scalar path
+    np = None
+
+QUOTE_B2B_TERMS = frozenset(["dashboard", "api", "integrations", "pricing", "team", "saas", "software", "product", "customers", "subscription"])
+QUOTE_SMALL_TEAM_TERMS = frozenset(["indie", "bootstrapped", "solo", "founder", "small team", "bootstrap", "side project", "built my own"])
+QUOTE_MATCHER = TermMatcher([*QUOTE_B2B_TERMS, *QUOTE_SMALL_TEAM_TERMS])
+KEYWORD_VARIANT_BONUS = 5
+
 
 class Scorer:
     def __init__(self, scoring_cfg: dict[str, int]) -> None:
@@ -13,27 +26,18 @@ class Scorer:
         if lead.pain_quote.strip():
             score += int(self.weights["pain_signal_present"])
 
-        # Also check pain_quote text for B2B/small-team signals (no domain required)
-        quote_lower = lead.pain_quote.lower()
-        b2b_terms = ["dashboard", "api", "integrations", "pricing", "team", "saas", "software", "product", "customers", "subscription"]
-        small_terms = ["indie", "bootstrapped", "solo", "founder", "small team", "bootstrap", "side project", "built my own"]
-        quote_b2b = sum(1 for t in b2b_terms if t in quote_lower)
-        quote_small = sum(1 for t in small_terms if t in quote_lower)
-        if quote_b2b >= 2 and lead.b2b_signal_count == 0:
-            lead.b2b_signal_count = quote_b2b
-        if quote_small >= 1 and not lead.small_team_signal_count and not lead.team_size_signal:
-            lead.small_team_signal_count = quote_small
+        self._apply_quote_signals(lead)
 
-        b2b_weight = int(self.weights["b2b_saas_signals"])
         if lead.b2b_signal_count > 0:
+            full, three, two, one = self._b2b_tiers()
             if lead.b2b_signal_count >= 4:
-                score += b2b_weight
+                score += full
             elif lead.b2b_signal_count == 3:
-                score += int(b2b_weight * 0.8)
+                score += three
             elif lead.b2b_signal_count == 2:
-                score += int(b2b_weight * 0.6)
+                score += two
             else:
-                score += int(b2b_weight * 0.4)
+                score += one
 
         if lead.small_team_signal_count > 0 or lead.team_size_signal:
             score += int(self.weights["small_team_signals"])
@@ -44,12 +48,63 @@ class Scorer:
         if lead.docs_url:
             score += int(self.weights["docs_present"])
 
-        if len(lead.keyword_variant_hits) >= 2:
-            score += 5
+        if len(lead.variant_hits()) >= 2:
+            score += KEYWORD_VARIANT_BONUS
 
         lead.fit_score = max(0, min(100, score))
         return lead.fit_score
 
+    def score_batch(self, leads: Sequence[Lead]) -> list[int]:
+        # Same result as score() per lead; the weights and b2b tiering are applied to whole
+        # columns at once, so re-scoring a large history after a weights change stays fast
+        if np is None or not leads:
+            return [self.score(lead) for lead in leads]
+
+        count = len(leads)
+        pain = np.zeros(count, dtype=bool)
+        b2b = np.zeros(count, dtype=np.int64)
+        small = np.zeros(count, dtype=bool)
+        stack = np.zeros(count, dtype=bool)
+        docs = np.zeros(count, dtype=bool)
+        variants = np.zeros(count, dtype=bool)
+        for index, lead in enumerate(leads):
+            # Quote matching is per-string work; everything after this loop is columnar
+            self._apply_quote_signals(lead)
+            pain[index] = bool(lead.pain_quote.strip())
+            b2b[index] = lead.b2b_signal_count
+            small[index] = lead.small_team_signal_count > 0 or bool(lead.team_size_signal)
+            stack[index] = lead.support_stack != "unknown"
+            docs[index] = bool(lead.docs_url)
+            variants[index] = len(lead.variant_hits()) >= 2
+
+        full, three, two, one = self._b2b_tiers()
+        scores = np.select([b2b >= 4, b2b == 3, b2b == 2, b2b >= 1], [full, three, two, one], default=0)
+        scores += pain * int(self.weights["pain_signal_present"])
+        scores += small * int(self.weights["small_team_signals"])
+        scores += stack * int(self.weights["helpdesk_stack_detected"])
+        scores += docs * int(self.weights["docs_present"])
+        scores += variants * KEYWORD_VARIANT_BONUS
+        results = np.clip(scores, 0, 100).tolist()
+
+        for lead, score in zip(leads, results):
+            lead.fit_score = score
+        return results
+
+    def _b2b_tiers(self) -> tuple[int, int, int, int]:
+        b2b_weight = int(self.weights["b2b_saas_signals"])
+        return b2b_weight, int(b2b_weight * 0.8), int(b2b_weight * 0.6), int(b2b_weight * 0.4)
+
+    @staticmethod
+    def _apply_quote_signals(lead: Lead) -> None:
+        # Also check pain_quote text for B2B/small-team signals (no domain required)
+        quote_hits = QUOTE_MATCHER.find(lead.pain_quote)
+        quote_b2b = count_hits(quote_hits, QUOTE_B2B_TERMS)
+        quote_small = count_hits(quote_hits, QUOTE_SMALL_TEAM_TERMS)
+        if quote_b2b >= 2 and lead.b2b_signal_count == 0:
+            lead.b2b_signal_count = quote_b2b
+        if quote_small >= 1 and not lead.small_team_signal_count and not lead.team_size_signal:
+            lead.small_team_signal_count = quote_small
+
     @staticmethod
     def band(score: int) -> str:
         if score >= 70:
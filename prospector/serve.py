@@ -0,0 +1,33 @@
+from __future__ import annotations
+
+import logging
+import time
+
+from prospector.metrics import METRICS, Metrics
+from prospector.outputs.openmetrics import start_metrics_server
+from prospector.run import run_pipeline
+
+logger = logging.getLogger("prospector.serve")
+
+
+def serve(config_path: str, interval_minutes: float, host: str = "127.0.0.1", port: int = 9464, throttle: bool = False) -> None:
+    # Long-running mode: run the pipeline on an interval and expose totals across runs on
+    # /metrics. METRICS is reset before every run, so each run is folded into `totals` exactly once.
+    totals = Metrics()
+    server = start_metrics_server(host, port, totals)
+    try:
+        while True:
+            started = time.monotonic()
+            METRICS.reset()
+            try:
+                run_pipeline(config_path=config_path, throttle=throttle)
+                totals.inc("runs_total", result="ok")
+            except Exception as exc:  # noqa: BLE001
+                logger.warning("scheduled run failed: %s", exc)
+                totals.inc("runs_total", result="failed")
+            totals.merge(METRICS)
+            time.sleep(max(0.0, interval_minutes * 60 - (time.monotonic() - started)))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.shutdown()
@@ -1,14 +1,21 @@
 from __future__ import annotations
 
 import logging
-import time
 from abc import ABC, abstractmethod
+from collections.abc import Iterator
 
 from prospector.http import RequestManager
+from prospector.metrics import METRICS
 from prospector.models import Lead
+from prospector.ratelimit import RateLimiter
+
+# Backfill position marking a fully walked query
+BACKFILL_DONE = -1
 
 
 class Source(ABC):
+    # Sources are synchronous only: fetch()/iter_fetch() run on their own thread in stream_sources,
+    # and the async HTTP path is used for enrichment alone. There is no async fetch to implement.
     def __init__(
         self,
         name: str,
@@ -21,23 +28,49 @@ class Source(ABC):
         self.requests_per_minute = max(1, int(requests_per_minute))
         self.throttle_multiplier = max(1.0, float(throttle_multiplier))
         self.logger = logging.getLogger(f"prospector.sources.{name}")
-        self._request_gap_seconds = (60.0 / self.requests_per_minute) * self.throttle_multiplier
-        self._last_request_time = 0.0
+        self.rate_limiter = RateLimiter(name, self.requests_per_minute / self.throttle_multiplier)
+        # Each source gets its own RequestManager copy (see build_sources), so the manager's
+        # retries and response headers feed this source's bucket
+        request_manager.rate_limiter = self.rate_limiter
+        # High-water marks per query key (created_utc, created_at_i, tweet id...), persisted between runs
+        self.cursors: dict[str, int] = {}
 
     @abstractmethod
     def fetch(self, keywords: list[str], config: dict) -> list[Lead]:
         raise NotImplementedError
 
+    def iter_fetch(self, keywords: list[str], config: dict) -> Iterator[Lead]:
+        # Streaming sources override this (and build fetch() on top of it) so leads can
+        # flow downstream while later requests are still being made
+        yield from self.fetch(keywords, config)
+
+    def backfill(self, keywords: list[str], config: dict, since: int, positions: dict[str, int]) -> Iterator[list[Lead]]:
+        # Yields one page of leads at a time; positions is updated before each yield so the
+        # caller can checkpoint it once the page has been processed
+        raise NotImplementedError(f"source '{self.name}' does not support backfill")
+
     def _wait_for_slot(self) -> None:
-        now = time.monotonic()
-        elapsed = now - self._last_request_time
-        if elapsed < self._request_gap_seconds:
-            time.sleep(self._request_gap_seconds - elapsed)
-        self._last_request_time = time.monotonic()
+        self.rate_limiter.acquire()
+
+    def _cursor(self, key: str) -> int:
+        return self.cursors.get(key, 0)
+
+    def _advance_cursor(self, key: str, value: int) -> None:
+        if value > self.cursors.get(key, 0):
+            self.cursors[key] = value
 
     def safe_fetch(self, keywords: list[str], config: dict) -> list[Lead]:
         try:
             return self.fetch(keywords, config)
         except Exception as exc:  # noqa: BLE001
+            METRICS.inc("source_failures_total", source=self.name)
             self.logger.warning("source failed: %s", exc)
             return []
+
+    def safe_iter_fetch(self, keywords: list[str], config: dict) -> Iterator[Lead]:
+        # Leads yielded before a failure are kept
+        try:
+            yield from self.iter_fetch(keywords, config)
+        except Exception as exc:  # noqa: BLE001
+            METRICS.inc("source_failures_total", source=self.name)
+            self.logger.warning("source failed: %s", exc)
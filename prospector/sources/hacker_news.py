@@ -1,10 +1,36 @@
 from __future__ import annotations
 
-from urllib.parse import quote_plus
+from collections.abc import Iterator
+from urllib.parse import urlencode
 
+from prospector.domains import domain_from_url, extract_domain
 from prospector.models import Lead
-from prospector.sources.base import Source
-from prospector.utils import domain_from_url, extract_domain, short_snippet
+from prospector.sources.base import BACKFILL_DONE, Source
+from prospector.sources.query_planner import BatchedSearch, KeywordAttributor, SearchHit, next_backfill_page, plan_batches
+from prospector.utils import short_snippet
+
+ALGOLIA_SEARCH_BY_DATE_URL = "https://hn.algolia.com/api/v1/search_by_date"
+KEYWORDS_PER_QUERY = 6
+RESULTS_PER_QUERY = 100
+# What the per-keyword query used to return; every keyword of a batch gets at least this many hits
+PER_KEYWORD_RESULTS = 20
+
+
+def _search_url(keywords: list[str], after: int = 0, before: int = 0) -> str:
+    query = " ".join(keywords)
+    params: dict[str, str | int] = {"query": query, "tags": "(story,comment)", "hitsPerPage": RESULTS_PER_QUERY}
+    if len(keywords) > 1:
+        # optionalWords == query turns Algolia's implicit AND into "match any of these words";
+        # a single keyword keeps the AND of its own query
+        params["optionalWords"] = query
+    filters = []
+    if after:
+        filters.append(f"created_at_i>{after}")
+    if before:
+        filters.append(f"created_at_i<={before}")
+    if filters:
+        params["numericFilters"] = ",".join(filters)
+    return f"{ALGOLIA_SEARCH_BY_DATE_URL}?{urlencode(params)}"
 
 
 class HackerNewsSource(Source):
@@ -12,37 +38,70 @@ class HackerNewsSource(Source):
         super().__init__("hacker_news", request_manager, requests_per_minute, throttle_multiplier)
 
     def fetch(self, keywords: list[str], config: dict) -> list[Lead]:
-        leads: list[Lead] = []
+        return list(self.iter_fetch(keywords, config))
+
+    def iter_fetch(self, keywords: list[str], config: dict) -> Iterator[Lead]:
         seen_urls: set[str] = set()
+        # Newest first, so a keyword's hits within a batch are exactly the newest of its own query
+        search = BatchedSearch(self._search_page, keywords, PER_KEYWORD_RESULTS, RESULTS_PER_QUERY)
 
-        for keyword in keywords:
-            self._wait_for_slot()
-            url = f"https://hn.algolia.com/api/v1/search?query={quote_plus(keyword)}&tags=story,comment&hitsPerPage=20"
+        for keyword_group in plan_batches(keywords, _search_url, KEYWORDS_PER_QUERY):
+            cursors = {("", keyword.lower()): self._cursor(keyword.lower()) for keyword in keyword_group}
             try:
-                payload = self.request_manager.get_json(url)
+                for hit, matched in search.run([""], keyword_group, cursors):
+                    lead = self._lead_from_hit(hit.item, matched)
+                    if lead.evidence_url in seen_urls:
+                        continue
+                    seen_urls.add(lead.evidence_url)
+                    yield lead
             except RuntimeError as exc:
-                self.logger.warning("HN request failed for keyword '%s': %s", keyword, exc)
+                self.logger.warning("HN request failed for keywords %s: %s", keyword_group, exc)
                 continue
 
-            for hit in payload.get("hits", []):
-                item_url = hit.get("url") or ""
-                hn_url = f"https://news.ycombinator.com/item?id={hit.get('objectID', '')}"
-                evidence_url = item_url or hn_url
-                if evidence_url in seen_urls:
-                    continue
-                seen_urls.add(evidence_url)
-
-                text = hit.get("comment_text") or hit.get("story_text") or hit.get("title") or ""
-                maybe_domain = domain_from_url(item_url) or extract_domain(text)
-                lead = Lead(
-                    domain=maybe_domain,
-                    company=hit.get("author", "unknown"),
-                    source="hn",
-                    evidence_url=evidence_url,
-                    pain_quote=short_snippet(text),
-                    source_item_id=str(hit.get("objectID", "")),
-                )
-                lead.keyword_hits.add(keyword.lower())
-                leads.append(lead)
-
-        return leads
+            # A truncated window keeps its old cursor, so the next run reads the rest of it
+            for _, keyword in search.satisfied:
+                self._advance_cursor(keyword, search.newest)
+
+    def _search_page(self, groups: list[str], keywords: list[str], after: int, before: int) -> list[SearchHit]:
+        self._wait_for_slot()
+        hits = self.request_manager.get_json(_search_url(keywords, after, before)).get("hits", [])
+        return [
+            SearchHit(hit, str(hit.get("objectID", "")), int(float(hit.get("created_at_i") or 0)), "", _hit_text(hit)) for hit in hits
+        ]
+
+    def backfill(self, keywords: list[str], config: dict, since: int, positions: dict[str, int]) -> Iterator[list[Lead]]:
+        # Walks search_by_date newest-first with a moving created_at_i upper bound, which (unlike
+        # page numbers) is not capped by Algolia's pagination limit and resumes from a single int
+        for keyword_group in plan_batches(keywords, _search_url, KEYWORDS_PER_QUERY):
+            key = "|".join(keyword.lower() for keyword in keyword_group)
+            attributor = KeywordAttributor(keyword_group)
+            boundary_ids: set[str] = set()
+            while positions.get(key) != BACKFILL_DONE:
+                before = positions.get(key, 0)
+                page = self._search_page([""], keyword_group, since, before)
+                fresh, positions[key], boundary_ids = next_backfill_page(page, before, boundary_ids, RESULTS_PER_QUERY)
+                matches = [(hit.item, attributor.match(hit.text)) for hit in fresh]
+                yield [self._lead_from_hit(hit, matched) for hit, matched in matches if matched]
+
+    @staticmethod
+    def _lead_from_hit(hit: dict, keyword_hits: list[str]) -> Lead:
+        item_url = hit.get("url") or ""
+        hn_url = f"https://news.ycombinator.com/item?id={hit.get('objectID', '')}"
+        text = hit.get("comment_text") or hit.get("story_text") or hit.get("title") or ""
+        maybe_domain = domain_from_url(item_url) or extract_domain(text)
+        lead = Lead(
+            domain=maybe_domain,
+            company=hit.get("author", "unknown"),
+            source="hn",
+            evidence_url=item_url or hn_url,
+            pain_quote=short_snippet(text),
+            source_item_id=str(hit.get("objectID", "")),
+        )
+        for keyword in keyword_hits:
+            lead.add_keyword_hit(keyword)
+        return lead
+
+
+def _hit_text(hit: dict) -> str:
+    text = hit.get("comment_text") or hit.get("story_text") or hit.get("title") or ""
+    return f"{hit.get('title') or ''}\n{text}"
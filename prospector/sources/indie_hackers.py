@@ -1,10 +1,12 @@
 from __future__ import annotations
 
+from collections.abc import Iterator
 from urllib.parse import quote_plus
 
+from prospector.domains import domain_from_url, extract_domain
 from prospector.models import Lead
 from prospector.sources.base import Source
-from prospector.utils import domain_from_url, extract_domain, short_snippet
+from prospector.utils import short_snippet
 
 
 class IndieHackersSource(Source):
@@ -12,7 +14,9 @@ class IndieHackersSource(Source):
         super().__init__("indie_hackers", request_manager, requests_per_minute, throttle_multiplier)
 
     def fetch(self, keywords: list[str], config: dict) -> list[Lead]:
-        leads: list[Lead] = []
+        return list(self.iter_fetch(keywords, config))
+
+    def iter_fetch(self, keywords: list[str], config: dict) -> Iterator[Lead]:
         seen_urls: set[str] = set()
 
         for keyword in keywords:
@@ -39,7 +43,5 @@ class IndieHackersSource(Source):
                     evidence_url=link,
                     pain_quote=short_snippet(keyword),
                 )
-                lead.keyword_hits.add(keyword.lower())
-                leads.append(lead)
-
-        return leads
+                lead.add_keyword_hit(keyword.lower())
+                yield lead
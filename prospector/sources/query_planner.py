@@ -0,0 +1,191 @@
+from __future__ import annotations
+
+import re
+from collections import Counter
+from collections.abc import Callable, Iterator, Mapping
+from typing import NamedTuple
+
+from prospector.sources.base import BACKFILL_DONE
+
+# Conservative cap that stays under common proxy/CDN URL limits
+MAX_URL_LENGTH = 1800
+
+# Pages a batch reads before its unsatisfied (group, keyword) pairs are split off into smaller queries
+MAX_PAGES_PER_BATCH = 3
+
+_WORD_PATTERN = re.compile(r"[a-z0-9']+")
+
+Pair = tuple[str, str]
+
+
+def plan_batches(items: list[str], render: Callable[[list[str]], str], max_items: int, max_length: int = MAX_URL_LENGTH) -> list[list[str]]:
+    # Greedy packing: grow a batch until the rendered URL or the item cap would overflow
+    batches: list[list[str]] = []
+    current: list[str] = []
+    for item in items:
+        candidate = current + [item]
+        if current and (len(candidate) > max_items or len(render(candidate)) > max_length):
+            batches.append(current)
+            candidate = [item]
+        current = candidate
+    if current:
+        batches.append(current)
+    return batches
+
+
+class KeywordAttributor:
+    # Batched queries return hits for any keyword in the batch, so each hit is re-attributed
+    # locally: a keyword matches when its phrase, or every one of its words, is in the text.
+    def __init__(self, keywords: list[str]) -> None:
+        self._keywords = [(keyword.lower(), frozenset(_WORD_PATTERN.findall(keyword.lower()))) for keyword in keywords]
+
+    def match(self, text: str) -> list[str]:
+        lowered = text.lower()
+        words: set[str] | None = None
+        hits: list[str] = []
+        for phrase, phrase_words in self._keywords:
+            if phrase in lowered:
+                hits.append(phrase)
+                continue
+            if words is None:
+                words = set(_WORD_PATTERN.findall(lowered))
+            if phrase_words and phrase_words <= words:
+                hits.append(phrase)
+        return hits
+
+
+class SearchHit(NamedTuple):
+    item: dict
+    item_id: str
+    created: int
+    group: str
+    text: str
+
+
+class BatchedSearch:
+    # Runs one newest-first query for groups x keywords (subreddits x keywords; HN has a single
+    # "" group) in place of a query per (group, keyword) pair, without returning less per pair
+    # than that pair's own query would. Items are attributed locally, and a pair is satisfied once
+    # the results run out, once paging reaches the pair's cursor, or (no cursor yet) once it has
+    # `quota` hits, its own query's page size. Only satisfied pairs may move their cursor. A saturated
+    # page is followed by the next one (inclusive time bound, items deduped by id); after
+    # max_pages the unsatisfied pairs are split into halves, down to one pair per query.
+    #
+    # fetch_page(groups, keywords, after, before) returns one page newest first, with
+    # after < created <= before (0 = unbounded).
+    def __init__(
+        self,
+        fetch_page: Callable[[list[str], list[str], int, int], list[SearchHit]],
+        keywords: list[str],
+        quota: int,
+        page_size: int,
+        max_pages: int = MAX_PAGES_PER_BATCH,
+    ) -> None:
+        self.fetch_page = fetch_page
+        self.attributor = KeywordAttributor(keywords)
+        self.quota = quota
+        self.page_size = page_size
+        self.max_pages = max(1, max_pages)
+        self.newest = 0
+        self.satisfied: set[Pair] = set()
+
+    def run(
+        self, groups: list[str], keywords: list[str], cursors: Mapping[Pair, int] | None = None
+    ) -> Iterator[tuple[SearchHit, list[str]]]:
+        # Yields (hit, attributed keywords); newest and satisfied are final once exhausted.
+        # cursors: newest item already seen per (group, keyword), 0 or missing for none
+        self.newest = 0
+        self.satisfied = set()
+        yield from self._walk(groups, keywords, cursors or {}, 0, set(), Counter())
+
+    def _walk(
+        self,
+        groups: list[str],
+        keywords: list[str],
+        cursors: Mapping[Pair, int],
+        before: int,
+        seen_ids: set[str],
+        counts: Counter,
+    ) -> Iterator[tuple[SearchHit, list[str]]]:
+        pending = {(group.lower(), keyword.lower()) for group in groups for keyword in keywords}
+        # The batch only needs items newer than its least advanced pair
+        after = min(cursors.get(pair, 0) for pair in pending)
+        wanted = {keyword.lower() for keyword in keywords}
+        oldest = before
+        for _ in range(self.max_pages):
+            page = self.fetch_page(groups, keywords, after, oldest)
+            fresh = 0
+            for hit in page:
+                if hit.created:
+                    self.newest = max(self.newest, hit.created)
+                    oldest = min(oldest, hit.created) if oldest else hit.created
+                # Also checked locally: the APIs' time filters are not always exact
+                if hit.item_id in seen_ids or (after and hit.created and hit.created <= after):
+                    continue
+                seen_ids.add(hit.item_id)
+                fresh += 1
+                group = groups[0].lower() if len(groups) == 1 else hit.group.lower()
+                matched = self.attributor.match(hit.text)
+                if wanted.isdisjoint(matched):
+                    continue
+                counts.update((group, keyword) for keyword in matched)
+                yield hit, matched
+            if len(page) < self.page_size:
+                self.satisfied |= pending
+                return
+            done = {pair for pair in pending if _covered(pair, cursors.get(pair, 0), counts, oldest, self.quota)}
+            self.satisfied |= done
+            pending -= done
+            # No fresh items: a full page shares one timestamp and the bound cannot move past it
+            if not pending or not fresh:
+                break
+        if pending:
+            for sub_groups, sub_keywords in _split(groups, keywords, pending):
+                yield from self._walk(sub_groups, sub_keywords, cursors, oldest, seen_ids, counts)
+
+
+def _covered(pair: Pair, cursor: int, counts: Counter, oldest: int, quota: int) -> bool:
+    if cursor:
+        # Everything between the cursor and the newest item has been read
+        return oldest <= cursor
+    # First run for this pair: the newest `quota` hits are what its own query returned
+    return counts[pair] >= quota
+
+
+def _split(groups: list[str], keywords: list[str], pending: set[Pair]) -> list[tuple[list[str], list[str]]]:
+    # Halves the keywords of the unsatisfied pairs (or their groups once one keyword is left)
+    keywords = [keyword for keyword in keywords if any(pair[1] == keyword.lower() for pair in pending)]
+    groups = [group for group in groups if any(pair[0] == group.lower() for pair in pending)]
+    if len(keywords) > 1:
+        middle = len(keywords) // 2
+        halves = [keywords[:middle], keywords[middle:]]
+        return [
+            ([group for group in groups if any((group.lower(), keyword.lower()) in pending for keyword in half)], half)
+            for half in halves
+        ]
+    if len(groups) > 1:
+        middle = len(groups) // 2
+        return [(groups[:middle], keywords), (groups[middle:], keywords)]
+    return []
+
+
+def next_backfill_page(
+    hits: list[SearchHit], before: int, boundary_ids: set[str], page_size: int
+) -> tuple[list[SearchHit], int, set[str]]:
+    # One step of a newest-first walk with an inclusive upper bound: items sharing the oldest
+    # second of a page are requested again with the next page, and the ones already read are
+    # dropped by id. Returns (unread hits, next bound or BACKFILL_DONE, ids read at that bound).
+    for hit in hits:
+        if hit.created <= 0:
+            raise RuntimeError(f"search result {hit.item_id or '?'} has no timestamp; cannot page past it")
+    fresh = [hit for hit in hits if hit.item_id not in boundary_ids]
+    if len(hits) < page_size:
+        return fresh, BACKFILL_DONE, set()
+    oldest = min(hit.created for hit in hits)
+    if not fresh:
+        # A full page of one second, all read already: the APIs cannot page within a second
+        return fresh, oldest - 1, set()
+    boundary = {hit.item_id for hit in hits if hit.created == oldest}
+    if oldest == before:
+        boundary |= boundary_ids
+    return fresh, oldest, boundary
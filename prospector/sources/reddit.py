@@ -1,10 +1,43 @@
 from __future__ import annotations
 
-from urllib.parse import quote_plus
+from collections.abc import Iterator
+from urllib.parse import urlencode
 
+from prospector.domains import domain_from_url, extract_domain
 from prospector.models import Lead
-from prospector.sources.base import Source
-from prospector.utils import domain_from_url, extract_domain, short_snippet
+from prospector.sources.base import BACKFILL_DONE, Source
+from prospector.sources.query_planner import BatchedSearch, KeywordAttributor, SearchHit, next_backfill_page, plan_batches
+from prospector.utils import short_snippet
+
+PULLPUSH_SEARCH_URL = "https://api.pullpush.io/reddit/search/submission/"
+SUBREDDITS_PER_QUERY = 8
+KEYWORDS_PER_QUERY = 8
+RESULTS_PER_QUERY = 100
+# What the per-(subreddit, keyword) query used to return; every pair of a batch gets at least this many
+PER_KEYWORD_RESULTS = 25
+
+
+def _or_query(keywords: list[str]) -> str:
+    # Pushshift-style boolean syntax: quoted phrases joined with |
+    return "|".join(f'"{keyword}"' for keyword in keywords)
+
+
+def _search_url(subreddits: list[str], keywords: list[str], after: int = 0, before: int = 0) -> str:
+    params: dict[str, str | int] = {
+        "subreddit": ",".join(subreddits),
+        "q": _or_query(keywords),
+        "size": RESULTS_PER_QUERY,
+        "sort": "desc",
+    }
+    if after:
+        params["after"] = after
+    if before:
+        params["before"] = before
+    return f"{PULLPUSH_SEARCH_URL}?{urlencode(params)}"
+
+
+def _cursor_key(subreddit: str, keyword: str) -> str:
+    return f"{subreddit.lower()}:{keyword.lower()}"
 
 
 class RedditSource(Source):
@@ -12,46 +45,81 @@ class RedditSource(Source):
         super().__init__("reddit", request_manager, requests_per_minute, throttle_multiplier)
 
     def fetch(self, keywords: list[str], config: dict) -> list[Lead]:
-        subreddits = config["sources"]["reddit"]["subreddits"]
-        leads: list[Lead] = []
+        return list(self.iter_fetch(keywords, config))
+
+    def iter_fetch(self, keywords: list[str], config: dict) -> Iterator[Lead]:
         seen_urls: set[str] = set()
+        search = BatchedSearch(self._search_page, keywords, PER_KEYWORD_RESULTS, RESULTS_PER_QUERY)
 
-        for subreddit in subreddits:
-            for keyword in keywords:
-                self._wait_for_slot()
-                # Use pullpush.io (Pushshift alternative) — Reddit's own API blocks VPS IPs
-                url = f"https://api.pullpush.io/reddit/search/submission/?subreddit={subreddit}&q={quote_plus(keyword)}&size=25&sort=desc"
-                try:
-                    payload = self.request_manager.get_json(url)
-                except RuntimeError as exc:
-                    self.logger.warning("Reddit request failed for r/%s: %s", subreddit, exc)
-                    continue
-
-                for data in payload.get("data", []):
-                    permalink = data.get("permalink", "")
-                    if not permalink:
+        for subreddit_group, keyword_group in self._query_groups(keywords, config):
+            cursors = {(sub.lower(), kw.lower()): self._cursor(_cursor_key(sub, kw)) for sub in subreddit_group for kw in keyword_group}
+            try:
+                for hit, matched in search.run(subreddit_group, keyword_group, cursors):
+                    lead = self._lead_from_post(hit.item, matched)
+                    if lead is None or lead.evidence_url in seen_urls:
                         continue
-                    evidence_url = f"https://www.reddit.com{permalink}"
-                    if evidence_url in seen_urls:
-                        continue
-                    seen_urls.add(evidence_url)
-
-                    title = data.get("title", "")
-                    selftext = data.get("selftext", "")
-                    quote = short_snippet(f"{title} {selftext}")
-                    maybe_domain = extract_domain(selftext) or domain_from_url(data.get("url", ""))
-                    if maybe_domain.endswith("reddit.com"):
-                        maybe_domain = ""
-
-                    lead = Lead(
-                        domain=maybe_domain,
-                        company=data.get("author", "unknown"),
-                        source="reddit",
-                        evidence_url=evidence_url,
-                        pain_quote=quote,
-                        source_item_id=str(data.get("id", "")),
-                    )
-                    lead.keyword_hits.add(keyword.lower())
-                    leads.append(lead)
-
-        return leads
+                    seen_urls.add(lead.evidence_url)
+                    yield lead
+            except RuntimeError as exc:
+                self.logger.warning("Reddit request failed for r/%s: %s", ",".join(subreddit_group), exc)
+                continue
+
+            # A truncated window keeps its old cursor, so the next run reads the rest of it
+            for subreddit, keyword in search.satisfied:
+                self._advance_cursor(_cursor_key(subreddit, keyword), search.newest)
+
+    def _search_page(self, subreddits: list[str], keywords: list[str], after: int, before: int) -> list[SearchHit]:
+        self._wait_for_slot()
+        # Use pullpush.io (Pushshift alternative) — Reddit's own API blocks VPS IPs; its before is exclusive
+        posts = self.request_manager.get_json(_search_url(subreddits, keywords, after, before + 1 if before else 0)).get("data", [])
+        return [
+            SearchHit(post, str(post.get("id", "")), int(float(post.get("created_utc") or 0)), post.get("subreddit") or "", _post_text(post))
+            for post in posts
+        ]
+
+    def backfill(self, keywords: list[str], config: dict, since: int, positions: dict[str, int]) -> Iterator[list[Lead]]:
+        for subreddit_group, keyword_group in self._query_groups(keywords, config):
+            key = f"{','.join(subreddit_group).lower()}|{'|'.join(keyword.lower() for keyword in keyword_group)}"
+            attributor = KeywordAttributor(keyword_group)
+            boundary_ids: set[str] = set()
+            while positions.get(key) != BACKFILL_DONE:
+                before = positions.get(key, 0)
+                page = self._search_page(subreddit_group, keyword_group, since, before)
+                fresh, positions[key], boundary_ids = next_backfill_page(page, before, boundary_ids, RESULTS_PER_QUERY)
+                matches = [(hit.item, attributor.match(hit.text)) for hit in fresh]
+                yield [lead for lead in (self._lead_from_post(post, matched) for post, matched in matches if matched) if lead is not None]
+
+    @staticmethod
+    def _query_groups(keywords: list[str], config: dict) -> Iterator[tuple[list[str], list[str]]]:
+        # One request per (subreddit group, keyword group) instead of per (subreddit, keyword)
+        subreddits = config["sources"]["reddit"]["subreddits"]
+        for subreddit_group in plan_batches(subreddits, lambda group: _search_url(group, []), SUBREDDITS_PER_QUERY):
+            for keyword_group in plan_batches(keywords, lambda group: _search_url(subreddit_group, group), KEYWORDS_PER_QUERY):
+                yield subreddit_group, keyword_group
+
+    @staticmethod
+    def _lead_from_post(data: dict, keyword_hits: list[str]) -> Lead | None:
+        permalink = data.get("permalink", "")
+        if not permalink:
+            return None
+
+        title = data.get("title", "")
+        selftext = data.get("selftext", "")
+
+        maybe_domain = extract_domain(selftext) or domain_from_url(data.get("url", ""))
+
+        lead = Lead(
+            domain=maybe_domain,
+            company=data.get("author", "unknown"),
+            source="reddit",
+            evidence_url=f"https://www.reddit.com{permalink}",
+            pain_quote=short_snippet(f"{title} {selftext}"),
+            source_item_id=str(data.get("id", "")),
+        )
+        for keyword in keyword_hits:
+            lead.add_keyword_hit(keyword)
+        return lead
+
+
+def _post_text(post: dict) -> str:
+    return f"{post.get('title', '')}\n{post.get('selftext', '')}"
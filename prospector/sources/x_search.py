@@ -1,76 +1,262 @@
 from __future__ import annotations
 
+import ast
+import importlib.util
 import json
+import logging
+import os
+import select
 import subprocess
 import tempfile
-import os
+import time
+from collections.abc import Callable, Iterator
+from pathlib import Path
 
+from prospector.domains import domain_from_url, extract_domain
+from prospector.metrics import METRICS
 from prospector.models import Lead
 from prospector.sources.base import Source
-from prospector.utils import domain_from_url, extract_domain, short_snippet
+from prospector.utils import short_snippet
 
 X_SCRIPT_PATH = os.environ.get("ICP_X_SCRIPT_PATH", "x_search_smart.py")
+X_PYTHON = os.environ.get("ICP_X_PYTHON", "python3")
+X_MAX_RESULTS = 20
+# What argparse exits with on an unknown flag: a script that rejects --serve before answering
+# anything has no worker mode, while any other exit is a crash worth a restart
+USAGE_EXIT_CODE = 2
+
+logger = logging.getLogger("prospector.sources.x")
+
+
+def _script_search_function(script_path: str) -> Callable[..., object] | None:
+    # Only import scripts that define a top-level search(); importing anything else could run
+    # the script's CLI with our argv
+    try:
+        tree = ast.parse(Path(script_path).read_text(encoding="utf-8"))
+    except (OSError, SyntaxError, ValueError):
+        return None
+    if not any(isinstance(node, ast.FunctionDef) and node.name == "search" for node in tree.body):
+        return None
+    spec = importlib.util.spec_from_file_location("_prospector_x_script", script_path)
+    if spec is None or spec.loader is None:
+        return None
+    module = importlib.util.module_from_spec(spec)
+    try:
+        spec.loader.exec_module(module)
+    except Exception as exc:  # noqa: BLE001
+        logger.warning("could not import %s, using a worker process: %s", script_path, exc)
+        return None
+    return getattr(module, "search", None)
+
+
+class XSearchWorker:
+    # Runs every keyword of a run through one interpreter instead of one per keyword:
+    # - "import": the script defines search(query, max_results, no_retweets) and is called in-process
+    # - "worker": `python3 script --serve` reads one JSON query per stdin line ({"id", "query", "max",
+    #   "no_retweets"}) and answers each with one JSON line echoing the id ({"id", "result"} or
+    #   {"id", "error"}); a crashed or hung worker is restarted up to max_restarts times
+    # - "process": scripts without --serve get the old per-keyword `--out` run
+    def __init__(
+        self,
+        script_path: str = X_SCRIPT_PATH,
+        python: str = X_PYTHON,
+        max_restarts: int = 3,
+        timeout_seconds: float = 120.0,
+    ) -> None:
+        self.script_path = script_path
+        self.python = python
+        self.max_restarts = max_restarts
+        self.timeout_seconds = timeout_seconds
+        self.restarts = 0
+        self._process: subprocess.Popen[bytes] | None = None
+        self._stdout = b""
+        self._request_id = 0
+        self._answered = False
+        self._search_fn = _script_search_function(script_path)
+        self.mode = "import" if self._search_fn is not None else "worker"
+
+    def close(self) -> None:
+        if self._process is None:
+            return
+        process, self._process = self._process, None
+        try:
+            process.stdin.close()
+            process.wait(timeout=5)
+        except (OSError, subprocess.TimeoutExpired):
+            process.kill()
+            process.wait()
+
+    def search(self, query: str, max_results: int = X_MAX_RESULTS) -> object:
+        if self.mode == "import":
+            try:
+                return self._search_fn(query, max_results=max_results, no_retweets=True)
+            except Exception as exc:  # noqa: BLE001
+                raise RuntimeError(str(exc)) from exc
+        if self.mode == "worker":
+            payload = self._ask_worker(query, max_results)
+            if payload is not None:
+                return payload
+        return self._run_once(query, max_results)
+
+    def _ask_worker(self, query: str, max_results: int) -> object | None:
+        while True:
+            self._request_id += 1
+            request = json.dumps({"id": self._request_id, "query": query, "max": max_results, "no_retweets": True}) + "\n"
+            try:
+                process = self._worker()
+                process.stdin.write(request.encode("utf-8"))
+                process.stdin.flush()
+                reply = self._read_reply(process, self._request_id)
+            except OSError:
+                reply = None
+            if reply is not None:
+                self._answered = True
+                if reply.get("error"):
+                    raise RuntimeError(reply["error"])
+                return reply.get("result")
+            exit_code = self._kill()
+            if exit_code == USAGE_EXIT_CODE and not self._answered:
+                logger.info("%s has no --serve mode; running it once per keyword", self.script_path)
+                self.mode = "process"
+                return None
+            if self.restarts >= self.max_restarts:
+                logger.warning("X worker keeps failing; running the script once per keyword")
+                self.mode = "process"
+                return None
+            self.restarts += 1
+            METRICS.inc("x_worker_restarts_total")
+            logger.warning("X worker failed; restarting (%d/%d)", self.restarts, self.max_restarts)
+
+    def _worker(self) -> subprocess.Popen[bytes]:
+        if self._process is None:
+            self._stdout = b""
+            self._process = subprocess.Popen(
+                [self.python, self.script_path, "--serve"],
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+            )
+        return self._process
+
+    def _read_reply(self, process: subprocess.Popen[bytes], request_id: int) -> dict | None:
+        # Skips whatever else the script prints (progress output, a late answer to a query that
+        # timed out) until the line answering request_id; None on timeout or exit
+        deadline = time.monotonic() + self.timeout_seconds
+        while True:
+            line = self._read_line(process, deadline)
+            if line is None:
+                return None
+            try:
+                reply = json.loads(line)
+            except json.JSONDecodeError:
+                logger.debug("skipping non-JSON X worker output: %.80s", line)
+                continue
+            if isinstance(reply, dict) and reply.get("id") == request_id:
+                return reply
+            logger.debug("skipping X worker output that answers no pending query: %.80s", line)
+
+    def _read_line(self, process: subprocess.Popen[bytes], deadline: float) -> str | None:
+        # Reads the pipe directly: select() cannot see lines already sitting in a file object's buffer
+        fd = process.stdout.fileno()
+        while b"\n" not in self._stdout:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0 or not select.select([fd], [], [], remaining)[0]:
+                logger.warning("X worker gave no answer within %ss", self.timeout_seconds)
+                return None
+            chunk = os.read(fd, 65536)
+            if not chunk:
+                return None
+            self._stdout += chunk
+        line, self._stdout = self._stdout.split(b"\n", 1)
+        return line.decode("utf-8", errors="replace")
+
+    def _kill(self) -> int | None:
+        # Returns the worker's own exit code, or None when it was still running and had to be killed
+        if self._process is None:
+            return None
+        process, self._process = self._process, None
+        try:
+            # A worker that closed stdout is usually exiting already
+            return process.wait(timeout=0.5)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            process.wait()
+            return None
+
+    def _run_once(self, query: str, max_results: int) -> object:
+        with tempfile.NamedTemporaryFile(suffix=".json", delete=False) as tf:
+            out_path = tf.name
+        try:
+            cmd = [self.python, self.script_path, "--query", query, "--max", str(max_results), "--no-retweets", "--out", out_path]
+            subprocess.run(cmd, check=True, capture_output=True, text=True, timeout=self.timeout_seconds)
+            with open(out_path) as f:
+                return json.load(f)
+        finally:
+            if os.path.exists(out_path):
+                os.unlink(out_path)
 
 
 class XSearchSource(Source):
-    def __init__(self, request_manager, requests_per_minute: int = 20, throttle_multiplier: float = 1.0) -> None:
+    def __init__(
+        self,
+        request_manager,
+        requests_per_minute: int = 20,
+        throttle_multiplier: float = 1.0,
+        script_path: str = X_SCRIPT_PATH,
+        python: str = X_PYTHON,
+    ) -> None:
         super().__init__("x", request_manager, requests_per_minute, throttle_multiplier)
+        self.script_path = script_path
+        self.python = python
 
     def fetch(self, keywords: list[str], config: dict) -> list[Lead]:
-        leads: list[Lead] = []
+        return list(self.iter_fetch(keywords, config))
+
+    def iter_fetch(self, keywords: list[str], config: dict) -> Iterator[Lead]:
         seen_urls: set[str] = set()
+        worker = XSearchWorker(self.script_path, python=self.python)
+        try:
+            for keyword in keywords:
+                self._wait_for_slot()
+                try:
+                    payload = worker.search(keyword)
+                except (subprocess.SubprocessError, OSError, RuntimeError) as exc:
+                    self.logger.warning("X script failed for keyword '%s': %s", keyword, exc)
+                    continue
+                except json.JSONDecodeError as exc:
+                    self.logger.warning("X script output parse failed for keyword '%s': %s", keyword, exc)
+                    continue
+                yield from self._leads(keyword, payload, seen_urls)
+        finally:
+            worker.close()
 
-        for keyword in keywords:
-            self._wait_for_slot()
-            with tempfile.NamedTemporaryFile(suffix=".json", delete=False) as tf:
-                out_path = tf.name
-            try:
-                cmd = [
-                    "python3",
-                    X_SCRIPT_PATH,
-                    "--query",
-                    keyword,
-                    "--max",
-                    "20",
-                    "--no-retweets",
-                    "--out",
-                    out_path,
-                ]
-                subprocess.run(cmd, check=True, capture_output=True, text=True)
-                with open(out_path) as f:
-                    payload = json.load(f)
-            except (subprocess.CalledProcessError, FileNotFoundError) as exc:
-                self.logger.warning("X script failed for keyword '%s': %s", keyword, exc)
-                continue
-            except (json.JSONDecodeError, OSError) as exc:
-                self.logger.warning("X script output parse failed for keyword '%s': %s", keyword, exc)
-                continue
-            finally:
-                if os.path.exists(out_path):
-                    os.unlink(out_path)
-
-            items = payload if isinstance(payload, list) else payload.get("results", payload.get("tweets", []))
-            for item in items:
-                url = item.get("url") or item.get("tweet_url") or ""
-                if not url or url in seen_urls:
+    def _leads(self, keyword: str, payload: object, seen_urls: set[str]) -> Iterator[Lead]:
+        items = payload if isinstance(payload, list) else payload.get("results", payload.get("tweets", []))
+        # The search script has no since-id option, so the cursor is applied to its output
+        cursor_key = keyword.lower()
+        since_id = self._cursor(cursor_key)
+        for item in items:
+            tweet_id = str(item.get("id") or "")
+            if tweet_id.isdigit():
+                self._advance_cursor(cursor_key, int(tweet_id))
+                if int(tweet_id) <= since_id:
                     continue
-                seen_urls.add(url)
-                text = item.get("text") or item.get("full_text") or ""
-                profile = item.get("profile_url") or ""
-                website = item.get("website") or ""
-                maybe_domain = extract_domain(website) or extract_domain(text) or domain_from_url(profile)
-                if maybe_domain.endswith("x.com") or maybe_domain.endswith("twitter.com"):
-                    maybe_domain = ""
-
-                lead = Lead(
-                    domain=maybe_domain,
-                    company=item.get("username") or item.get("author") or "unknown",
-                    source="x",
-                    evidence_url=url,
-                    pain_quote=short_snippet(text),
-                    source_item_id=str(item.get("id") or ""),
-                )
-                lead.keyword_hits.add(keyword.lower())
-                leads.append(lead)
-
-        return leads
+            url = item.get("url") or item.get("tweet_url") or ""
+            if not url or url in seen_urls:
+                continue
+            seen_urls.add(url)
+            text = item.get("text") or item.get("full_text") or ""
+            profile = item.get("profile_url") or ""
+            website = item.get("website") or ""
+            maybe_domain = extract_domain(website) or extract_domain(text) or domain_from_url(profile)
+
+            lead = Lead(
+                domain=maybe_domain,
+                company=item.get("username") or item.get("author") or "unknown",
+                source="x",
+                evidence_url=url,
+                pain_quote=short_snippet(text),
+                source_item_id=str(item.get("id") or ""),
+            )
+            lead.add_keyword_hit(keyword.lower())
+            yield lead
@@ -1,9 +1,24 @@
 from __future__ import annotations
 
 import json
-from datetime import datetime, timezone
+import threading
 from pathlib import Path
 
+from prospector.db import connect
+from prospector.domains import normalize_domain
+
+_SEEN_SCHEMA = """
+CREATE TABLE IF NOT EXISTS seen_domains (
+    domain TEXT PRIMARY KEY,
+    first_seen TEXT NOT NULL,
+    last_seen TEXT NOT NULL,
+    last_score INTEGER
+);
+"""
+
+# Bumped whenever normalize_domain changes, so stored keys are re-keyed once on open
+SEEN_KEY_VERSION = 1
+
 
 def load_seen_domains(path: str) -> dict[str, str]:
     state_path = Path(path)
@@ -18,18 +33,161 @@ def load_seen_domains(path: str) -> dict[str, str]:
     return {str(k): str(v) for k, v in data.items()}
 
 
-def save_seen_domains(path: str, seen_domains: dict[str, str]) -> None:
+class SeenDomainStore:
+    def __init__(self, path: str, legacy_json_path: str | None = None) -> None:
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = connect(path)
+        self._conn.executescript(_SEEN_SCHEMA)
+        if legacy_json_path:
+            self._migrate_json(legacy_json_path)
+        self._normalize_keys()
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def __contains__(self, domain: object) -> bool:
+        with self._lock:
+            row = self._conn.execute("SELECT 1 FROM seen_domains WHERE domain = ?", (domain,)).fetchone()
+        return row is not None
+
+    def __len__(self) -> int:
+        with self._lock:
+            return int(self._conn.execute("SELECT COUNT(*) FROM seen_domains").fetchone()[0])
+
+    def get(self, domain: str) -> str | None:
+        with self._lock:
+            row = self._conn.execute("SELECT first_seen FROM seen_domains WHERE domain = ?", (domain,)).fetchone()
+        return row[0] if row else None
+
+    def last_scores(self, domains: list[str]) -> dict[str, int]:
+        unique = list(dict.fromkeys(domains))
+        scores: dict[str, int] = {}
+        with self._lock:
+            # Chunked to stay under SQLite's bound-parameter limit
+            for start in range(0, len(unique), 500):
+                chunk = unique[start : start + 500]
+                rows = self._conn.execute(
+                    f"SELECT domain, last_score FROM seen_domains WHERE last_score IS NOT NULL AND domain IN ({', '.join('?' for _ in chunk)})",
+                    chunk,
+                ).fetchall()
+                scores.update({domain: int(score) for domain, score in rows})
+        return scores
+
+    def mark(self, entries: list[tuple[str, int | None]], date_value: str) -> None:
+        # first_seen is kept from the first insert; last_seen/last_score follow the latest sighting
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT INTO seen_domains (domain, first_seen, last_seen, last_score) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT(domain) DO UPDATE SET last_seen = excluded.last_seen, "
+                "last_score = COALESCE(excluded.last_score, seen_domains.last_score)",
+                [(domain, date_value, date_value, score) for domain, score in entries],
+            )
+
+    def reset(self) -> None:
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM seen_domains")
+
+    def _normalize_keys(self) -> None:
+        # Rows stored under raw hosts (app.foo.com) or older normalization rules are folded into
+        # the key dedup looks up now, keeping the earliest first_seen and the best last_score
+        with self._lock, self._conn:
+            if self._conn.execute("PRAGMA user_version").fetchone()[0] >= SEEN_KEY_VERSION:
+                return
+            rows = self._conn.execute("SELECT domain, first_seen, last_seen, last_score FROM seen_domains").fetchall()
+            moved = [(normalize_domain(domain), domain, first_seen, last_seen, score) for domain, first_seen, last_seen, score in rows]
+            moved = [row for row in moved if row[0] and row[0] != row[1]]
+            self._conn.executemany("DELETE FROM seen_domains WHERE domain = ?", [(row[1],) for row in moved])
+            self._conn.executemany(
+                "INSERT INTO seen_domains (domain, first_seen, last_seen, last_score) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT(domain) DO UPDATE SET first_seen = MIN(seen_domains.first_seen, excluded.first_seen), "
+                "last_seen = MAX(seen_domains.last_seen, excluded.last_seen), "
+                "last_score = MAX(COALESCE(seen_domains.last_score, excluded.last_score), COALESCE(excluded.last_score, seen_domains.last_score))",
+                [(key, first_seen, last_seen, score) for key, _, first_seen, last_seen, score in moved],
+            )
+            self._conn.execute(f"PRAGMA user_version = {SEEN_KEY_VERSION}")
+
+    def _migrate_json(self, json_path: str) -> None:
+        # One-shot import of the old JSON state; the file is renamed so it is never re-imported
+        legacy_path = Path(json_path)
+        if not legacy_path.exists():
+            return
+        seen = load_seen_domains(json_path)
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO seen_domains (domain, first_seen, last_seen, last_score) VALUES (?, ?, ?, NULL)",
+                [(normalize_domain(domain) or domain, first_seen, first_seen) for domain, first_seen in seen.items()],
+            )
+        legacy_path.replace(legacy_path.with_name(legacy_path.name + ".migrated"))
+
+
+def open_seen_domain_store(config: dict) -> SeenDomainStore:
+    state_cfg = config["state"]
+    return SeenDomainStore(state_cfg["seen_domains_db"], legacy_json_path=state_cfg["seen_domains_file"])
+
+
+def load_source_cursors(path: str) -> dict[str, dict[str, int]]:
     state_path = Path(path)
-    state_path.parent.mkdir(parents=True, exist_ok=True)
-    state_path.write_text(json.dumps(seen_domains, indent=2, sort_keys=True), encoding="utf-8")
+    if not state_path.exists():
+        return {}
+    try:
+        data = json.loads(state_path.read_text(encoding="utf-8"))
+    except json.JSONDecodeError:
+        return {}
+    if not isinstance(data, dict):
+        return {}
+    return {
+        str(source): {str(key): int(value) for key, value in cursors.items()}
+        for source, cursors in data.items()
+        if isinstance(cursors, dict)
+    }
 
 
-def mark_seen(path: str, domain: str) -> None:
-    seen = load_seen_domains(path)
-    if domain not in seen:
-        seen[domain] = datetime.now(timezone.utc).date().isoformat()
-        save_seen_domains(path, seen)
+def save_source_cursors(path: str, cursors: dict[str, dict[str, int]]) -> None:
+    _write_json_atomic(path, cursors)
 
 
-def reset_seen_domains(path: str) -> None:
-    save_seen_domains(path, {})
+def load_rate_limits(path: str) -> dict[str, dict[str, float]]:
+    state_path = Path(path)
+    if not state_path.exists():
+        return {}
+    try:
+        data = json.loads(state_path.read_text(encoding="utf-8"))
+    except json.JSONDecodeError:
+        return {}
+    if not isinstance(data, dict):
+        return {}
+    return {str(source): dict(state) for source, state in data.items() if isinstance(state, dict)}
+
+
+def save_rate_limits(path: str, states: dict[str, dict[str, float]]) -> None:
+    _write_json_atomic(path, states)
+
+
+def load_backfill_checkpoint(path: str) -> dict:
+    state_path = Path(path)
+    if not state_path.exists():
+        return {}
+    try:
+        data = json.loads(state_path.read_text(encoding="utf-8"))
+    except json.JSONDecodeError:
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def save_backfill_checkpoint(path: str, checkpoint: dict) -> None:
+    _write_json_atomic(path, checkpoint)
+
+
+def clear_backfill_checkpoint(path: str) -> None:
+    Path(path).unlink(missing_ok=True)
+
+
+def _write_json_atomic(path: str, data: dict) -> None:
+    state_path = Path(path)
+    state_path.parent.mkdir(parents=True, exist_ok=True)
+    # Write-then-rename so an interrupted run never leaves a half-written state file
+    tmp_path = state_path.with_suffix(state_path.suffix + ".tmp")
+    tmp_path.write_text(json.dumps(data, indent=2, sort_keys=True), encoding="utf-8")
+    tmp_path.replace(state_path)
@@ -0,0 +1,104 @@
+import asyncio
+
+import pytest
+
+httpx = pytest.importorskip("httpx")
+
+from prospector.async_http import AsyncRequestManager
+from prospector.enricher import AsyncEnrichmentExecutor, Enricher
+from prospector.http import HTML_CONTENT_TYPES, RequestManager
+from prospector.models import Lead
+
+
+def make_manager(handler, **kwargs) -> AsyncRequestManager:
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler), follow_redirects=True)
+    return AsyncRequestManager(client=client, backoff_seconds=(0, 0, 0), **kwargs)
+
+
+def test_async_manager_retries_like_sync() -> None:
+    calls = []
+
+    def handler(request):
+        calls.append(request.method)
+        if len(calls) == 1:
+            return httpx.Response(503)
+        return httpx.Response(200, json={"ok": True})
+
+    async def scenario():
+        manager = make_manager(handler)
+        try:
+            data = await manager.get_json("https://api.example.com/items")
+            status = await manager.head_status("https://api.example.com/docs")
+        finally:
+            await manager.aclose()
+        return data, status
+
+    data, status = asyncio.run(scenario())
+    assert data == {"ok": True}
+    assert status == 200
+    assert calls == ["GET", "GET", "HEAD"]
+
+
+def test_async_manager_gives_up_after_max_retries() -> None:
+    async def scenario():
+        manager = make_manager(lambda request: httpx.Response(500), max_retries=2)
+        try:
+            await manager.get_text("https://down.example.com/")
+        finally:
+            await manager.aclose()
+
+    with pytest.raises(RuntimeError, match="Request failed after retries"):
+        asyncio.run(scenario())
+
+
+def test_async_executor_enriches_each_domain_once() -> None:
+    fetched = []
+
+    def handler(request):
+        fetched.append(str(request.url))
+        if request.method == "HEAD":
+            return httpx.Response(200 if request.url.path == "/kb" else 404)
+        if request.url.path == "/about":
+            return httpx.Response(200, text="We are a small team of 3, based in Lisbon")
+        return httpx.Response(200, text="Intercom dashboard API integrations pricing")
+
+    enricher = Enricher(RequestManager(), async_request_manager=make_manager(handler))
+    executor = AsyncEnrichmentExecutor(enricher, concurrency=4)
+    leads = [Lead(domain="acme.com", company="Acme", source="reddit", evidence_url=str(i), pain_quote="") for i in range(5)]
+    leads.append(Lead(domain="", company="No domain", source="reddit", evidence_url="x", pain_quote=""))
+    try:
+        results = list(executor.run(leads))
+    finally:
+        executor.close()
+        enricher.close()
+
+    assert len(results) == 6
+    enriched = [lead for lead in results if lead.domain]
+    assert all(lead.support_stack == "intercom" for lead in enriched)
+    assert all(lead.team_size_signal == "small team of 3" for lead in enriched)
+    assert all(lead.docs_url == "https://acme.com/kb" for lead in enriched)
+    # The three pages plus at most the four docs probes, once for the whole domain
+    assert {"https://acme.com", "https://acme.com/about", "https://acme.com/team", "https://acme.com/kb"} <= set(fetched)
+    assert len(fetched) <= 7
+    assert enricher.stats == {"run_hits": 4, "store_hits": 0, "misses": 1}
+
+
+def test_async_get_text_caps_body_and_skips_content_types() -> None:
+    def handler(request):
+        if request.url.path.endswith(".pdf"):
+            return httpx.Response(200, headers={"Content-Type": "application/pdf"}, content=b"%PDF")
+        return httpx.Response(200, headers={"Content-Type": "text/html; charset=utf-8"}, content=("é" * 100_000).encode())
+
+    async def scenario():
+        manager = make_manager(handler)
+        try:
+            text = await manager.get_text("https://acme.com/", max_bytes=1001, content_types=HTML_CONTENT_TYPES)
+            with pytest.raises(RuntimeError, match="content type"):
+                await manager.get_text("https://acme.com/deck.pdf", content_types=HTML_CONTENT_TYPES)
+        finally:
+            await manager.aclose()
+        return text
+
+    text = asyncio.run(scenario())
+    # The cap splits the last two-byte character, which decodes as one replacement
+    assert text == "é" * 500 + "�"
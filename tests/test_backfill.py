@@ -0,0 +1,117 @@
+import csv
+import json
+from datetime import date
+from pathlib import Path
+
+import requests
+
+from prospector.backfill import checkpoint_path, run_backfill
+from prospector.config import load_config
+
+CONFIG = """
+icp:
+  name: Test ICP
+  pain_keywords: ["support is killing me"]
+  exclude_keywords: []
+  scoring:
+    pain_signal_present: 30
+    b2b_saas_signals: 25
+    small_team_signals: 20
+    helpdesk_stack_detected: 15
+    docs_present: 10
+sources:
+  reddit:
+    subreddits: [SaaS]
+  hacker_news: true
+  hacker_news_requests_per_minute: 60000
+output:
+  google_sheets:
+    enabled: false
+  csv:
+    enabled: true
+    path: {root}/leads.csv
+  summary:
+    enabled: false
+state:
+  seen_domains_file: {root}/state/seen_domains.json
+cache:
+  mode: "off"
+"""
+
+
+class FakeResponse:
+    def __init__(self, payload: dict):
+        self.status_code = 200
+        self.payload = payload
+        self.text = json.dumps(payload)
+        self.content = self.text.encode()
+        self.headers = {}
+
+    def raise_for_status(self) -> None:
+        return None
+
+    def json(self) -> dict:
+        return self.payload
+
+
+def _hits(start: int, count: int) -> list[dict]:
+    return [
+        {"objectID": str(i), "created_at_i": 1767300000 - i, "comment_text": "support is killing me", "author": f"user{i}"}
+        for i in range(start, start + count)
+    ]
+
+
+def test_backfill_checkpoints_and_resumes(tmp_path: Path, monkeypatch) -> None:
+    cfg_path = tmp_path / "icp.yaml"
+    cfg_path.write_text(CONFIG.format(root=tmp_path), encoding="utf-8")
+    urls: list[str] = []
+    fail_second_page = {"on": True}
+
+    def fake_request(self, method, url, timeout=10, **kwargs):
+        urls.append(url)
+        if "created_at_i%3C" not in url:
+            return FakeResponse({"hits": _hits(0, 100)})
+        if fail_second_page["on"]:
+            raise requests.ConnectionError("NameResolutionError: offline")
+        return FakeResponse({"hits": _hits(100, 10)})
+
+    monkeypatch.setattr(requests.Session, "request", fake_request)
+
+    first = run_backfill(str(cfg_path), "hacker_news", since=date(2026, 1, 1))
+    assert first["completed"] is False
+    assert first["pages"] == 1
+    state_path = checkpoint_path(load_config(str(cfg_path)), "hacker_news")
+    positions = json.loads(Path(state_path).read_text())["positions"]
+    assert list(positions.values()) == [1767300000 - 99]
+
+    fail_second_page["on"] = False
+    urls.clear()
+    second = run_backfill(str(cfg_path), "hacker_news", since=date(2026, 1, 1))
+    assert second["completed"] is True
+    assert second["pages"] == 1
+    assert "created_at_i%3C%3D1767299901" in urls[0]
+    assert not Path(state_path).exists()
+
+
+def test_backfill_rescores_companies_that_reappear_on_a_later_page(tmp_path: Path, monkeypatch) -> None:
+    cfg_path = tmp_path / "icp.yaml"
+    cfg_path.write_text(CONFIG.format(root=tmp_path), encoding="utf-8")
+    first_page, second_page = _hits(0, 100), _hits(100, 10)
+    for hit in first_page + second_page:
+        hit["url"] = f"https://site{hit['objectID']}.com"
+    first_page[0]["url"] = "https://acme.com/a"
+    second_page[0]["url"] = "https://acme.com/b"
+    second_page[0]["comment_text"] = "support is killing me, our saas dashboard api, founder here"
+
+    def fake_request(self, method, url, timeout=10, **kwargs):
+        return FakeResponse({"hits": second_page if "created_at_i%3C" in url else first_page})
+
+    monkeypatch.setattr(requests.Session, "request", fake_request)
+    result = run_backfill(str(cfg_path), "hacker_news", since=date(2026, 1, 1))
+
+    # The acme copy on page two is merged, so it counts as discarded there and its company as reopened
+    assert (result["pages"], result["fetched"], result["kept"], result["discarded"], result["reopened"]) == (2, 110, 109, 1, 1)
+    with open(tmp_path / "leads.csv", newline="", encoding="utf-8") as handle:
+        rows = [row for row in csv.DictReader(handle) if row["Website"] == "acme.com"]
+    assert [row["Status"] for row in rows] == ["New", "Updated"]
+    assert int(rows[1]["Fit Score"]) - int(rows[0]["Fit Score"]) > 15
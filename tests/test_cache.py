@@ -0,0 +1,69 @@
+import time
+from pathlib import Path
+
+import requests
+
+from prospector.cache import CacheEntry, ResponseCache, cache_key
+from prospector.http import RequestManager
+
+
+class FakeResponse:
+    def __init__(self, content: bytes, status_code: int = 200, headers: dict | None = None):
+        self.content = content
+        self.status_code = status_code
+        self.headers = headers or {}
+        self.encoding = "utf-8"
+        self.apparent_encoding = "utf-8"
+
+    def raise_for_status(self) -> None:
+        if self.status_code >= 400:
+            raise requests.HTTPError("bad status")
+
+
+def test_cache_key_ignores_param_order() -> None:
+    assert cache_key("GET", "https://x", {"a": 1, "b": 2}) == cache_key("get", "https://x", {"b": 2, "a": 1})
+    assert cache_key("GET", "https://x", {"a": 1}) != cache_key("GET", "https://x", {"a": 2})
+
+
+def test_cache_evicts_least_recently_used(tmp_path: Path) -> None:
+    cache = ResponseCache(str(tmp_path / "cache.sqlite3"), max_size_mb=1)
+    chunk = b"x" * (400 * 1024)
+    for key in ["a", "b"]:
+        cache.store(key, key, CacheEntry(body=chunk, expires_at=time.time() + 60))
+    cache.lookup("a")
+    cache.store("c", "c", CacheEntry(body=chunk, expires_at=time.time() + 60))
+
+    assert cache.lookup("b") is None
+    assert cache.lookup("a") is not None
+    assert cache.lookup("c") is not None
+
+
+def test_request_manager_serves_fresh_and_revalidates_stale(tmp_path: Path, monkeypatch) -> None:
+    calls: list[dict] = []
+
+    def fake_request(self, method, url, timeout=10, **kwargs):
+        calls.append(kwargs.get("headers") or {})
+        if (kwargs.get("headers") or {}).get("If-None-Match") == '"v1"':
+            return FakeResponse(b"", status_code=304)
+        return FakeResponse(b'{"hits": [1]}', headers={"ETag": '"v1"'})
+
+    monkeypatch.setattr(requests.Session, "request", fake_request)
+    cache = ResponseCache(str(tmp_path / "cache.sqlite3"))
+    manager = RequestManager(cache=cache, cache_ttl_seconds=60)
+
+    assert manager.get_json("https://hn.test/search", params={"q": "a"}) == {"hits": [1]}
+    assert manager.get_json("https://hn.test/search", params={"q": "a"}) == {"hits": [1]}
+    assert len(calls) == 1
+
+    cache.touch(cache_key("GET", "https://hn.test/search", {"q": "a"}), expires_at=0)
+    assert manager.get_json("https://hn.test/search", params={"q": "a"}) == {"hits": [1]}
+    assert len(calls) == 2
+    assert calls[1]["If-None-Match"] == '"v1"'
+
+
+def test_refresh_mode_skips_reads_but_writes(tmp_path: Path) -> None:
+    path = str(tmp_path / "cache.sqlite3")
+    ResponseCache(path, mode="refresh").store("k", "u", CacheEntry(body=b"1", expires_at=time.time() + 60))
+
+    assert ResponseCache(path, mode="refresh").lookup("k") is None
+    assert ResponseCache(path, mode="use").lookup("k").body == b"1"
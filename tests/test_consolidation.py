@@ -0,0 +1,72 @@
+from prospector.consolidation import LeadConsolidator
+from prospector.models import Lead
+from prospector.scorer import Scorer
+
+
+def make_lead(domain: str, source: str, url: str, quote: str, keyword: str) -> Lead:
+    lead = Lead(domain=domain, company="Acme", source=source, evidence_url=url, pain_quote=quote)
+    lead.add_keyword_hit(keyword)
+    return lead
+
+
+def test_consolidator_merges_copies_before_scoring() -> None:
+    consolidator = LeadConsolidator()
+    first = make_lead("acme.com", "reddit", "https://reddit.com/1", "support tickets pile up", "support")
+    second = make_lead("www.Acme.com", "hacker_news", "https://news.ycombinator.com/2", "our api dashboard pricing", "docs")
+    third = make_lead("acme.com", "reddit", "https://reddit.com/1", "support tickets pile up", "support")
+
+    assert consolidator.add(first) is first
+    assert consolidator.add(second) is None
+    assert consolidator.add(third) is None
+
+    assert first.keyword_hits == {"support", "docs"}
+    assert first.pain_quote == "support tickets pile up | our api dashboard pricing"
+    assert first.notes == "also seen on hacker_news: https://news.ycombinator.com/2"
+    assert consolidator.merged == 2
+
+    # The merged quote now carries enough B2B terms to count
+    Scorer({"pain_signal_present": 20, "b2b_saas_signals": 25, "small_team_signals": 15, "helpdesk_stack_detected": 20, "docs_present": 10}).score(first)
+    assert first.b2b_signal_count == 3
+
+
+def test_consolidator_reopens_settled_leads_for_late_copies() -> None:
+    consolidator = LeadConsolidator()
+    lead = make_lead("acme.com", "reddit", "https://reddit.com/1", "q", "k")
+    consolidator.add(lead)
+    consolidator.settle(lead)
+    assert consolidator.take_reopened() == []
+
+    late = make_lead("acme.com", "x", "https://x.com/a/status/1", "late quote", "other")
+    assert consolidator.add(late) is None
+    assert lead.keyword_hits == {"k", "other"}
+    assert lead.pain_quote == "q | late quote"
+    assert consolidator.take_reopened() == [lead]
+    assert consolidator.take_reopened() == []
+
+
+def test_consolidator_keys_domainless_leads_by_evidence_url() -> None:
+    consolidator = LeadConsolidator()
+    a = make_lead("", "reddit", "https://reddit.com/1", "q", "one")
+    b = make_lead("", "reddit", "https://reddit.com/1", "q", "two")
+    c = make_lead("", "reddit", "https://reddit.com/2", "q", "one")
+
+    assert consolidator.add(a) is a
+    assert consolidator.add(b) is None
+    assert consolidator.add(c) is c
+    assert a.keyword_hits == {"one", "two"}
+
+
+def test_consolidator_forgets_the_least_recently_touched_settled_lead() -> None:
+    consolidator = LeadConsolidator(max_settled=2)
+    leads = [make_lead(f"site{i}.com", "reddit", f"https://reddit.com/{i}", "q", "k") for i in range(3)]
+    for lead in leads[:2]:
+        consolidator.add(lead)
+        consolidator.settle(lead)
+    # A late copy of site0 makes it the most recent, so settling site2 evicts site1
+    consolidator.add(make_lead("site0.com", "x", "https://x.com/a/status/0", "q", "k"))
+    consolidator.add(leads[2])
+    consolidator.settle(leads[2])
+
+    late = make_lead("site1.com", "x", "https://x.com/a/status/1", "q", "k")
+    assert consolidator.add(late) is late
+    assert consolidator.take_reopened() == [leads[0]]
@@ -1,5 +1,8 @@
+import json
+
 from prospector.deduplicator import Deduplicator
 from prospector.models import Lead
+from prospector.state import SeenDomainStore, load_source_cursors, save_source_cursors
 
 
 def test_deduplicator_blocks_seen() -> None:
@@ -18,3 +21,42 @@ def test_deduplicator_allows_new() -> None:
     new_leads, skipped = deduper.split_new_and_seen([lead])
     assert len(new_leads) == 1
     assert len(skipped) == 0
+
+
+def test_seen_domain_store_migrates_json_and_tracks_scores(tmp_path) -> None:
+    legacy = tmp_path / "seen_domains.json"
+    legacy.write_text(json.dumps({"old.com": "2026-01-01"}), encoding="utf-8")
+    store = SeenDomainStore(str(tmp_path / "seen_domains.sqlite3"), legacy_json_path=str(legacy))
+
+    assert "old.com" in store
+    assert store.get("old.com") == "2026-01-01"
+    assert not legacy.exists()
+
+    deduper = Deduplicator(store)
+    first = Lead(domain="acme.com", company="Acme", source="reddit", evidence_url="x", pain_quote="y", fit_score=50)
+    deduper.mark([first], "2026-02-01")
+    assert store.last_scores(["acme.com", "old.com"]) == {"acme.com": 50}
+
+    again = Lead(domain="acme.com", company="Acme", source="hn", evidence_url="x", pain_quote="y", fit_score=60)
+    better = Lead(domain="acme.com", company="Acme", source="hn", evidence_url="x", pain_quote="y", fit_score=70)
+    new_leads, skipped = deduper.split_new_and_seen([again, better])
+    assert new_leads == [better]
+    assert skipped == [again]
+
+    deduper.mark(new_leads, "2026-03-01")
+    assert store.get("acme.com") == "2026-02-01"
+    assert store.last_scores(["acme.com"]) == {"acme.com": 70}
+
+    # A migrated domain has no stored score, so no score counts as an improvement
+    migrated = Lead(domain="old.com", company="Old", source="hn", evidence_url="x", pain_quote="y", fit_score=90)
+    assert deduper.split_new_and_seen([migrated]) == ([], [migrated])
+    store.close()
+
+
+def test_state_files_are_replaced_whole(tmp_path) -> None:
+    path = tmp_path / "state" / "source_cursors.json"
+    save_source_cursors(str(path), {"reddit": {"SaaS": 5}})
+    save_source_cursors(str(path), {"reddit": {"SaaS": 7}})
+
+    assert load_source_cursors(str(path)) == {"reddit": {"SaaS": 7}}
+    assert [p.name for p in path.parent.iterdir()] == ["source_cursors.json"]
@@ -0,0 +1,73 @@
+from prospector.deduplicator import Deduplicator
+from prospector.domains import domain_from_url, extract_domain, iter_domains, normalize_domain, registrable_domain
+from prospector.models import Lead
+from prospector.state import SeenDomainStore
+
+
+def test_normalize_domain_collapses_to_registrable_domain() -> None:
+    assert normalize_domain("https://App.Foo.com:443/pricing?x=1") == "foo.com"
+    assert normalize_domain("blog.foo.com") == "foo.com"
+    assert normalize_domain("www.foo.co.uk") == "foo.co.uk"
+    assert normalize_domain("foo.com.") == "foo.com"
+    # Private suffixes keep tenants apart
+    assert normalize_domain("acme.vercel.app") == "acme.vercel.app"
+    assert normalize_domain("docs.acme.github.io") == "acme.github.io"
+
+
+def test_normalize_domain_rejects_junk() -> None:
+    for junk in ["co.uk", "localhost", "10.0.0.1", "foo.notatld", "", "a..com"]:
+        assert normalize_domain(junk) == ""
+
+
+def test_registrable_domain_handles_wildcard_and_exception_rules() -> None:
+    # *.ck is a public suffix, except www.ck
+    assert registrable_domain("shop.acme.co.ck") == "acme.co.ck"
+    assert registrable_domain("www.ck") == "www.ck"
+
+
+def test_extract_domain_skips_non_domains() -> None:
+    text = "e.g. v1.2.3 broke main.py and index.html, node.js too; we moved to https://app.acme.io/login"
+    assert extract_domain(text) == "acme.io"
+    assert list(iter_domains("see www.tool.py, acme.com and reddit.com, then blog.acme.com")) == ["tool.py", "acme.com", "acme.com"]
+
+
+def test_platform_urls_are_not_company_domains() -> None:
+    assert domain_from_url("https://old.reddit.com/r/SaaS") == ""
+    assert domain_from_url("https://x.com/founder") == ""
+    assert domain_from_url("https://fox.com") == "fox.com"
+    assert domain_from_url("https://medium.com/@founder/post") == ""
+
+
+def test_hosting_platform_tenants_stay_distinct() -> None:
+    assert normalize_domain("https://www.foo.substack.com/p/launch") == "foo.substack.com"
+    assert normalize_domain("bar.notion.site") == "bar.notion.site"
+    assert normalize_domain("shop.gumroad.com") != normalize_domain("other.gumroad.com")
+    assert extract_domain("our app lives at acme.bubbleapps.io") == "acme.bubbleapps.io"
+
+
+def test_deduplicator_treats_subdomains_as_one_company() -> None:
+    seen: dict[str, str] = {}
+    deduper = Deduplicator(seen)
+    deduper.mark([Lead(domain="app.acme.com", company="c", source="reddit", evidence_url="x", pain_quote="y")], "2026-01-01")
+
+    new, skipped = deduper.split_new_and_seen(
+        [Lead(domain="acme.com:443", company="c", source="hn", evidence_url="y", pain_quote="z")], previous_scores={}
+    )
+
+    assert seen == {"acme.com": "2026-01-01"}
+    assert not new and len(skipped) == 1
+
+
+def test_seen_store_rekeys_stored_hosts_to_normalized_domains(tmp_path) -> None:
+    path = str(tmp_path / "seen.sqlite3")
+    store = SeenDomainStore(path)
+    store._conn.execute("PRAGMA user_version = 0")
+    store.mark([("app.acme.com", 40), ("acme.com", None), ("www.foo.substack.com", 70)], "2026-02-01")
+    store.mark([("blog.acme.com", 60)], "2026-01-01")
+    store.close()
+
+    store = SeenDomainStore(path)
+    assert store.get("acme.com") == "2026-01-01"
+    assert store.last_scores(["acme.com", "foo.substack.com", "app.acme.com"]) == {"acme.com": 60, "foo.substack.com": 70}
+    assert len(store) == 2
+    store.close()
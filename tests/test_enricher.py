@@ -1,6 +1,10 @@
+import threading
+import time
+
 import requests
 
-from prospector.enricher import Enricher
+from prospector.enricher import EnrichmentExecutor, Enricher
+from prospector.enrichment_store import EnrichmentStore
 from prospector.http import RequestManager
 from prospector.models import Lead
 
@@ -8,7 +12,18 @@ from prospector.models import Lead
 class FakeResponse:
     def __init__(self, text: str, status_code: int = 200):
         self.text = text
+        self.content = text.encode()
+        self.headers = {}
         self.status_code = status_code
+        self.encoding = "utf-8"
+        self.url = ""
+
+    def iter_content(self, chunk_size=1):
+        for start in range(0, len(self.content), chunk_size):
+            yield self.content[start : start + chunk_size]
+
+    def close(self) -> None:
+        pass
 
     def raise_for_status(self) -> None:
         if self.status_code >= 400:
@@ -19,22 +34,172 @@ class FakeResponse:
 
 
 def test_enricher_detects_stack(monkeypatch) -> None:
-    def fake_get(url, timeout=10, **kwargs):
+    def fake_request(self, method, url, timeout=10, **kwargs):
+        if method == "HEAD":
+            return FakeResponse("", 200 if url.endswith("/docs") else 404)
         return FakeResponse("Intercom dashboard API integrations pricing founder small team", 200)
 
-    def fake_head(url, timeout=10, **kwargs):
-        if url.endswith("/docs"):
-            return FakeResponse("", 200)
-        return FakeResponse("", 404)
-
-    monkeypatch.setattr(requests, "get", fake_get)
-    monkeypatch.setattr(requests, "head", fake_head)
+    monkeypatch.setattr(requests.Session, "request", fake_request)
 
     enricher = Enricher(RequestManager(timeout_seconds=10))
     lead = Lead(domain="acme.com", company="Acme", source="reddit", evidence_url="x", pain_quote="y")
     enricher.enrich(lead)
 
     assert lead.support_stack == "intercom"
-    # docs_url check removed — _find_docs_url was dropped (4 HEAD reqs per lead, too expensive)
-    assert lead.docs_url == ""
+    # Nothing linked from the homepage, so the HEAD probes find it
+    assert lead.docs_url == "https://acme.com/docs"
     assert lead.b2b_signal_count >= 3
+
+
+def test_docs_probes_waiting_on_the_host_slot_skip_once_one_answered(monkeypatch) -> None:
+    heads: list[str] = []
+
+    def fake_request(self, method, url, timeout=10, **kwargs):
+        if method == "HEAD":
+            heads.append(url)
+            time.sleep(0.05)
+            return FakeResponse("", 200)
+        return FakeResponse("Intercom dashboard", 200)
+
+    monkeypatch.setattr(requests.Session, "request", fake_request)
+
+    enricher = Enricher(RequestManager(timeout_seconds=10), max_per_host=1)
+    lead = Lead(domain="acme.com", company="Acme", source="reddit", evidence_url="x", pain_quote="y")
+    enricher.enrich(lead)
+    enricher.close()
+
+    # Every path would answer, but the probes queued behind the first one never send their HEAD
+    assert len(heads) == 1 and lead.docs_url == heads[0]
+
+
+def test_enricher_reads_docs_link_without_probing(monkeypatch) -> None:
+    methods = []
+
+    def fake_request(self, method, url, timeout=10, **kwargs):
+        methods.append(method)
+        return FakeResponse('<a href="/pricing">Pricing</a> <a href="https://docs.acme.com/start?ref=nav">Docs</a>', 200)
+
+    monkeypatch.setattr(requests.Session, "request", fake_request)
+
+    enricher = Enricher(RequestManager(timeout_seconds=10))
+    lead = enricher.enrich(Lead(domain="acme.com", company="Acme", source="reddit", evidence_url="x", pain_quote="y"))
+    enricher.close()
+
+    assert lead.docs_url == "https://docs.acme.com"
+    assert "HEAD" not in methods
+
+
+def test_linked_docs_url_ignores_other_sites() -> None:
+    hrefs = ["https://github.com/acme/docs", "https://help.other.com", "/help/faq#top"]
+    assert Enricher._linked_docs_url("https://www.acme.com", hrefs) == "https://www.acme.com/help/faq"
+    assert Enricher._linked_docs_url("https://acme.com", ["mailto:support@acme.com"]) == ""
+
+
+def test_enricher_reads_signals_from_visible_text_and_script_hosts(monkeypatch) -> None:
+    page = (
+        "<html><head><script src='https://cdn.example.net/app.js?api=dashboard'></script>"
+        "<script>var s='https:\\/\\/client.crisp.chat/l.js'; window.config={pricing:1,team:2};</script>"
+        "<style>.api-dashboard{}</style></head>"
+        "<body><h1>Integrations for indie shops</h1><p>See our pricing.</p></body></html>"
+    )
+    monkeypatch.setattr(requests.Session, "request", lambda self, method, url, timeout=10, **kwargs: FakeResponse(page, 200))
+
+    enricher = Enricher(RequestManager(timeout_seconds=10, max_retries=1))
+    lead = enricher.enrich(Lead(domain="acme.com", company="Acme", source="reddit", evidence_url="x", pain_quote="y"))
+    enricher.close()
+
+    assert lead.support_stack == "crisp"
+    # "api", "dashboard" and "team" only appear inside scripts/styles
+    assert lead.b2b_signal_count == 2
+    assert lead.small_team_signal_count == 1
+
+
+class SlowRequestManager(RequestManager):
+    def __init__(self, delay: float):
+        super().__init__(timeout_seconds=3)
+        self.delay = delay
+        self.in_flight: dict[str, int] = {}
+        self.peak: dict[str, int] = {}
+        self.lock = threading.Lock()
+
+    def stream_text(self, url, headers=None, max_bytes=None, content_types=None):
+        host = url.split("/")[2]
+        with self.lock:
+            self.in_flight[host] = self.in_flight.get(host, 0) + 1
+            self.peak[host] = max(self.peak.get(host, 0), self.in_flight[host])
+        time.sleep(self.delay)
+        with self.lock:
+            self.in_flight[host] -= 1
+        yield "dashboard api pricing"
+
+    def head_status(self, url, headers=None):
+        return 404
+
+
+def test_enrichment_executor_runs_leads_in_parallel() -> None:
+    manager = SlowRequestManager(delay=0.1)
+    enricher = Enricher(manager, max_per_host=2, page_workers=24)
+    leads = [Lead(domain=f"site{i}.com", company="c", source="reddit", evidence_url="x", pain_quote="y") for i in range(8)]
+
+    executor = EnrichmentExecutor(enricher, workers=8)
+    started = time.monotonic()
+    done = list(executor.run(leads))
+    elapsed = time.monotonic() - started
+    executor.close()
+    enricher.close()
+
+    assert len(done) == 8
+    assert all(lead.b2b_signal_count == 3 for lead in done)
+    # 3 pages per host at 2 in flight per host = two rounds, not 8 leads x 3 pages serially
+    assert elapsed < 0.6
+    assert max(manager.peak.values()) <= 2
+
+
+def test_enricher_scrapes_each_domain_once(tmp_path) -> None:
+    manager = SlowRequestManager(delay=0)
+    store = EnrichmentStore(str(tmp_path / "enrichment.sqlite3"), max_age_days=14)
+    enricher = Enricher(manager, store=store)
+    leads = [Lead(domain="acme.com", company="c", source=src, evidence_url="x", pain_quote="y") for src in ["reddit", "hn", "x"]]
+
+    for lead in leads:
+        enricher.enrich(lead)
+
+    assert enricher.stats == {"run_hits": 2, "store_hits": 0, "misses": 1}
+    assert all(lead.b2b_signal_count == 3 for lead in leads)
+
+    next_run = Enricher(manager, store=store)
+    lead = next_run.enrich(Lead(domain="acme.com", company="c", source="hn", evidence_url="x", pain_quote="y"))
+    assert next_run.stats["store_hits"] == 1
+    assert lead.b2b_signal_count == 3
+    enricher.close()
+    next_run.close()
+
+
+class ChunkedRequestManager(RequestManager):
+    # Streams a long page in small decoded chunks and records how much of it was pulled
+    def __init__(self):
+        super().__init__()
+        self.pulled = 0
+        self.closed = False
+
+    def stream_text(self, url, headers=None, max_bytes=None, content_types=None):
+        try:
+            yield "<p>dashboard api pricing</p>"
+            while True:
+                self.pulled += 1
+                yield "<p>" + "x" * 1000 + "</p>"
+        finally:
+            self.closed = True
+
+
+def test_fetch_page_parses_the_stream_without_joining_it() -> None:
+    manager = ChunkedRequestManager()
+    enricher = Enricher(manager, max_page_bytes=10_000)
+
+    page = enricher._fetch_page("https://acme.com/")
+    enricher.close()
+
+    assert page.truncated and "dashboard api pricing" in page.text
+    # Stopped pulling at the page budget and closed the stream, instead of draining it first
+    assert manager.pulled <= 11
+    assert manager.closed
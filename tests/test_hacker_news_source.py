@@ -0,0 +1,90 @@
+import re
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+
+from prospector.http import RequestManager
+from prospector.sources.base import BACKFILL_DONE
+from prospector.sources.hacker_news import PER_KEYWORD_RESULTS, HackerNewsSource
+
+
+class AlgoliaRequestManager(RequestManager):
+    # search_by_date stand-in: implicit AND over the query words, any word with optionalWords,
+    # created_at_i numeric filters, newest first
+    def __init__(self, hits):
+        super().__init__(timeout_seconds=10)
+        self.hits = sorted(hits, key=lambda hit: hit["created_at_i"], reverse=True)
+        self.urls = []
+
+    def get_json(self, url, params=None, headers=None):
+        self.urls.append(url)
+        query = parse_qs(urlparse(url).query)
+        words = set(query["query"][0].split())
+        any_word = "optionalWords" in query
+        filters = query.get("numericFilters", [""])[0]
+        after = int(re.search(r"created_at_i>(\d+)", filters).group(1)) if "created_at_i>" in filters else 0
+        before = int(re.search(r"created_at_i<=(\d+)", filters).group(1)) if "created_at_i<=" in filters else 0
+
+        def matches(hit):
+            text = set(hit["comment_text"].split())
+            return (bool(words & text) if any_word else words <= text) and (not after or hit["created_at_i"] > after) and (not before or hit["created_at_i"] <= before)
+
+        return {"hits": [hit for hit in self.hits if matches(hit)][: int(query["hitsPerPage"][0])]}
+
+
+def _hits() -> list[dict]:
+    hits = []
+
+    def add(text, count, newest):
+        for i in range(count):
+            hits.append({"objectID": str(len(hits)), "created_at_i": newest - i * 10, "comment_text": text, "author": "a"})
+
+    # Any-word matching lets "support" noise fill the shared pages
+    add("our support inbox is fine", 500, 1_700_100_000)
+    add("support is killing me", 60, 1_700_000_000)
+    add("intercom too expensive", 5, 1_690_000_000)
+    add("help docs are a mess", 25, 1_680_000_000)
+    return hits
+
+
+def test_hn_batched_recall_matches_per_keyword_queries() -> None:
+    keywords = ["support is killing me", "intercom too expensive", "help docs are a mess"]
+    hits = _hits()
+    manager = AlgoliaRequestManager(hits)
+    leads = HackerNewsSource(manager, requests_per_minute=99999).fetch(keywords, {})
+    found = {lead.source_item_id: lead.keyword_hits for lead in leads}
+
+    # What one query per keyword (implicit AND, old page size) returned
+    for keyword in keywords:
+        expected = [hit["objectID"] for hit in hits if set(keyword.split()) <= set(hit["comment_text"].split())][:PER_KEYWORD_RESULTS]
+        assert expected
+        assert all(keyword in found.get(object_id, set()) for object_id in expected), keyword
+    # Noise that only shares a word with a keyword is attributed to nothing
+    assert all(hits[int(object_id)]["comment_text"] != "our support inbox is fine" for object_id in found)
+
+
+def test_hn_backfill_keeps_items_sharing_the_page_boundary_second() -> None:
+    text = "support is killing me"
+    # 95 distinct seconds, then 30 comments in one second straddling the 100-item page edge
+    hits = [{"objectID": str(i), "created_at_i": 1_700_000_000 - i, "comment_text": text} for i in range(95)]
+    hits += [{"objectID": f"tie{i}", "created_at_i": 1_699_999_000, "comment_text": text} for i in range(30)]
+    hits += [{"objectID": f"old{i}", "created_at_i": 1_699_000_000 - i, "comment_text": text} for i in range(20)]
+    source = HackerNewsSource(AlgoliaRequestManager(hits), requests_per_minute=99999)
+    positions = {}
+
+    pages = list(source.backfill([text], {}, since=1_600_000_000, positions=positions))
+
+    ids = [lead.source_item_id for page in pages for lead in page]
+    assert sorted(ids) == sorted(hit["objectID"] for hit in hits)
+    assert list(positions.values()) == [BACKFILL_DONE]
+
+
+def test_hn_backfill_stops_with_an_error_on_missing_timestamps() -> None:
+    hits = [{"objectID": str(i), "created_at_i": 1_700_000_000 - i, "comment_text": "support is killing me"} for i in range(100)]
+    hits[-1]["created_at_i"] = 0
+    source = HackerNewsSource(AlgoliaRequestManager(hits), requests_per_minute=99999)
+    positions = {}
+
+    with pytest.raises(RuntimeError, match="no timestamp"):
+        list(source.backfill(["support is killing me"], {}, since=0, positions=positions))
+    assert positions == {}
@@ -0,0 +1,73 @@
+import csv
+
+import pytest
+
+from prospector.history import LeadHistory
+from prospector.models import Lead
+from prospector.outputs.csv_writer import HEADERS, read_leads_csv, score_key, write_leads_csv, write_rescored_csv
+
+
+def _lead(domain: str, source: str, score: int, date_found: str) -> Lead:
+    lead = Lead(domain=domain, company="c", source=source, evidence_url="x", pain_quote="y", fit_score=score, date_found=date_found)
+    lead.b2b_signal_count = 3
+    lead.keyword_variant_hits = {"a", "b"}
+    return lead
+
+
+def test_history_imports_csv_and_answers_queries(tmp_path) -> None:
+    csv_path = tmp_path / "leads.csv"
+    write_leads_csv(str(csv_path), [_lead("old.com", "hn", 45, "2026-01-01")])
+
+    history = LeadHistory(str(tmp_path / "leads.sqlite3"), legacy_csv_path=str(csv_path))
+    history.write([_lead("a.com", "reddit", 80, "2026-02-01"), _lead("b.com", "reddit", 10, "2026-03-01")])
+
+    assert len(history) == 3
+    assert history.band_counts() == {"High": 1, "Medium": 1, "Low": 1}
+    assert history.source_counts() == {"hn": 1, "reddit": 2}
+    assert history.date_range() == ("2026-01-01", "2026-03-01")
+    top = history.top(1)[0]
+    assert (top.domain, top.b2b_signal_count, top.keyword_variant_hits) == ("a.com", 3, {"a", "b"})
+    history.close()
+
+    # The CSV is only imported into an empty history
+    reopened = LeadHistory(str(tmp_path / "leads.sqlite3"), legacy_csv_path=str(csv_path))
+    assert len(reopened) == 3
+    reopened.close()
+
+
+def test_rescore_skips_rows_imported_from_csv(tmp_path) -> None:
+    csv_path = tmp_path / "leads.csv"
+    write_leads_csv(str(csv_path), [_lead("old.com", "hn", 45, "2026-01-01")])
+    history = LeadHistory(str(tmp_path / "leads.sqlite3"), legacy_csv_path=str(csv_path))
+    history.write([_lead("a.com", "reddit", 80, "2026-02-01")])
+
+    assert history.unscorable_count() == 1
+    batches = list(history.iter_batches(scorable_only=True))
+    assert [lead.domain for _, leads in batches for lead in leads] == ["a.com"]
+    assert len([lead for _, leads in history.iter_batches() for lead in leads]) == 2
+    history.close()
+
+
+def test_rescored_csv_keeps_edits_and_input(tmp_path) -> None:
+    csv_path = tmp_path / "leads.csv"
+    write_leads_csv(str(csv_path), [_lead("old.com", "hn", 45, "2026-01-01"), _lead("a.com", "reddit", 80, "2026-02-01")])
+    # Hand edits in the CSV
+    rows = read_leads_csv(str(csv_path))
+    for row in rows:
+        row["Status"], row["Notes"] = "Contacted", "call back friday"
+    with csv_path.open("w", encoding="utf-8", newline="") as handle:
+        writer = csv.DictWriter(handle, fieldnames=HEADERS)
+        writer.writeheader()
+        writer.writerows(rows)
+
+    out_path = tmp_path / "rescored.csv"
+    changed = write_rescored_csv(str(csv_path), str(out_path), {score_key("2026-02-01", "a.com", "x"): 55})
+    assert changed == 1
+    rescored = read_leads_csv(str(out_path))
+    assert [(row["Website"], row["Fit Score"], row["Status"], row["Notes"]) for row in rescored] == [
+        ("old.com", "45", "Contacted", "call back friday"),
+        ("a.com", "55", "Contacted", "call back friday"),
+    ]
+    assert read_leads_csv(str(csv_path)) == rows
+    with pytest.raises(ValueError):
+        write_rescored_csv(str(csv_path), str(csv_path), {})
@@ -0,0 +1,44 @@
+from prospector.html_text import PageTextExtractor, extract_page
+
+
+def test_extract_page_keeps_text_links_and_script_hosts() -> None:
+    page = extract_page(
+        "<p>Hello &amp; welcome</p><script src='//widget.intercom.io/widget/x'></script>"
+        "<script>load('https://beacon-v2.helpscout.net')</script><a href=' /docs '>Docs</a><template>hidden</template>"
+    )
+
+    assert page.text == "Hello & welcome Docs"
+    assert page.hrefs == ["/docs"]
+    assert page.script_hosts == {"widget.intercom.io", "beacon-v2.helpscout.net"}
+    assert not page.truncated
+
+
+def test_extract_page_stops_reading_at_budget() -> None:
+    consumed = []
+
+    def chunks():
+        for index in range(100):
+            consumed.append(index)
+            yield f"<p>chunk {index}</p>" + " " * 1000
+
+    page = extract_page(chunks(), max_bytes=5000)
+
+    assert page.truncated
+    assert len(consumed) == 5
+    assert page.text.startswith("chunk 0 chunk 1")
+
+
+def test_extractor_feed_reports_remaining_budget() -> None:
+    extractor = PageTextExtractor(max_bytes=10)
+    assert extractor.feed("<b>hi</b>")
+    assert not extractor.feed("<p>more text</p>")
+    assert not extractor.feed("<p>ignored</p>")
+    assert extractor.fed == 10
+
+
+def test_extractor_only_truncates_past_the_budget() -> None:
+    exact = extract_page(["<p>12345</p>"], max_bytes=12)
+    assert not exact.truncated and exact.text == "12345"
+
+    over = extract_page(["<p>12345</p>", " "], max_bytes=12)
+    assert over.truncated
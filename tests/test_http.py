@@ -0,0 +1,117 @@
+import io
+
+import pytest
+import requests
+
+from prospector.cache import ResponseCache
+from prospector.http import HTML_CONTENT_TYPES, RequestManager
+from prospector.metrics import METRICS
+
+
+class CountingBody(io.BytesIO):
+    # Remembers how far the body was read, even after the response closes it
+    def read(self, size=-1):
+        data = super().read(size)
+        self.consumed = self.tell()
+        return data
+
+
+def make_response(body: bytes, content_type: str = "text/html; charset=utf-8", length: bool = True) -> requests.Response:
+    response = requests.Response()
+    response.status_code = 200
+    response.raw = CountingBody(body)
+    response.raw.consumed = 0
+    response.headers["Content-Type"] = content_type
+    if length:
+        response.headers["Content-Length"] = str(len(body))
+    response.encoding = "utf-8"
+    response.url = "https://acme.com/"
+    return response
+
+
+def serve(monkeypatch, response: requests.Response, calls: list) -> None:
+    def fake_request(self, method, url, timeout=10, **kwargs):
+        calls.append(kwargs.get("stream", False))
+        return response
+
+    monkeypatch.setattr(requests.Session, "request", fake_request)
+
+
+def test_get_text_stops_reading_at_max_bytes(monkeypatch) -> None:
+    METRICS.reset()
+    # "é" is two bytes; chunk edges land inside it and must still decode
+    body = ("<p>café</p>" * 10000).encode()
+    response = make_response(body)
+    calls: list = []
+    serve(monkeypatch, response, calls)
+
+    text = RequestManager(metrics_source="test").get_text("https://acme.com/", max_bytes=50_000, content_types=HTML_CONTENT_TYPES)
+
+    assert calls == [True]
+    assert len(text.encode()) <= 50_000
+    assert "�" not in text[:-1]
+    assert response.raw.consumed < len(body)
+    assert METRICS.counter("http_response_bytes_total", source="test") == 50_000
+    assert METRICS.counter("http_responses_truncated_total", source="test") == 1
+    assert METRICS.counter("http_truncated_bytes_total", source="test") == len(body) - 50_000
+
+
+def test_get_text_reads_small_bodies_whole(monkeypatch) -> None:
+    METRICS.reset()
+    serve(monkeypatch, make_response(b"<h1>Acme</h1>", length=False), [])
+
+    text = RequestManager(metrics_source="test").get_text("https://acme.com/", max_bytes=1024)
+
+    assert text == "<h1>Acme</h1>"
+    assert METRICS.counter("http_response_bytes_total", source="test") == 13
+    assert METRICS.counter("http_responses_truncated_total", source="test") == 0
+
+
+def test_get_text_skips_unwanted_content_types(monkeypatch) -> None:
+    METRICS.reset()
+    response = make_response(b"%PDF-1.7" + b"\0" * 4096, content_type="application/pdf")
+    serve(monkeypatch, response, [])
+
+    with pytest.raises(RuntimeError, match="content type application/pdf"):
+        RequestManager(metrics_source="test").get_text("https://acme.com/deck.pdf", content_types=HTML_CONTENT_TYPES)
+
+    assert response.raw.consumed == 0
+    assert METRICS.counter("http_skipped_total", source="test", reason="content_type") == 1
+
+
+def test_stream_text_close_stops_download(monkeypatch) -> None:
+    METRICS.reset()
+    response = make_response(b"x" * 200_000)
+    serve(monkeypatch, response, [])
+
+    chunks = RequestManager(metrics_source="test").stream_text("https://acme.com/")
+    first = next(chunks)
+    chunks.close()
+
+    assert len(first) < 200_000
+    assert METRICS.counter("http_responses_truncated_total", source="test") == 1
+
+
+def test_capped_reads_are_cached_apart_from_full_gets(tmp_path, monkeypatch) -> None:
+    body = b"<p>" + b"a" * 5000 + b"</p>"
+    calls = []
+
+    def fake_request(self, method, url, timeout=10, **kwargs):
+        calls.append(kwargs.get("stream", False))
+        response = make_response(body)
+        response._content = None if kwargs.get("stream") else body
+        return response
+
+    monkeypatch.setattr(requests.Session, "request", fake_request)
+    manager = RequestManager(cache=ResponseCache(str(tmp_path / "cache.sqlite3")), cache_ttl_seconds=60)
+
+    capped = manager.get_text("https://acme.com/", max_bytes=100, content_types=HTML_CONTENT_TYPES)
+    full = manager.get_text("https://acme.com/")
+    assert len(capped) == 100
+    assert full == body.decode()
+    assert calls == [True, False]
+
+    # Both are now served from their own cache entries
+    assert manager.get_text("https://acme.com/", max_bytes=100, content_types=HTML_CONTENT_TYPES) == capped
+    assert manager.get_text("https://acme.com/") == full
+    assert len(calls) == 2
@@ -0,0 +1,16 @@
+import random
+
+from prospector.enricher import B2B_TERMS, SMALL_TEAM_TERMS, SUPPORT_STACKS
+from prospector.matcher import TermMatcher
+
+
+def test_matcher_agrees_with_substring_scan() -> None:
+    terms = [*SUPPORT_STACKS, *B2B_TERMS, *SMALL_TEAM_TERMS, "Team", ""]
+    matcher = TermMatcher(terms)
+    vocabulary = ["small", "team", "of", "api", "Intercom", "founder", "just", "the", "two", "us", "x"]
+    rng = random.Random(7)
+    for _ in range(200):
+        text = " ".join(rng.choices(vocabulary, k=rng.randint(0, 12)))
+        expected = {term.lower() for term in terms if term and term.lower() in text.lower()}
+        assert matcher.find(text) == expected
+        assert matcher.search(text) == bool(expected)
@@ -0,0 +1,73 @@
+import requests
+
+from prospector import serve as serve_module
+from prospector.metrics import METRICS, Metrics
+from prospector.outputs.openmetrics import render_openmetrics, start_metrics_server
+
+
+def test_metrics_snapshot_groups_by_labels() -> None:
+    metrics = Metrics()
+    metrics.inc("http_requests_total", method="GET", status="200")
+    metrics.inc("http_requests_total", method="GET", status="200")
+    metrics.inc("rate_limit_sleep_seconds_total", 0.5, source="reddit")
+    with metrics.timer("stage_seconds", stage="score"):
+        pass
+    metrics.observe("stage_seconds", 2.0, stage="score")
+
+    snapshot = metrics.snapshot()
+
+    assert metrics.counter("http_requests_total", status="200", method="GET") == 2
+    assert {"name": "rate_limit_sleep_seconds_total", "labels": {"source": "reddit"}, "value": 0.5} in snapshot["counters"]
+    (timing,) = snapshot["timings"]
+    assert (timing["labels"], timing["count"], timing["max_seconds"]) == ({"stage": "score"}, 2, 2.0)
+
+
+def test_openmetrics_rendering_and_endpoint() -> None:
+    metrics = Metrics()
+    metrics.inc("http_requests_total", source="reddit", status="200")
+    metrics.set("last_run_duration_seconds", 12.5)
+    metrics.observe("stage_seconds", 0.2, stage="fetch", source="reddit")
+
+    text = render_openmetrics(metrics)
+
+    assert "# TYPE prospector_http_requests counter" in text
+    assert 'prospector_http_requests_total{source="reddit",status="200"} 1' in text
+    assert "prospector_last_run_duration_seconds 12.5" in text
+    assert 'prospector_stage_seconds_bucket{source="reddit",stage="fetch",le="0.1"} 0' in text
+    assert 'prospector_stage_seconds_bucket{source="reddit",stage="fetch",le="0.25"} 1' in text
+    assert 'prospector_stage_seconds_bucket{source="reddit",stage="fetch",le="+Inf"} 1' in text
+    assert text.endswith("# EOF\n")
+
+    server = start_metrics_server("127.0.0.1", 0, metrics)
+    try:
+        response = requests.get(f"http://127.0.0.1:{server.server_address[1]}/metrics", timeout=5)
+    finally:
+        server.shutdown()
+    assert response.headers["Content-Type"].startswith("application/openmetrics-text")
+    assert response.text == text
+
+
+def test_serve_does_not_recount_previous_run_when_a_run_fails_early(tmp_path, monkeypatch) -> None:
+    servers = []
+    monkeypatch.setattr(serve_module, "start_metrics_server", lambda host, port, totals: servers.append(totals) or _Server())
+    sleeps = []
+
+    def stop_after_two(seconds: float) -> None:
+        sleeps.append(seconds)
+        if len(sleeps) == 2:
+            raise KeyboardInterrupt
+
+    monkeypatch.setattr(serve_module.time, "sleep", stop_after_two)
+    METRICS.inc("leads_fetched_total", 5, source="reddit")
+
+    # A missing config fails inside load_config, before the pipeline does any work
+    serve_module.serve(str(tmp_path / "missing.yaml"), interval_minutes=0)
+
+    (totals,) = servers
+    assert totals.counter("runs_total", result="failed") == 2
+    assert totals.counter("leads_fetched_total", source="reddit") == 0
+
+
+class _Server:
+    def shutdown(self) -> None:
+        return None
@@ -0,0 +1,23 @@
+import sys
+from dataclasses import replace
+
+from prospector.models import Lead
+
+
+def test_lead_is_slotted_and_creates_hit_sets_on_first_hit() -> None:
+    lead = Lead(domain="acme.com", company="Acme", source="".join(["red", "dit"]), evidence_url="x", pain_quote="y")
+
+    assert not hasattr(lead, "__dict__")
+    assert lead.source is sys.intern("reddit")
+    assert lead.date_found == ""
+    assert lead.keyword_hits is None and lead.hits() == set() and lead.variant_hits() == set()
+
+    lead.date_found = "2026-01-02"
+    lead.add_keyword_hit("support")
+    assert lead.hits() == {"support"} and lead.keyword_variant_hits is None
+    assert lead.to_row()[:4] == ["2026-01-02", "Acme", "acme.com", "reddit"]
+
+    copy = replace(lead)
+    assert copy.hits() == {"support"} and copy == lead
+    copy.keyword_variant_hits = {"a"}
+    assert copy != lead
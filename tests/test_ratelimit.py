@@ -0,0 +1,64 @@
+import time
+
+import requests
+
+from prospector.http import RequestManager
+from prospector.ratelimit import RateLimiter
+
+
+class FakeResponse:
+    def __init__(self, status_code: int, headers: dict | None = None):
+        self.status_code = status_code
+        self.headers = headers or {}
+        self.content = b"{}"
+
+    def raise_for_status(self) -> None:
+        if self.status_code >= 400:
+            raise requests.HTTPError(f"status {self.status_code}", response=self)
+
+    def json(self) -> dict:
+        return {}
+
+
+def test_limiter_adapts_to_429_and_rate_limit_headers() -> None:
+    limiter = RateLimiter("reddit", requests_per_minute=60)
+
+    limiter.on_response(429, {"Retry-After": "30"})
+    assert limiter.rate == 30
+    assert 29 < limiter.blocked_until - time.time() <= 30
+
+    limiter.on_response(200, {"X-RateLimit-Remaining": "90", "X-RateLimit-Reset": "60"})
+    assert limiter.rate == 90
+    limiter.on_response(200, {"X-RateLimit-Remaining": "1000", "X-RateLimit-Reset": "60"})
+    assert limiter.rate == limiter.max_rate == 120
+
+    restored = RateLimiter("reddit", requests_per_minute=60)
+    restored.restore(limiter.state())
+    assert restored.rate == 120
+    assert restored.blocked_until == limiter.blocked_until
+
+
+def test_limiter_allows_bursts_after_idle() -> None:
+    limiter = RateLimiter("hn", requests_per_minute=600, burst=3)
+    limiter.restore({"rate": 600, "tokens": 0, "blocked_until": 0, "saved_at": time.time() - 60})
+
+    started = time.monotonic()
+    for _ in range(3):
+        limiter.acquire()
+    assert time.monotonic() - started < 0.05
+    limiter.acquire()
+    assert time.monotonic() - started >= 0.09
+
+
+def test_request_manager_honours_retry_after(monkeypatch) -> None:
+    responses = [FakeResponse(429, {"Retry-After": "0.1"}), FakeResponse(200)]
+    monkeypatch.setattr(requests.Session, "request", lambda self, method, url, **kwargs: responses.pop(0))
+
+    manager = RequestManager(backoff_seconds=(30, 30, 30))
+    manager.rate_limiter = RateLimiter("reddit", requests_per_minute=6000)
+    started = time.monotonic()
+    assert manager.get_json("https://api.example/search") == {}
+
+    # Waited the server's 0.1s instead of the 30s fixed backoff, and slowed the source down
+    assert 0.09 <= time.monotonic() - started < 5
+    assert manager.rate_limiter.rate < 6000
@@ -1,5 +1,8 @@
+from urllib.parse import parse_qs, urlparse
+
 from prospector.http import RequestManager
-from prospector.sources.reddit import RedditSource
+from prospector.sources.query_planner import MAX_URL_LENGTH, KeywordAttributor, plan_batches
+from prospector.sources.reddit import PER_KEYWORD_RESULTS, RedditSource
 
 
 class FakeRequestManager(RequestManager):
@@ -32,3 +35,162 @@ def test_reddit_source_extracts_lead() -> None:
     assert lead.source == "reddit"
     assert lead.domain == "acme.com"
     assert "help docs" in lead.pain_quote.lower()
+
+
+class RecordingRequestManager(FakeRequestManager):
+    def __init__(self):
+        super().__init__()
+        self.urls = []
+
+    def get_json(self, url, params=None, headers=None):
+        self.urls.append(url)
+        return super().get_json(url, params, headers)
+
+
+def test_reddit_source_batches_queries_and_attributes_keywords() -> None:
+    manager = RecordingRequestManager()
+    source = RedditSource(manager, requests_per_minute=9999)
+    subreddits = [f"sub{i}" for i in range(8)]
+    keywords = ["support is killing me", "drowning in support"] + [f"unrelated phrase {i}" for i in range(28)]
+    leads = source.fetch(keywords, {"sources": {"reddit": {"subreddits": subreddits}}})
+
+    # 8 subreddits x 30 keywords used to be 240 requests
+    assert len(manager.urls) <= 24
+    assert all(len(url) <= MAX_URL_LENGTH for url in manager.urls)
+    assert len(leads) == 1
+    assert leads[0].keyword_hits == {"support is killing me"}
+
+
+def test_plan_batches_respects_item_and_length_caps() -> None:
+    batches = plan_batches([f"kw{i}" for i in range(10)], lambda group: "x" * (10 * len(group)), max_items=4, max_length=30)
+
+    assert batches == [["kw0", "kw1", "kw2"], ["kw3", "kw4", "kw5"], ["kw6", "kw7", "kw8"], ["kw9"]]
+
+
+def test_keyword_attributor_matches_phrases_and_word_sets() -> None:
+    attributor = KeywordAttributor(["help docs are a mess", "intercom too expensive"])
+
+    assert attributor.match("Our HELP DOCS ARE A MESS honestly") == ["help docs are a mess"]
+    assert attributor.match("is intercom getting too expensive for you?") == ["intercom too expensive"]
+    assert attributor.match("unrelated") == []
+
+
+def test_reddit_source_advances_cursor_and_requests_only_newer_items() -> None:
+    class TimedRequestManager(RecordingRequestManager):
+        def get_json(self, url, params=None, headers=None):
+            payload = super().get_json(url, params, headers)
+            payload["data"][0]["created_utc"] = 1700000000
+            return payload
+
+    manager = TimedRequestManager()
+    source = RedditSource(manager, requests_per_minute=9999)
+    cfg = {"sources": {"reddit": {"subreddits": ["SaaS"]}}}
+
+    assert len(source.fetch(["support is killing me"], cfg)) == 1
+    assert source.cursors == {"saas:support is killing me": 1700000000}
+    assert "after=" not in manager.urls[0]
+
+    assert source.fetch(["support is killing me"], cfg) == []
+    assert "after=1700000000" in manager.urls[1]
+
+
+class CorpusRequestManager(RequestManager):
+    # pullpush stand-in over a fixed corpus: OR of quoted phrases, comma-separated subreddits,
+    # exclusive after/before, newest first
+    def __init__(self, posts):
+        super().__init__(timeout_seconds=10)
+        self.posts = sorted(posts, key=lambda post: post["created_utc"], reverse=True)
+        self.urls = []
+
+    def get_json(self, url, params=None, headers=None):
+        self.urls.append(url)
+        query = parse_qs(urlparse(url).query)
+        subreddits = {name.lower() for name in query["subreddit"][0].split(",")}
+        phrases = [phrase.strip('"') for phrase in query["q"][0].split("|")]
+        after = int(query.get("after", ["0"])[0])
+        before = int(query.get("before", ["0"])[0])
+        matches = [
+            post
+            for post in self.posts
+            if post["subreddit"].lower() in subreddits
+            and any(phrase in f"{post['title']}\n{post['selftext']}".lower() for phrase in phrases)
+            and post["created_utc"] > after
+            and (not before or post["created_utc"] < before)
+        ]
+        return {"data": matches[: int(query["size"][0])]}
+
+
+def _corpus() -> list[dict]:
+    posts = []
+
+    def add(subreddit, phrase, count, newest):
+        for i in range(count):
+            index = len(posts)
+            posts.append(
+                {
+                    "id": f"p{index}",
+                    "subreddit": subreddit,
+                    "permalink": f"/r/{subreddit}/comments/p{index}/",
+                    "title": f"post {index}",
+                    "selftext": phrase,
+                    "author": "a",
+                    "created_utc": newest - i * 10,
+                }
+            )
+
+    # A busy keyword crowds the rare ones out of any shared 100-post page
+    add("SaaS", "support is killing me", 400, 1_700_100_000)
+    add("startups", "support is killing me", 150, 1_700_099_995)
+    add("SaaS", "churn is brutal", 8, 1_690_000_000)
+    add("startups", "churn is brutal", 40, 1_689_000_000)
+    add("startups", "help docs are a mess", 30, 1_680_000_000)
+    return posts
+
+
+def test_reddit_batched_recall_matches_per_keyword_queries() -> None:
+    keywords = ["support is killing me", "churn is brutal", "help docs are a mess"]
+    subreddits = ["SaaS", "startups"]
+    posts = _corpus()
+    manager = CorpusRequestManager(posts)
+    leads = RedditSource(manager, requests_per_minute=99999).fetch(keywords, {"sources": {"reddit": {"subreddits": subreddits}}})
+    found = {lead.source_item_id: lead.keyword_hits for lead in leads}
+
+    # What one query per (subreddit, keyword) with the old page size returned
+    for subreddit in subreddits:
+        for keyword in keywords:
+            expected = [
+                post["id"]
+                for post in sorted(posts, key=lambda post: post["created_utc"], reverse=True)
+                if post["subreddit"] == subreddit and keyword in post["selftext"]
+            ][:PER_KEYWORD_RESULTS]
+            assert all(keyword in found.get(post_id, set()) for post_id in expected), (subreddit, keyword)
+    assert len(manager.urls) < len(posts) // 10
+
+
+def test_reddit_cursor_waits_until_window_is_read_down_to_it() -> None:
+    cursor = 1_700_000_000
+    cfg = {"sources": {"reddit": {"subreddits": ["SaaS"]}}}
+
+    def posts(count):
+        return [
+            {
+                "id": f"p{i}",
+                "subreddit": "SaaS",
+                "permalink": f"/r/SaaS/comments/p{i}/",
+                "title": "t",
+                "selftext": "support is killing me",
+                "created_utc": cursor + 10_000 - i,
+            }
+            for i in range(count)
+        ]
+
+    # More new posts than the batch may page through: the cursor stays put
+    source = RedditSource(CorpusRequestManager(posts(350)), requests_per_minute=99999)
+    source.cursors = {"saas:support is killing me": cursor}
+    assert len(source.fetch(["support is killing me"], cfg)) < 350
+    assert source.cursors == {"saas:support is killing me": cursor}
+
+    # Once paging reaches the old cursor, it moves to the newest post
+    source.request_manager = CorpusRequestManager(posts(250))
+    assert len(source.fetch(["support is killing me"], cfg)) == 250
+    assert source.cursors == {"saas:support is killing me": cursor + 10_000}
@@ -0,0 +1,272 @@
+import json
+import time
+
+import requests
+
+from prospector import run
+from prospector.http import RequestManager
+from prospector.models import Lead
+from prospector.run import stream_sources
+from prospector.sources.base import Source
+
+
+class SlowSource(Source):
+    def __init__(self, name: str, calls: int):
+        super().__init__(name, RequestManager(), requests_per_minute=600)
+        self.calls = calls
+
+    def fetch(self, keywords, config):
+        leads = []
+        for idx in range(self.calls):
+            self._wait_for_slot()
+            leads.append(Lead(domain=f"{self.name}{idx}.com", company="c", source=self.name, evidence_url="x", pain_quote="y"))
+        return leads
+
+
+def test_stream_sources_runs_concurrently() -> None:
+    # 3 requests at 600 rpm = two 0.1s gaps per source
+    sources = [SlowSource(f"s{i}", calls=3) for i in range(4)]
+
+    started = time.monotonic()
+    results: dict[str, list[Lead]] = {}
+    finished = []
+    for source, lead in stream_sources(sources, ["kw"], {}):
+        if lead is None:
+            finished.append(source.name)
+        else:
+            results.setdefault(source.name, []).append(lead)
+    elapsed = time.monotonic() - started
+
+    assert sorted(results) == sorted(finished) == ["s0", "s1", "s2", "s3"]
+    assert all(len(leads) == 3 for leads in results.values())
+    assert elapsed < 0.6
+
+
+def test_wait_for_slot_keeps_gap_per_source() -> None:
+    source = SlowSource("s", calls=3)
+
+    started = time.monotonic()
+    source.fetch([], {})
+
+    assert time.monotonic() - started >= 0.2
+
+
+RUN_CONFIG = """
+icp:
+  name: Test ICP
+  pain_keywords: ["support is killing me"]
+  exclude_keywords: []
+  scoring:
+    pain_signal_present: 30
+    b2b_saas_signals: 25
+    small_team_signals: 20
+    helpdesk_stack_detected: 15
+    docs_present: 10
+sources:
+  reddit:
+    enabled: false
+    subreddits: [SaaS]
+  hacker_news: true
+  hacker_news_requests_per_minute: 60000
+output:
+  google_sheets:
+    enabled: false
+  csv:
+    enabled: true
+    path: {root}/leads.csv
+  summary:
+    enabled: false
+state:
+  seen_domains_file: {root}/state/seen_domains.json
+cache:
+  mode: "off"
+"""
+
+
+class FakeResponse:
+    def __init__(self, text: str, content_type: str):
+        self.status_code = 200
+        self.text = text
+        self.content = text.encode()
+        self.headers = {"Content-Type": content_type}
+        self.encoding = "utf-8"
+        self.url = ""
+
+    def raise_for_status(self) -> None:
+        return None
+
+    def json(self):
+        return json.loads(self.text)
+
+    def iter_content(self, chunk_size=1):
+        yield self.content
+
+    def close(self) -> None:
+        pass
+
+
+def test_run_marks_domains_seen_only_after_sinks_wrote_them(tmp_path, monkeypatch) -> None:
+    monkeypatch.chdir(tmp_path)
+    cfg_path = tmp_path / "icp.yaml"
+    cfg_path.write_text(RUN_CONFIG.format(root=tmp_path), encoding="utf-8")
+    hit = {"objectID": "1", "created_at_i": 1700000000, "url": "https://acme.com", "comment_text": "support is killing me", "author": "a"}
+
+    def fake_request(self, method, url, timeout=10, **kwargs):
+        if "algolia" in url:
+            return FakeResponse(json.dumps({"hits": [hit]}), "application/json")
+        return FakeResponse("<p>our saas dashboard api pricing for customers, founder here</p>", "text/html")
+
+    class BrokenSink:
+        def write(self, leads):
+            raise OSError("disk full")
+
+        def close(self):
+            pass
+
+    monkeypatch.setattr(requests.Session, "request", fake_request)
+    monkeypatch.setattr(run, "open_sinks", lambda config: [BrokenSink(), run.CsvSink(str(tmp_path / "leads.csv"))])
+    run.run_pipeline(str(cfg_path), full_refresh=True)
+    # The broken sink did not stop the CSV, but the domain stays unseen until every sink has it
+    assert "acme.com" in (tmp_path / "leads.csv").read_text(encoding="utf-8")
+
+    monkeypatch.undo()
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(requests.Session, "request", fake_request)
+    result = run.run_pipeline(str(cfg_path), full_refresh=True)
+    assert [lead.domain for lead in result["new_leads"]] == ["acme.com"]
+
+
+class AcmeSource(Source):
+    def __init__(self, name: str, url: str, keyword: str, delay: float, fillers: int = 0):
+        super().__init__(name, RequestManager(), requests_per_minute=600)
+        self.url, self.keyword, self.delay, self.fillers = url, keyword, delay, fillers
+
+    def fetch(self, keywords, config):
+        time.sleep(self.delay)
+        self.finished_at = time.monotonic()
+        lead = Lead(domain="acme.com", company="c", source=self.name, evidence_url=self.url, pain_quote="support is killing me")
+        lead.add_keyword_hit(self.keyword)
+        # Fillers push more leads through enrichment than it keeps in flight, so acme.com is done first
+        fillers = [
+            Lead(domain=f"filler{i}.com", company="c", source=self.name, evidence_url=f"{self.url}/{i}", pain_quote="q")
+            for i in range(self.fillers)
+        ]
+        return [lead, *fillers]
+
+
+def test_run_merges_copies_that_arrive_after_the_lead_was_enriched(tmp_path, monkeypatch) -> None:
+    monkeypatch.chdir(tmp_path)
+    cfg_path = tmp_path / "icp.yaml"
+    cfg_path.write_text(RUN_CONFIG.format(root=tmp_path), encoding="utf-8")
+
+    def fake_request(self, method, url, timeout=10, **kwargs):
+        return FakeResponse("<p>our saas dashboard api pricing for customers, founder here</p>", "text/html")
+
+    sources = [
+        AcmeSource("hn", "https://news.ycombinator.com/1", "support", 0, fillers=40),
+        AcmeSource("x", "https://x.com/a/status/2", "tickets", 0.5),
+    ]
+    monkeypatch.setattr(requests.Session, "request", fake_request)
+    monkeypatch.setattr(run, "build_sources", lambda config, request_manager, throttle_multiplier: sources)
+    scored: list[frozenset] = []
+    score = run.Scorer.score
+
+    def recording_score(self, lead):
+        if lead.domain == "acme.com":
+            scored.append(frozenset(lead.hits()))
+        return score(self, lead)
+
+    monkeypatch.setattr(run.Scorer, "score", recording_score)
+    result = run.run_pipeline(str(cfg_path), dry_run=True, full_refresh=True)
+
+    # Written when the hn copy was enriched, then scored again once the x copy merged in
+    (lead,) = [lead for lead in result["new_leads"] if lead.domain == "acme.com"]
+    assert lead.keyword_hits == {"support", "tickets"}
+    assert lead.notes == "also seen on x: https://x.com/a/status/2"
+    assert scored == [{"support"}, {"support", "tickets"}]
+
+
+def test_run_writes_leads_before_the_slowest_source_finishes(tmp_path, monkeypatch) -> None:
+    monkeypatch.chdir(tmp_path)
+    cfg_path = tmp_path / "icp.yaml"
+    cfg_path.write_text(RUN_CONFIG.format(root=tmp_path), encoding="utf-8")
+
+    def fake_request(self, method, url, timeout=10, **kwargs):
+        return FakeResponse("<p>our saas dashboard api pricing for customers, founder here</p>", "text/html")
+
+    class RecordingSink:
+        def __init__(self):
+            self.written_at: list[float] = []
+
+        def write(self, leads):
+            self.written_at.append(time.monotonic())
+
+        def close(self):
+            pass
+
+    sink = RecordingSink()
+    fast = AcmeSource("hn", "https://news.ycombinator.com/1", "support", 0, fillers=40)
+    slow = AcmeSource("x", "https://x.com/b/status/3", "tickets", 1.0)
+    monkeypatch.setattr(requests.Session, "request", fake_request)
+    monkeypatch.setattr(run, "build_sources", lambda config, request_manager, throttle_multiplier: [fast, slow])
+    monkeypatch.setattr(run, "open_sinks", lambda config: [sink])
+    run.run_pipeline(str(cfg_path), full_refresh=True)
+
+    assert sink.written_at and sink.written_at[0] < slow.finished_at
+
+
+def test_run_marks_domains_only_after_a_buffering_sink_flushed_them(tmp_path, monkeypatch) -> None:
+    monkeypatch.chdir(tmp_path)
+    cfg_path = tmp_path / "icp.yaml"
+    cfg_path.write_text(RUN_CONFIG.format(root=tmp_path), encoding="utf-8")
+
+    def fake_request(self, method, url, timeout=10, **kwargs):
+        return FakeResponse("<p>our saas dashboard api pricing for customers, founder here</p>", "text/html")
+
+    class BufferingSink:
+        # Holds rows until it has two, like SheetsSink with batch_size=2
+        def __init__(self):
+            self.pending: list[str] = []
+            self.flushed: list[str] = []
+
+        @property
+        def buffered(self) -> int:
+            return len(self.pending)
+
+        def write(self, leads):
+            self.pending.extend(lead.domain for lead in leads)
+            if len(self.pending) >= 2:
+                self.close()
+
+        def close(self):
+            self.flushed.extend(self.pending)
+            self.pending.clear()
+
+    sink = BufferingSink()
+    marked: list[tuple[list[str], list[str]]] = []
+    mark = run.Deduplicator.mark
+
+    def recording_mark(self, leads, date_value):
+        marked.append(([lead.domain for lead in leads], list(sink.flushed)))
+        mark(self, leads, date_value)
+
+    class ThreeDomains(Source):
+        def fetch(self, keywords, config):
+            leads = []
+            for domain in ("a.com", "b.com", "c.com"):
+                lead = Lead(domain=domain, company="c", source=self.name, evidence_url=f"https://{domain}/post", pain_quote="q")
+                lead.add_keyword_hit("support")
+                leads.append(lead)
+            return leads
+
+    monkeypatch.setattr(requests.Session, "request", fake_request)
+    monkeypatch.setattr(run, "build_sources", lambda config, request_manager, throttle_multiplier: [ThreeDomains("hn", RequestManager())])
+    monkeypatch.setattr(run, "open_sinks", lambda config: [sink])
+    monkeypatch.setattr(run.Deduplicator, "mark", recording_mark)
+    result = run.run_pipeline(str(cfg_path), full_refresh=True)
+
+    assert len(result["new_leads"]) == 3
+    assert sink.flushed == [lead.domain for lead in result["new_leads"]]
+    # Two leads are marked once the sink flushed them mid-run, the last one after close()
+    assert [domains for domains, _ in marked] == [sink.flushed[:2], sink.flushed[2:]]
+    assert all(set(domains) <= set(flushed) for domains, flushed in marked)
@@ -1,3 +1,6 @@
+import random
+from dataclasses import replace
+
 from prospector.models import Lead
 from prospector.scorer import Scorer
 
@@ -39,3 +42,34 @@ def test_scorer_low_score() -> None:
     )
     lead = Lead(domain="", company="", source="hn", evidence_url="", pain_quote="")
     assert scorer.score(lead) == 0
+
+
+def test_score_batch_matches_scalar_scores() -> None:
+    weights = {
+        "pain_signal_present": 30,
+        "b2b_saas_signals": 25,
+        "small_team_signals": 20,
+        "helpdesk_stack_detected": 15,
+        "docs_present": 10,
+    }
+    rng = random.Random(3)
+    quotes = ["", "our api pricing dashboard is a mess", "solo founder drowning in tickets", "support is killing me"]
+
+    def make_lead() -> Lead:
+        lead = Lead(domain="acme.com", company="Acme", source="hn", evidence_url="", pain_quote=rng.choice(quotes))
+        lead.b2b_signal_count = rng.randint(0, 6)
+        lead.small_team_signal_count = rng.randint(0, 1)
+        lead.team_size_signal = rng.choice(["", "team of 3"])
+        lead.support_stack = rng.choice(["unknown", "intercom"])
+        lead.docs_url = rng.choice(["", "https://acme.com/docs"])
+        lead.keyword_variant_hits = set(rng.sample(["a", "b", "c"], rng.randint(0, 3)))
+        return lead
+
+    leads = [make_lead() for _ in range(300)]
+    copies = [replace(lead, keyword_variant_hits=set(lead.keyword_variant_hits)) for lead in leads]
+    scorer = Scorer(weights)
+
+    batch = scorer.score_batch(leads)
+    assert batch == [scorer.score(lead) for lead in copies]
+    assert [lead.fit_score for lead in leads] == batch
+    assert [lead.b2b_signal_count for lead in leads] == [lead.b2b_signal_count for lead in copies]
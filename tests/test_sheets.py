@@ -0,0 +1,95 @@
+import json
+import sys
+
+import pytest
+
+from prospector.models import Lead
+from prospector.outputs import sheets
+from prospector.outputs.sheets import SheetsSink
+
+
+def _stub_gog(tmp_path, fail_calls: int):
+    # Records each stdin payload; the first fail_calls invocations exit non-zero
+    script = tmp_path / "gog"
+    script.write_text(
+        f"#!{sys.executable}\n"
+        "import json, pathlib, sys\n"
+        f"root = pathlib.Path({str(tmp_path)!r})\n"
+        "counter = root / 'calls'\n"
+        "calls = int(counter.read_text()) + 1 if counter.exists() else 1\n"
+        "counter.write_text(str(calls))\n"
+        f"if calls <= {fail_calls}:\n"
+        "    sys.exit('quota exceeded')\n"
+        "assert sys.argv[sys.argv.index('--values-json') + 1] == '-'\n"
+        "with (root / 'appended.jsonl').open('a') as handle:\n"
+        "    handle.write(json.dumps(json.load(sys.stdin)) + '\\n')\n"
+    )
+    script.chmod(0o755)
+    return str(script)
+
+
+def _leads(count: int) -> list[Lead]:
+    return [Lead(domain=f"site{i}.com", company="c", source="hn", evidence_url="x", pain_quote="y") for i in range(count)]
+
+
+def _appended(tmp_path) -> list[list]:
+    path = tmp_path / "appended.jsonl"
+    return [json.loads(line) for line in path.read_text().splitlines()] if path.exists() else []
+
+
+def test_sheets_sink_chunks_rows_through_stdin(tmp_path) -> None:
+    sink = SheetsSink("sheet", "Prospects", batch_size=2, backoff_seconds=(0,), gog_bin=_stub_gog(tmp_path, fail_calls=0))
+    sink.write(_leads(1))
+    assert sink.buffered == 1
+    sink.write(_leads(4))
+    assert sink.buffered == 0
+    sink.close()
+
+    assert [len(chunk) for chunk in _appended(tmp_path)] == [2, 2, 1]
+
+
+def test_sheets_sink_retries_then_replays_outbox(tmp_path) -> None:
+    gog = _stub_gog(tmp_path, fail_calls=2)
+    outbox = tmp_path / "state" / "sheets_outbox.jsonl"
+
+    sink = SheetsSink("sheet", "Prospects", batch_size=10, max_retries=2, backoff_seconds=(0,), outbox_path=str(outbox), gog_bin=gog)
+    sink.write(_leads(3))
+    sink.close()
+    assert _appended(tmp_path) == []
+    assert len(json.loads(outbox.read_text())["rows"]) == 3
+
+    next_run = SheetsSink("sheet", "Prospects", batch_size=10, backoff_seconds=(0,), outbox_path=str(outbox), gog_bin=gog)
+    next_run.write(_leads(1))
+    next_run.close()
+    assert [len(chunk) for chunk in _appended(tmp_path)] == [3, 1]
+    assert not outbox.exists()
+
+
+def test_sheets_sink_resumes_crashed_replay(tmp_path, monkeypatch) -> None:
+    gog = _stub_gog(tmp_path, fail_calls=0)
+    outbox = tmp_path / "state" / "sheets_outbox.jsonl"
+    outbox.parent.mkdir()
+    outbox.write_text("".join(json.dumps({"sheet_id": "sheet", "tab_name": "Prospects", "rows": [[f"r{i}"]]}) + "\n" for i in range(2)))
+
+    calls = []
+    real_append = sheets.append_rows
+
+    def crash_on_second(*args, **kwargs):
+        calls.append(args[2])
+        if len(calls) == 2:
+            raise KeyboardInterrupt
+        real_append(*args, **kwargs)
+
+    monkeypatch.setattr(sheets, "append_rows", crash_on_second)
+    with pytest.raises(KeyboardInterrupt):
+        SheetsSink("sheet", "Prospects", backoff_seconds=(0,), outbox_path=str(outbox), gog_bin=gog).close()
+    monkeypatch.setattr(sheets, "append_rows", real_append)
+
+    replaying = outbox.with_name("sheets_outbox.jsonl.replaying")
+    assert replaying.exists() and not outbox.exists()
+    # A later run queues more rows before the crashed replay is picked up again
+    outbox.write_text(json.dumps({"sheet_id": "sheet", "tab_name": "Prospects", "rows": [["r2"]]}) + "\n")
+
+    SheetsSink("sheet", "Prospects", backoff_seconds=(0,), outbox_path=str(outbox), gog_bin=gog).close()
+    assert _appended(tmp_path) == [[["r0"]], [["r0"]], [["r1"]], [["r2"]]]
+    assert not replaying.exists() and not outbox.exists()
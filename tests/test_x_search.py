@@ -0,0 +1,119 @@
+import sys
+import textwrap
+
+from prospector.http import RequestManager
+from prospector.sources.x_search import XSearchSource, XSearchWorker
+
+# Answers --serve queries on stdin/stdout and the old --query/--out form; every interpreter start
+# appends a line to starts.log. A query of "crash" kills the first worker that sees it, "hang" stalls
+# it, and "noisy" prints a log line and a stale answer before its own
+FAKE_SCRIPT = """
+import json, os, sys, time
+from pathlib import Path
+
+here = Path(__file__).parent
+with open(here / "starts.log", "a") as log:
+    log.write("start\\n")
+
+def results(query):
+    slug = query.replace(" ", "-")
+    return {"results": [{"id": str(len(query)), "url": f"https://x.com/{slug}/status/1", "username": slug,
+                         "text": f"{query} is killing us at {slug}.io"}]}
+
+if "--serve" in sys.argv:
+    SERVE
+    for line in sys.stdin:
+        request = json.loads(line)
+        query = request["query"]
+        if query in ("crash", "hang") and not (here / query).exists():
+            (here / query).touch()
+            if query == "hang":
+                time.sleep(60)
+            os._exit(1)
+        if query == "noisy":
+            print("warming up the browser", flush=True)
+            print(json.dumps({"id": request["id"] - 1, "result": results("stale")}), flush=True)
+        print(json.dumps({"id": request["id"], "result": results(query)}), flush=True)
+else:
+    query = sys.argv[sys.argv.index("--query") + 1]
+    out = sys.argv[sys.argv.index("--out") + 1]
+    Path(out).write_text(json.dumps(results(query)))
+"""
+
+
+def write_script(tmp_path, serve: bool = True, with_search: bool = False):
+    source = FAKE_SCRIPT.replace("SERVE", "pass" if serve else "sys.exit(2)")
+    if with_search:
+        source = "def search(query, max_results=20, no_retweets=True):\n    return [{'id': '1', 'url': 'https://x.com/a/status/1', 'text': query}]\n"
+    script = tmp_path / "x_search_smart.py"
+    script.write_text(textwrap.dedent(source))
+    return script
+
+
+def starts(tmp_path) -> int:
+    log = tmp_path / "starts.log"
+    return len(log.read_text().splitlines()) if log.exists() else 0
+
+
+def test_x_source_uses_one_worker_for_all_keywords(tmp_path) -> None:
+    script = write_script(tmp_path)
+    source = XSearchSource(RequestManager(), requests_per_minute=100_000, script_path=str(script), python=sys.executable)
+
+    keywords = [f"keyword {i}" for i in range(30)]
+    leads = source.fetch(keywords, {})
+
+    assert len(leads) == 30
+    assert leads[0].domain == "keyword-0.io"
+    assert leads[0].keyword_hits == {"keyword 0"}
+    assert starts(tmp_path) == 1
+
+
+def test_x_worker_restarts_after_crash(tmp_path) -> None:
+    worker = XSearchWorker(str(write_script(tmp_path)), python=sys.executable)
+    try:
+        assert worker.search("first")["results"][0]["username"] == "first"
+        assert worker.search("crash")["results"][0]["username"] == "crash"
+        assert worker.search("after")["results"][0]["username"] == "after"
+    finally:
+        worker.close()
+
+    assert worker.mode == "worker"
+    assert worker.restarts == 1
+    assert starts(tmp_path) == 2
+
+
+def test_x_worker_skips_output_that_answers_no_query(tmp_path) -> None:
+    worker = XSearchWorker(str(write_script(tmp_path)), python=sys.executable)
+    try:
+        assert worker.search("noisy")["results"][0]["username"] == "noisy"
+        assert worker.search("next")["results"][0]["username"] == "next"
+    finally:
+        worker.close()
+    assert worker.restarts == 0
+
+
+def test_x_worker_restarts_when_the_first_query_crashes_or_hangs(tmp_path) -> None:
+    worker = XSearchWorker(str(write_script(tmp_path)), python=sys.executable, timeout_seconds=1)
+    try:
+        assert worker.search("crash")["results"][0]["username"] == "crash"
+        assert worker.search("hang")["results"][0]["username"] == "hang"
+    finally:
+        worker.close()
+
+    assert worker.mode == "worker"
+    assert worker.restarts == 2
+    assert starts(tmp_path) == 3
+
+
+def test_x_worker_falls_back_for_scripts_without_serve(tmp_path) -> None:
+    worker = XSearchWorker(str(write_script(tmp_path, serve=False)), python=sys.executable)
+    assert worker.search("legacy")["results"][0]["username"] == "legacy"
+    assert worker.mode == "process"
+    assert not list(tmp_path.glob("*.json"))
+
+
+def test_x_worker_imports_search_function(tmp_path) -> None:
+    worker = XSearchWorker(str(write_script(tmp_path, with_search=True)), python=sys.executable)
+    assert worker.mode == "import"
+    assert worker.search("in process") == [{"id": "1", "url": "https://x.com/a/status/1", "text": "in process"}]
+    assert starts(tmp_path) == 0